@@ -1,15 +1,23 @@
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
+from streamlit.runtime.scriptrunner import RerunException, StopException
 import os
 import random
+import re
+import uuid
 from dotenv import load_dotenv
+from backend import metrics
 from backend.naver_api import NaverPlaceAPI
 from backend.data import DataProcessor
 from backend.menu_recommender import MenuRecommender
+from backend.pipeline import fetch_place_items, recommend_from_items
+from backend.prefetch import PipelinePrefetcher
+from backend.query import build_query
+from backend.service_client import ServiceClient
+from backend.snapshot import Snapshot
 from backend.user_prefs import UserPreferences
-from streamlit_js_eval import get_geolocation
-from backend.geo_utils import get_address_from_coords
+from backend.db_manager import DatabaseManager
+from backend.geo_utils import get_address_from_coords, nearest_landmark, place_key
+from backend.map_view import build_map, render_map_html
 
 # Load environment variables
 load_dotenv()
@@ -35,11 +43,189 @@ MOCK_DATA = [
     {"title": "<b>알라보</b>", "category": "양식,샐러드", "address": "강남구 역삼동", "description": "아보카도 샐러드"}
 ]
 
+# Random pick avoids repeating the last N menus
+RECENT_PICKS_LIMIT = 5
+
+# Smart radius: smallest rung with at least MIN_PLACES_IN_RADIUS places wins
+RADIUS_LADDER = (500, 1000, 2000)
+MIN_PLACES_IN_RADIUS = 1
+
+# Shared backend pipeline cache (all sessions of this server process)
+PIPELINE_TTL = 3600  # 1 hour
+# GPS fixes are snapped to ~100m so nearby users share pipeline results
+COORDS_DECIMALS = 3
+
+# Optional headless backend (backend/service.py). Unset -> run the pipeline in-process.
+SERVICE_URL = os.getenv("LUNCH_API_URL")
+
+# Optional precomputed results (scripts/precompute.py), served without fetching or processing
+SNAPSHOT_PATH = os.getenv("LUNCH_SNAPSHOT")
+SNAPSHOT_MAX_AGE = int(os.getenv("LUNCH_SNAPSHOT_MAX_AGE", 7 * 86400))
+
+@st.cache_resource(show_spinner=False)
+def get_service_client():
+    return ServiceClient(SERVICE_URL)
+
+@st.cache_resource(show_spinner=False)
+def get_snapshot():
+    if not SNAPSHOT_PATH or not os.path.exists(SNAPSHOT_PATH):
+        return None
+    return Snapshot.load(SNAPSHOT_PATH)
+
+@st.cache_resource(show_spinner=False)
+def get_api():
+    return NaverPlaceAPI(CLIENT_ID, CLIENT_SECRET)
+
+@st.cache_resource(show_spinner=False)
+def get_processor():
+    return DataProcessor()
+
+@st.cache_resource(show_spinner=False)
+def get_db():
+    return DatabaseManager()
+
+def get_user_id():
+    """Per-visitor id kept in the URL (?uid=...), so reloads and bookmarks keep the same preferences."""
+    uid = st.query_params.get("uid")
+    if not uid or not re.fullmatch(r"[0-9A-Za-z_-]{1,64}", uid):
+        uid = uuid.uuid4().hex[:16]
+        st.query_params["uid"] = uid
+    return uid
+
+def get_preferences():
+    """This session's preferences store (created once per session; reads hit the in-process cache)."""
+    if 'user_prefs' not in st.session_state:
+        st.session_state.user_prefs = UserPreferences(get_user_id(), db=get_db())
+    return st.session_state.user_prefs
+
+def api_keys_configured():
+    return bool(CLIENT_ID and CLIENT_SECRET and "your_client_id" not in CLIENT_ID)
+
+def snap_coords(coords):
+    if not coords:
+        return None
+    return (round(coords[0], COORDS_DECIMALS), round(coords[1], COORDS_DECIMALS))
+
+@st.cache_data(ttl=PIPELINE_TTL, max_entries=128, show_spinner=False)
+def fetch_items(query, mode, coords, _force_refresh=False):
+    """Raw Naver items for a query. cache_data hands out a copy, so callers may mutate it."""
+    if not api_keys_configured():
+        return MOCK_DATA
+    # API handles DB caching internally; _force_refresh makes it ignore the DB cache
+    # With coords, nearby places cached for other queries (e.g. a neighbouring station) can be reused
+    return fetch_place_items(get_api(), query, mode, coords, force_refresh=_force_refresh)
+
+@st.cache_resource(ttl=PIPELINE_TTL, max_entries=64, show_spinner=False)
+def run_pipeline(query, mode, coords, _force_refresh=False):
+    """
+    fetch -> process -> smart radius filter -> menu extraction, shared across sessions.
+    coords: snapped (lat, lng) of the user, or None to skip radius filtering.
+    The returned places and recommender are shared: treat them as read-only
+    (use recommender.with_preferences for per-user state).
+    With LUNCH_API_URL set the pipeline runs on the JSON service instead.
+    With LUNCH_SNAPSHOT set, precomputed searches are answered from the snapshot.
+    """
+    snapshot = get_snapshot() if not _force_refresh else None
+    if snapshot is not None:
+        precomputed = snapshot.get(query, mode, coords, max_age=SNAPSHOT_MAX_AGE)
+        if precomputed is not None:
+            return precomputed
+
+    if not _force_refresh and api_keys_configured():
+        # Started when GPS arrived (before the address was known): reuse or wait for it
+        prefetched = get_prefetcher().reconcile(query, mode, coords)
+        if prefetched is not None:
+            return prefetched
+
+    if SERVICE_URL:
+        try:
+            return get_service_client().recommend(query, mode, coords, force_refresh=_force_refresh)
+        except Exception as e:
+            print(f"Service Error (falling back to local pipeline): {e}")
+
+    items = fetch_items(query, mode, coords, _force_refresh=_force_refresh)
+    return recommend_from_items(
+        items, get_processor(), coords, ladder=RADIUS_LADDER, min_count=MIN_PLACES_IN_RADIUS
+    )
+
+# Background prefetch on GPS fix: guess = nearest station within this distance, else the last location
+PREFETCH_GUESS_RADIUS_M = 2000
+
+def make_prefetch_pipeline(api, processor, client=None):
+    """Pipeline for prefetch workers: no Streamlit calls, it runs outside the script thread."""
+    def pipeline(query, mode, coords):
+        if client:
+            try:
+                return client.recommend(query, mode, coords)
+            except Exception as e:
+                print(f"Service Error (falling back to local pipeline): {e}")
+        items = fetch_place_items(api, query, mode, coords)
+        return recommend_from_items(items, processor, coords, ladder=RADIUS_LADDER, min_count=MIN_PLACES_IN_RADIUS)
+    return pipeline
+
+@st.cache_resource(show_spinner=False)
+def get_prefetcher():
+    client = get_service_client() if SERVICE_URL else None
+    return PipelinePrefetcher(make_prefetch_pipeline(get_api(), get_processor(), client))
+
+def start_prefetch(coords, fallback_location):
+    """
+    Start the search for a fresh GPS fix right away, in parallel with reverse geocoding.
+    The query is a guess (nearest station / last location); run_pipeline reconciles it
+    with the resolved address.
+    """
+    if not api_keys_configured():
+        return
+    snapped = snap_coords(coords)
+    if st.session_state.get('prefetch_coords') == snapped:
+        return
+    st.session_state.prefetch_coords = snapped
+    guess = nearest_landmark(snapped[0], snapped[1], PREFETCH_GUESS_RADIUS_M) or fallback_location
+    mode = 'random' if st.session_state.get('use_hidden_gem') else 'popular'
+    get_prefetcher().prefetch(build_query(guess, st.session_state.get('category_options')), mode, snapped)
+
+# Map rendering: memoized by (menu, place ids); STATIC_MAP=1 makes the static HTML map the default
+MAP_CACHE_ENTRIES = 32
+STATIC_MAP_DEFAULT = os.getenv("STATIC_MAP") == "1"
+
+@st.cache_resource(max_entries=MAP_CACHE_ENTRIES, show_spinner=False)
+def get_menu_map(menu, place_ids, _places):
+    return build_map(_places)
+
+@st.cache_data(max_entries=MAP_CACHE_ENTRIES, show_spinner=False)
+def get_menu_map_html(menu, place_ids, _places):
+    return render_map_html(_places)
+
+def clear_pipeline_cache(query, mode, coords):
+    """
+    Drop the shared fetch/process/extract results of one search only; the forced rerun
+    stores the fresh ones under the same key. Maps are keyed by place ids, so they follow.
+    """
+    fetch_items.clear(query, mode, coords)
+    run_pipeline.clear(query, mode, coords)
+
+def format_radius(meters):
+    return f"{meters}m" if meters < 1000 else f"{meters/1000:g}km"
+
 def clean_html(raw_html):
     import re
     cleanr = re.compile('<.*?>')
     return re.sub(cleanr, '', raw_html)
 
+def render_debug_panel():
+    """Rolling per-stage timings / cache counters (LUNCH_METRICS=1 only)."""
+    with st.sidebar.expander("🛠️ 성능 디버그 (Metrics)"):
+        ratios = metrics.hit_ratios()
+        if ratios:
+            st.caption(" · ".join(f"{layer} 캐시 적중률 {ratio:.0%}" for layer, ratio in sorted(ratios.items())))
+        st.markdown("**단계별 누적 시간**")
+        st.dataframe(metrics.stage_summary(), hide_index=True)
+        st.markdown("**최근 구간 (최신순)**")
+        st.dataframe(metrics.recent_spans(30), hide_index=True,
+                     column_config={"at": None})
+        st.download_button("Prometheus 텍스트 받기", metrics.export_prometheus(),
+                           file_name="metrics.prom", mime="text/plain")
+
 def main():
     st.title("🍱 오늘 점심, 뭐 먹지?")
     st.caption("주변 맛집 데이터를 분석해 **실제 먹을 수 있는 메뉴**만 추천해 드려요.")
@@ -52,6 +238,8 @@ def main():
         use_geo = st.toggle("📍 현재 위치 사용", value=True)
         location_coords = None
         if use_geo:
+             # Imported on first use: keeps the component package out of the cold-start import path
+             from streamlit_js_eval import get_geolocation
              loc = get_geolocation()
              if loc:
                  location_coords = (loc['coords']['latitude'], loc['coords']['longitude'])
@@ -63,6 +251,8 @@ def main():
 
         # Update location if coords found
         if location_coords:
+            # Searching starts now; geocoding below may block on the network meanwhile
+            start_prefetch(location_coords, st.session_state.current_location)
             address = get_address_from_coords(location_coords[0], location_coords[1])
             if address:
                 if st.session_state.current_location != address:
@@ -90,18 +280,21 @@ def main():
         
         st.header("⚙️ 옵션")
         # Hidden Gem Toggle
-        use_hidden_gem = st.toggle("💎 숨은 맛집 찾기 (랜덤/다양성)", 
+        use_hidden_gem = st.toggle("💎 숨은 맛집 찾기 (랜덤/다양성)", key="use_hidden_gem",
                                    help="활성화하면 리뷰순이 아닌 랜덤순으로 다양한 식당을 가져옵니다.")
                                    
+        static_map = st.toggle("🗺️ 가벼운 지도 (정적 HTML)", value=STATIC_MAP_DEFAULT,
+                               help="미리 그려둔 지도를 보여줘서 화면 전환이 빨라집니다. (지도 조작 시 앱이 다시 실행되지 않음)")
+        
         category_options = st.multiselect(
             "선호 종류 (선택 안 하면 전체)", 
             ["한식", "양식", "중식", "일식", "분식", "아시아"],
-            default=[]
+            default=[], key="category_options"
         )
 
         st.divider()
         with st.expander("👅 내 입맛 설정 (My Taste)"):
-            prefs = UserPreferences()
+            prefs = get_preferences()
             
             # Dislikes
             current_dislikes = prefs.get_dislikes()
@@ -121,35 +314,41 @@ def main():
             
             if new_dislikes != current_dislikes or new_favorites != current_favorites:
                 prefs.save_preferences(new_dislikes, new_favorites)
-                st.success("취향이 저장되었습니다! (다음 검색부터 적용)")
-                # If we want immediate effect on MENUS (not api call), we might just rerun if data exists
-                if st.session_state.processed_results:
-                     st.session_state.top_menus = [] # Force re-extraction
+                st.success("취향이 저장되었습니다! (추천 메뉴에 바로 반영)")
+                # The saved version no longer matches the session's: re-weighted below as a delta
+                if st.session_state.get('recommender') and st.session_state.get('processed_results'):
                      st.rerun()
         
     # Main Logic
     # 1. Fetch Data
-    query = f"{location} 맛집"
-    if category_options:
-        query = f"{location} {' '.join(category_options)} 맛집"
+    query = build_query(location, category_options)
 
     # Initialize session state for data persistence
     if 'processed_results' not in st.session_state:
         st.session_state.processed_results = []
     if 'top_menus' not in st.session_state:
         st.session_state.top_menus = []
+    if 'menu_index' not in st.session_state:
+        st.session_state.menu_index = {}
+    if 'recommender' not in st.session_state:
+        st.session_state.recommender = None
+    if 'recent_picks' not in st.session_state:
+        st.session_state.recent_picks = []
     if 'last_query' not in st.session_state:
         st.session_state.last_query = ""
     if 'last_mode' not in st.session_state: # Track mode changes
         st.session_state.last_mode = ""
 
+    current_mode = 'random' if use_hidden_gem else 'popular'
+    # Only filter if we have valid user coordinates matching the current view
+    use_coords = use_geo and location_coords and location == st.session_state.current_location
+    pipeline_coords = snap_coords(location_coords) if use_coords else None
+
     # Clear cache only if requested explicitly or implicitly by changing options
     need_refresh = False
     if st.button("🔄 데이터 다시 불러오기", type="secondary"):
-        st.cache_data.clear() # Clear streamlit cache
+        clear_pipeline_cache(query, current_mode, pipeline_coords) # Drop this search's shared results
         need_refresh = True
-        
-    current_mode = 'random' if use_hidden_gem else 'popular'
     
     # Check if we need to fetch new data (Query changed, Mode changed, or Refresh requested)
     if (query != st.session_state.last_query) or (current_mode != st.session_state.last_mode) or need_refresh or not st.session_state.processed_results:
@@ -157,70 +356,51 @@ def main():
         st.session_state.last_mode = current_mode
         st.session_state.selected_menu = None # Reset selection on new search
         
-        api = NaverPlaceAPI(CLIENT_ID, CLIENT_SECRET)
-        
         with st.spinner(f"📡 {location} 주변 식당 스캔 중... (모드: {'숨은 맛집' if use_hidden_gem else '인기 맛집'})"):
-            if CLIENT_ID and CLIENT_SECRET and "your_client_id" not in CLIENT_ID:
-                # API handles file caching internally now
-                # Pass need_refresh to force API to ignore file cache
-                raw_data = api.search_places(query, display=50, search_mode=current_mode, force_refresh=need_refresh) 
-                items = raw_data['items'] if raw_data else []
-            else:
-                items = MOCK_DATA
-                if not CLIENT_ID: st.warning("데모 모드: API 키 설정을 확인해주세요.")
+            if not CLIENT_ID:
+                st.warning("데모 모드: API 키 설정을 확인해주세요.")
             
-            processor = DataProcessor()
-            processed_temp = processor.process_places(items)
+            pipeline = run_pipeline(
+                query, current_mode, pipeline_coords,
+                _force_refresh=need_refresh
+            )
             
-            # 🟢 SMART RADIUS FILTERING (Progressive Expansion)
-            # Only filter if we have valid user coordinates matching the current view
-            if use_geo and location_coords and location == st.session_state.current_location:
-                 from backend.geo_utils import calculate_distance
-                 # Filter only if explicitly using current location
-                 
-                 user_lat, user_lng = location_coords
-                 
-                 # Progressive check: 500m -> 1km -> 2km -> All
-                 radii = [500, 1000, 2000]
-                 found_radius = None
-                 filtered_items = []
-                 
-                 for r in radii:
-                     temp_items = []
-                     for item in processed_temp:
-                         dist = calculate_distance(user_lat, user_lng, item.get('mapx'), item.get('mapy'))
-                         if dist <= r:
-                             temp_items.append(item)
-                     
-                     if temp_items:
-                         filtered_items = temp_items
-                         found_radius = r
-                         break
-                 
-                 # Feedback to user
-                 if filtered_items:
-                     radius_text = f"{found_radius}m" if found_radius < 1000 else f"{found_radius/1000}km"
-                     if found_radius == 500:
-                        st.info(f"📍 현재 위치 반경 {radius_text} 이내 맛집 {len(filtered_items)}개를 찾았습니다.")
+            # Feedback to user (smart radius)
+            if use_coords:
+                 found_radius = pipeline['radius']
+                 if found_radius:
+                     radius_text = format_radius(found_radius)
+                     if found_radius == RADIUS_LADDER[0]:
+                        st.info(f"📍 현재 위치 반경 {radius_text} 이내 맛집 {len(pipeline['places'])}개를 찾았습니다.")
                      else:
-                        st.warning(f"⚠️ 500m 이내에 식당이 없어 검색 범위를 **{radius_text}**까지 넓혔습니다. ({len(filtered_items)}개 발견)")
-                     processed_temp = filtered_items
+                        st.warning(f"⚠️ {format_radius(RADIUS_LADDER[0])} 이내에 식당이 없어 검색 범위를 **{radius_text}**까지 넓혔습니다. ({len(pipeline['places'])}개 발견)")
                  else:
-                     st.error("⚠️ 반경 2km 이내에도 식당이 없어 검색된 모든 결과를 보여드립니다.")
-                     # Fallback to all items (no filtering)
+                     st.error(f"⚠️ 반경 {format_radius(RADIUS_LADDER[-1])} 이내에도 식당이 없어 검색된 모든 결과를 보여드립니다.")
             
-            st.session_state.processed_results = processed_temp
+            # Session keeps references to the shared results, not copies
+            st.session_state.processed_results = pipeline['places']
             
-            # 2. Extract Menus (Only once per fetch)
-            recommender = MenuRecommender()
-            # Load fresh prefs
-            current_prefs = UserPreferences()
-            st.session_state.top_menus = recommender.extract_top_menus(
-                st.session_state.processed_results, 
-                top_n=15, 
+            current_prefs = get_preferences()
+            # Per-user weights over the shared keyword counts and menu index
+            recommender = pipeline['recommender'].with_preferences(
                 dislikes=current_prefs.get_dislikes(),
                 favorites=current_prefs.get_favorites()
             )
+            st.session_state.top_menus = recommender.sample_menus(15)
+            st.session_state.menu_index = recommender.menu_index
+            # Keep the recommender: its alias table serves random picks without rebuilding
+            st.session_state.recommender = recommender
+            st.session_state.prefs_version = current_prefs.version
+            st.session_state.recent_picks = []
+
+    # Preferences changed since the view was built (this or another tab of the same user):
+    # apply the change as a delta on the existing keyword counts (no re-extraction)
+    current_prefs = get_preferences()
+    if st.session_state.recommender and st.session_state.get('prefs_version') != current_prefs.version:
+        st.session_state.top_menus = st.session_state.recommender.update_preferences(
+            current_prefs.get_dislikes(), current_prefs.get_favorites(), top_n=15
+        )
+        st.session_state.prefs_version = current_prefs.version
 
     
     # Use cached data
@@ -242,9 +422,15 @@ def main():
         st.markdown("### 🎲 못 고르겠다면?")
         if st.button("랜덤 메뉴 뽑기!", type="primary", use_container_width=True):
             if st.session_state.top_menus:
-                # Re-apply preference weight for random pick slightly? 
-                # Already done in extraction, but let's just pick one.
-                st.session_state.selected_menu = random.choice(st.session_state.top_menus)
+                # Weighted pick among the chips on screen (frequency + favorite boost), skipping recent picks
+                recommender = st.session_state.recommender
+                picked = recommender.pick_random(
+                    exclude=st.session_state.recent_picks, among=st.session_state.top_menus
+                ) if recommender else None
+                if picked is None:
+                    picked = random.choice(st.session_state.top_menus)
+                st.session_state.selected_menu = picked
+                st.session_state.recent_picks = (st.session_state.recent_picks + [picked])[-RECENT_PICKS_LIMIT:]
             else:
                 st.error("추천할 메뉴 데이터가 부족해요.")
 
@@ -278,11 +464,10 @@ def main():
         target_menu = st.session_state.selected_menu
         st.header(f"😋 오늘의 추천: [{target_menu}]")
         
-        # Filter restaurants
-        matched_places = [
-            p for p in processed_results 
-            if target_menu in p.get('category', '') or target_menu in p.get('title', '') or target_menu in p.get('description', '')
-        ]
+        # Filter restaurants (inverted index built once per fetch)
+        matched_places = MenuRecommender.lookup_places(
+            target_menu, processed_results, st.session_state.menu_index
+        )
         
         if matched_places:
             c1, c2 = st.columns([1, 1])
@@ -297,34 +482,29 @@ def main():
                     encoded_query = quote(f"{location} {clean_title}") # Include location to be precise
                     link = f"https://map.naver.com/v5/search/{encoded_query}"
                     
+                    # Distance is only known when the smart radius filter ran (results are closest first)
+                    distance_text = ""
+                    if 'distance_m' in place:
+                        d = place['distance_m']
+                        distance_text = f" · 🚶 {d}m" if d < 1000 else f" · 🚶 {d/1000:.1f}km"
+                    
                     st.markdown(f"""
                     **{i+1}. [{clean_title}]({link})** <span style="color:#888">({place.get('category')})</span>  
-                    📍 {place.get('roadAddress', place.get('address'))}
+                    📍 {place.get('roadAddress', place.get('address'))}{distance_text}
                     """, unsafe_allow_html=True)
             
             with c2:
-                # Map Visualization
-                # Calculate center from matched places if coords exist
-                lats = [p['lat'] for p in matched_places if 'lat' in p]
-                lngs = [p['lng'] for p in matched_places if 'lng' in p]
-                
-                if lats and lngs:
-                    center = [sum(lats)/len(lats), sum(lngs)/len(lngs)]
+                # Map Visualization (memoized per menu + place set, clustered for large sets)
+                place_ids = tuple(place_key(p) for p in matched_places)
+                if static_map:
+                    # Pre-rendered HTML: reruns don't touch Folium or re-serialize anything
+                    st.iframe(get_menu_map_html(target_menu, place_ids, matched_places), height=300)
                 else:
-                    center = [37.4979, 127.0276] # Default Gangnam
-                    
-                m = folium.Map(location=center, zoom_start=14)
-                
-                # Add markers
-                for p in matched_places:
-                    if 'lat' in p and 'lng' in p:
-                       folium.Marker(
-                           [p['lat'], p['lng']], 
-                           popup=clean_html(p['title']), 
-                           tooltip=p.get('category')
-                       ).add_to(m)
-                    
-                st_folium(m, height=300, use_container_width=True)
+                    # Folium/streamlit_folium are only loaded once a map is actually shown
+                    from streamlit_folium import st_folium
+                    m = get_menu_map(target_menu, place_ids, matched_places)
+                    # returned_objects=[]: panning/zooming the map doesn't trigger app reruns
+                    st_folium(m, height=300, use_container_width=True, returned_objects=[])
         else:
             st.warning(f"아쉽게도 '{target_menu}' 관련 식당을 찾지 못했어요. 다른 메뉴를 골라보세요!")
             
@@ -337,4 +517,8 @@ def main():
         """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
+    # st.rerun() / st.stop() end the script by raising: not errors
+    with metrics.span("app.rerun", ignore=(RerunException, StopException)):
+        main()
+    if metrics.enabled():
+        render_debug_panel()
@@ -1,9 +1,13 @@
-import pandas as pd
+from backend import metrics
 from backend.nlp import ReviewAnalyzer
+from backend.db_manager import DatabaseManager
 
 class DataProcessor:
-    def __init__(self):
+    def __init__(self, db=None):
         self.review_analyzer = ReviewAnalyzer()
+        # Persistent NLP memo (restaurant.db). Same descriptions come back every day.
+        self.db = db if db is not None else DatabaseManager()
+        self._nlp_cache_purged = False
 
     def normalize_ratings(self, places):
         """
@@ -13,8 +17,6 @@ class DataProcessor:
         if not places:
             return []
 
-        df = pd.DataFrame(places)
-        
         # Ensure rating field exists and is numeric (Naver API might return strings)
         # Note: Naver Search API returns 'userRating' (string example "4.5") or sometimes no rating
         # We need to handle missing keys gracefully
@@ -87,6 +89,7 @@ class DataProcessor:
             
         return cleaned_places
 
+    @metrics.timed("process_places")
     def process_places(self, places):
         """
         Main processing pipeline:
@@ -98,19 +101,15 @@ class DataProcessor:
         normalized_places = self.normalize_ratings(places)
         
         # 2. NLP & Suitability
+        # Simulate reviews from 'description' or generate mock for MVP
+        # For MVP, let's treat description as the "review snippet"
+        descriptions = [place.get('description', '') for place in normalized_places]
+        analyses = self.analyze_descriptions(descriptions)
+
         final_results = []
-        for place in normalized_places:
-            # Simulate reviews from 'description' or generate mock for MVP
-            description = place.get('description', '')
-            # If description is too short, we assume we might need more text
-            # For MVP, let's treat description as the "review snippet"
-            
-            reviews = [description] if description else []
-            
-            analysis = self.review_analyzer.analyze_reviews(reviews)
-            
+        for place, analysis in zip(normalized_places, analyses):
             place['lunch_score'] = analysis['score']
-            place['lunch_keywords'] = analysis['keywords']
+            place['lunch_keywords'] = list(analysis['keywords'])
             place['sentiment'] = analysis['sentiment']
             
             final_results.append(place)
@@ -119,3 +118,45 @@ class DataProcessor:
         final_results.sort(key=lambda x: (x['lunch_score'], x['adjusted_rating']), reverse=True)
         
         return final_results
+
+    @metrics.timed("nlp")
+    def analyze_descriptions(self, descriptions):
+        """
+        Run ReviewAnalyzer over a list of description strings, memoized in the DB.
+        Only texts never seen with the current lexicon version are analyzed;
+        everything else is a single batched hash lookup.
+        """
+        analyzer = self.review_analyzer
+        version = analyzer.lexicon_version
+
+        hashes = {}
+        for text in descriptions:
+            if text and text not in hashes:
+                hashes[text] = analyzer.text_hash(text)
+
+        try:
+            cached = self.db.get_nlp_results(hashes.values(), version)
+        except Exception as e:
+            print(f"NLP Cache Error: {e}")
+            cached = {}
+
+        fresh = {}
+        for text, text_hash in hashes.items():
+            if text_hash not in cached:
+                fresh[text_hash] = analyzer.analyze_reviews([text])
+        metrics.incr("cache_requests", len(hashes) - len(fresh), layer="nlp", result="hit")
+        metrics.incr("cache_requests", len(fresh), layer="nlp", result="miss")
+
+        if fresh:
+            try:
+                if not self._nlp_cache_purged:
+                    # Lexicon changed since last run -> old rows are dead weight
+                    self.db.purge_nlp_cache(version)
+                    self._nlp_cache_purged = True
+                self.db.save_nlp_results(fresh, version)
+            except Exception as e:
+                print(f"NLP Cache Error: {e}")
+            cached.update(fresh)
+
+        empty = analyzer.analyze_reviews([])
+        return [cached[hashes[text]] if text else empty for text in descriptions]
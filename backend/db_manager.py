@@ -4,6 +4,10 @@ import os
 import time
 from datetime import datetime
 
+NLP_BATCH_SIZE = 500
+# Addresses don't move; keep reverse geocoding results for 30 days
+GEOCODE_EXPIRY = 30 * 86400
+
 class DatabaseManager:
     def __init__(self, db_path="restaurant.db"):
         self.db_path = db_path
@@ -13,6 +17,8 @@ class DatabaseManager:
         """Initialize the database schema."""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            # WAL: readers never block the (many small) preference writes and vice versa
+            cursor.execute("PRAGMA journal_mode=WAL")
             # simple key-value store structure for caching
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS search_cache (
@@ -21,6 +27,34 @@ class DatabaseManager:
                     created_at REAL
                 )
             """)
+            # memo table for ReviewAnalyzer results, keyed by text hash + lexicon version
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS nlp_cache (
+                    text_hash TEXT,
+                    lexicon_version TEXT,
+                    json_data TEXT,
+                    created_at REAL,
+                    PRIMARY KEY (text_hash, lexicon_version)
+                )
+            """)
+            # reverse geocoding results keyed by grid-snapped coordinates
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS geocode_cache (
+                    cell_key TEXT PRIMARY KEY,
+                    address TEXT,
+                    created_at REAL
+                )
+            """)
+            # per-user taste settings; version increments on every save
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_preferences (
+                    user_id TEXT PRIMARY KEY,
+                    dislikes TEXT,
+                    favorites TEXT,
+                    version INTEGER NOT NULL DEFAULT 1,
+                    updated_at REAL
+                )
+            """)
             conn.commit()
 
     def get_cache(self, query_key, expiry_seconds=86400):
@@ -57,6 +91,144 @@ class DatabaseManager:
             """, (query_key, json_str, time.time()))
             conn.commit()
 
+    def iter_cached_items(self, expiry_seconds=None, key_pattern=None):
+        """
+        Yield (items, created_at) for every cached search result.
+        Used to (re)build the spatial index over everything we have stored locally.
+        - expiry_seconds: skip entries older than this (None = all)
+        - key_pattern: only keys matching this SQL LIKE pattern (None = all)
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            if key_pattern is None:
+                cursor.execute("SELECT json_data, created_at FROM search_cache")
+            else:
+                cursor.execute("SELECT json_data, created_at FROM search_cache WHERE query_key LIKE ?", (key_pattern,))
+            now = time.time()
+            for json_data, created_at in cursor:
+                if expiry_seconds is not None and now - created_at >= expiry_seconds:
+                    continue
+                try:
+                    data = json.loads(json_data)
+                except json.JSONDecodeError:
+                    continue
+                items = data.get('items') if isinstance(data, dict) else None
+                if items:
+                    yield items, created_at
+
+    def get_geocode(self, cell_key, expiry_seconds=GEOCODE_EXPIRY):
+        """Cached address for a snapped coordinate cell, or None."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT address, created_at FROM geocode_cache WHERE cell_key = ?", (cell_key,))
+            row = cursor.fetchone()
+            if row and time.time() - row[1] < expiry_seconds:
+                return row[0]
+            return None
+
+    def save_geocode(self, cell_key, address):
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO geocode_cache (cell_key, address, created_at)
+                VALUES (?, ?, ?)
+            """, (cell_key, address, time.time()))
+            conn.commit()
+
+    def get_user_preferences(self, user_id):
+        """(dislikes, favorites, version) for a user, or None if they never saved any."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT dislikes, favorites, version FROM user_preferences WHERE user_id = ?", (user_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            try:
+                return json.loads(row[0]), json.loads(row[1]), row[2]
+            except (TypeError, json.JSONDecodeError):
+                return [], [], row[2]
+
+    def get_user_preferences_version(self, user_id):
+        """Current version of a user's preferences (0 if never saved). Cheap primary-key read."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM user_preferences WHERE user_id = ?", (user_id,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+
+    def save_user_preferences(self, user_id, dislikes, favorites):
+        """Atomic upsert of a user's preferences. Returns the new version."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO user_preferences (user_id, dislikes, favorites, version, updated_at)
+                VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    dislikes = excluded.dislikes,
+                    favorites = excluded.favorites,
+                    version = user_preferences.version + 1,
+                    updated_at = excluded.updated_at
+                RETURNING version
+            """, (user_id, json.dumps(dislikes, ensure_ascii=False), json.dumps(favorites, ensure_ascii=False), time.time()))
+            version = cursor.fetchone()[0]
+            conn.commit()
+            return version
+
+    def get_nlp_results(self, text_hashes, lexicon_version):
+        """
+        Batched lookup of cached NLP results.
+        Returns dictionary {text_hash: result} for the hashes that were found.
+        """
+        results = {}
+        hashes = list(text_hashes)
+        if not hashes:
+            return results
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            # SQLite limits the number of bound variables, so query in chunks
+            for i in range(0, len(hashes), NLP_BATCH_SIZE):
+                chunk = hashes[i:i + NLP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT text_hash, json_data FROM nlp_cache "
+                    f"WHERE lexicon_version = ? AND text_hash IN ({placeholders})",
+                    [lexicon_version] + chunk
+                )
+                for text_hash, json_data in cursor.fetchall():
+                    try:
+                        results[text_hash] = json.loads(json_data)
+                    except json.JSONDecodeError:
+                        pass
+        return results
+
+    def save_nlp_results(self, results, lexicon_version):
+        """Batched insert of NLP results ({text_hash: result})."""
+        if not results:
+            return
+        now = time.time()
+        rows = [
+            (text_hash, lexicon_version, json.dumps(result, ensure_ascii=False), now)
+            for text_hash, result in results.items()
+        ]
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO nlp_cache (text_hash, lexicon_version, json_data, created_at)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+
+    def purge_nlp_cache(self, keep_version):
+        """Drop NLP results computed with an outdated lexicon."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM nlp_cache WHERE lexicon_version != ?", (keep_version,))
+            conn.commit()
+            return cursor.rowcount
+
     def migrate_from_json(self, json_path):
         """One-time migration helper."""
         if not os.path.exists(json_path):
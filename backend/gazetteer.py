@@ -0,0 +1,115 @@
+"""
+Offline gazetteer: centroids of subway stations people search lunch around.
+Answers most reverse-geocoding lookups locally (KD-tree nearest neighbour),
+so Nominatim is only needed outside the covered area.
+"""
+import math
+
+# (name, lat, lon) - station exits are within a couple hundred meters of these
+STATIONS = [
+    # Line 2
+    ("시청역", 37.5657, 126.9769), ("을지로입구역", 37.5660, 126.9826), ("을지로3가역", 37.5663, 126.9911),
+    ("을지로4가역", 37.5667, 126.9980), ("동대문역사문화공원역", 37.5652, 127.0079), ("신당역", 37.5657, 127.0194),
+    ("상왕십리역", 37.5644, 127.0293), ("왕십리역", 37.5613, 127.0371), ("한양대역", 37.5556, 127.0437),
+    ("뚝섬역", 37.5472, 127.0474), ("성수역", 37.5446, 127.0557), ("건대입구역", 37.5404, 127.0692),
+    ("구의역", 37.5370, 127.0859), ("강변역", 37.5351, 127.0947), ("잠실나루역", 37.5206, 127.1038),
+    ("잠실역", 37.5133, 127.1001), ("잠실새내역", 37.5116, 127.0862), ("종합운동장역", 37.5109, 127.0738),
+    ("삼성역", 37.5088, 127.0631), ("선릉역", 37.5045, 127.0490), ("역삼역", 37.5006, 127.0364),
+    ("강남역", 37.4979, 127.0276), ("교대역", 37.4934, 127.0140), ("서초역", 37.4918, 127.0076),
+    ("방배역", 37.4815, 126.9976), ("사당역", 37.4766, 126.9816), ("낙성대역", 37.4769, 126.9637),
+    ("서울대입구역", 37.4812, 126.9527), ("봉천역", 37.4825, 126.9418), ("신림역", 37.4842, 126.9297),
+    ("신대방역", 37.4875, 126.9132), ("구로디지털단지역", 37.4853, 126.9015), ("대림역", 37.4925, 126.8949),
+    ("신도림역", 37.5088, 126.8913), ("문래역", 37.5180, 126.8950), ("영등포구청역", 37.5257, 126.8965),
+    ("당산역", 37.5343, 126.9024), ("합정역", 37.5495, 126.9139), ("홍대입구역", 37.5572, 126.9245),
+    ("신촌역", 37.5552, 126.9369), ("이대역", 37.5567, 126.9460), ("아현역", 37.5574, 126.9564),
+    ("충정로역", 37.5597, 126.9636),
+    # Downtown / Yongsan
+    ("광화문역", 37.5710, 126.9768), ("종각역", 37.5702, 126.9831), ("종로3가역", 37.5714, 126.9916),
+    ("안국역", 37.5765, 126.9854), ("혜화역", 37.5822, 127.0019), ("동대문역", 37.5714, 127.0096),
+    ("서울역", 37.5547, 126.9707), ("용산역", 37.5298, 126.9648), ("삼각지역", 37.5347, 126.9731),
+    ("이태원역", 37.5345, 126.9943), ("한남역", 37.5294, 127.0090),
+    # Gangnam / Seocho
+    ("신사역", 37.5163, 127.0203), ("압구정역", 37.5270, 127.0284), ("압구정로데오역", 37.5274, 127.0405),
+    ("청담역", 37.5192, 127.0535), ("논현역", 37.5110, 127.0216), ("신논현역", 37.5045, 127.0250),
+    ("학동역", 37.5142, 127.0316), ("강남구청역", 37.5172, 127.0412), ("양재역", 37.4842, 127.0346),
+    ("양재시민의숲역", 37.4705, 127.0383), ("고속터미널역", 37.5049, 127.0049), ("한티역", 37.4962, 127.0529),
+    ("도곡역", 37.4909, 127.0554), ("매봉역", 37.4868, 127.0467), ("대치역", 37.4946, 127.0635),
+    ("개포동역", 37.4891, 127.0663), ("수서역", 37.4873, 127.1017),
+    # Songpa / Gangdong
+    ("가락시장역", 37.4925, 127.1182), ("문정역", 37.4857, 127.1225), ("천호역", 37.5387, 127.1237),
+    # Yeouido / Mapo / West
+    ("여의도역", 37.5216, 126.9242), ("여의나루역", 37.5271, 126.9329), ("노량진역", 37.5133, 126.9426),
+    ("마포역", 37.5396, 126.9458), ("공덕역", 37.5436, 126.9513), ("광흥창역", 37.5475, 126.9316),
+    ("상수역", 37.5477, 126.9228), ("망원역", 37.5560, 126.9100), ("디지털미디어시티역", 37.5768, 126.9003),
+    ("마곡나루역", 37.5668, 126.8272), ("오목교역", 37.5245, 126.8750), ("목동역", 37.5260, 126.8645),
+    ("가산디지털단지역", 37.4816, 126.8827),
+    # North
+    ("성신여대입구역", 37.5926, 127.0170), ("수유역", 37.6380, 127.0257), ("노원역", 37.6551, 127.0613),
+    ("연신내역", 37.6190, 126.9210),
+    # Pangyo / Bundang
+    ("판교역", 37.3948, 127.1112), ("정자역", 37.3670, 127.1084),
+]
+
+METERS_PER_DEG_LAT = 111320.0
+
+
+class KDTree:
+    """Minimal 2-d KD-tree over planar (x, y) points for nearest-neighbour lookups."""
+
+    def __init__(self, points):
+        self.points = list(points)
+        self._root = self._build(list(range(len(self.points))), 0)
+
+    def _build(self, ids, depth):
+        if not ids:
+            return None
+        axis = depth % 2
+        ids.sort(key=lambda i: self.points[i][axis])
+        mid = len(ids) // 2
+        return (ids[mid], axis, self._build(ids[:mid], depth + 1), self._build(ids[mid + 1:], depth + 1))
+
+    def nearest(self, x, y):
+        """Return (distance, point id) of the closest point, or (inf, None) if empty."""
+        best = [math.inf, None]
+
+        def visit(node):
+            if node is None:
+                return
+            pid, axis, left, right = node
+            px, py = self.points[pid]
+            d = math.hypot(px - x, py - y)
+            if d < best[0]:
+                best[0], best[1] = d, pid
+            diff = (x if axis == 0 else y) - (px if axis == 0 else py)
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if abs(diff) < best[0]:
+                visit(far)
+
+        visit(self._root)
+        return best[0], best[1]
+
+
+class Gazetteer:
+    """Nearest named place (station) for a WGS84 coordinate, fully offline."""
+
+    def __init__(self, entries=STATIONS, ref_lat=37.5):
+        self.names = [name for name, lat, lon in entries]
+        self._lon_scale = METERS_PER_DEG_LAT * math.cos(math.radians(ref_lat))
+        self._tree = KDTree(self._project(lat, lon) for name, lat, lon in entries)
+
+    def _project(self, lat, lon):
+        # Local equirectangular projection in meters; accurate enough at city scale
+        return (lon * self._lon_scale, lat * METERS_PER_DEG_LAT)
+
+    def nearest(self, lat, lon):
+        """Return (name, distance_m) of the closest entry."""
+        dist, pid = self._tree.nearest(*self._project(lat, lon))
+        if pid is None:
+            return None, math.inf
+        return self.names[pid], dist
+
+    def lookup(self, lat, lon, max_distance_m):
+        """Name of the closest entry within max_distance_m, else None."""
+        name, dist = self.nearest(lat, lon)
+        return name if dist <= max_distance_m else None
@@ -1,16 +1,64 @@
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
-import ssl
-import certifi
+import math
+import time
+import threading
+from collections import defaultdict
+import numpy as np
 
-def get_address_from_coords(lat, lng):
+from backend import metrics
+
+# Mean earth radius (IUGG) in meters, used by the vectorized haversine
+EARTH_RADIUS_M = 6371008.8
+# Distance returned when coordinates can't be converted
+INVALID_DISTANCE = 999999
+# Progressive expansion used by the smart radius filter: 500m -> 1km -> 2km
+DEFAULT_RADIUS_LADDER = (500, 1000, 2000)
+
+# Reverse geocoding: snap to a ~100m grid so nearby GPS fixes share one cache entry
+GEOCODE_GRID_DECIMALS = 3
+# Use the offline gazetteer when a station is within this distance
+OFFLINE_MAX_DISTANCE_M = 800
+
+_GEOCODE_MEMO = {}
+_GEOCODE_DB = None
+_GEOLOCATOR = None
+_GAZETTEER = None
+
+def _geocode_cell_key(lat, lng):
+    return f"{round(lat, GEOCODE_GRID_DECIMALS):.{GEOCODE_GRID_DECIMALS}f},{round(lng, GEOCODE_GRID_DECIMALS):.{GEOCODE_GRID_DECIMALS}f}"
+
+def _get_geocode_db():
+    global _GEOCODE_DB
+    if _GEOCODE_DB is None:
+        from backend.db_manager import DatabaseManager
+        _GEOCODE_DB = DatabaseManager()
+    return _GEOCODE_DB
+
+def _get_gazetteer():
+    global _GAZETTEER
+    if _GAZETTEER is None:
+        from backend.gazetteer import Gazetteer
+        _GAZETTEER = Gazetteer()
+    return _GAZETTEER
+
+def _get_geolocator():
+    """Nominatim client, created once per process (not on every rerun)."""
+    global _GEOLOCATOR
+    if _GEOLOCATOR is None:
+        # geopy/certifi are only needed when the gazetteer and caches miss
+        import ssl
+        import certifi
+        from geopy.geocoders import Nominatim
+        # Fix for SSL certificate errors on some environments
+        ctx = ssl.create_default_context(cafile=certifi.where())
+        _GEOLOCATOR = Nominatim(user_agent="lunch_picker_app", ssl_context=ctx)
+    return _GEOLOCATOR
+
+def reverse_geocode_nominatim(lat, lng):
     """
-    Reverse geocode coordinates to a structured address.
+    Reverse geocode coordinates to a structured address via Nominatim (network).
     Returns a string like "역삼동" or "강남구 역삼동".
     """
-    # Fix for SSL certificate errors on some environments
-    ctx = ssl.create_default_context(cafile=certifi.where())
-    geolocator = Nominatim(user_agent="lunch_picker_app", ssl_context=ctx)
+    geolocator = _get_geolocator()
     
     try:
         location = geolocator.reverse((lat, lng), exactly_one=True, language='ko')
@@ -35,6 +83,45 @@ def get_address_from_coords(lat, lng):
         return None
     return None
 
+def nearest_landmark(lat, lng, max_distance_m):
+    """Closest gazetteer station within max_distance_m (offline, no caching needed), else None."""
+    return _get_gazetteer().lookup(lat, lng, max_distance_m)
+
+def get_address_from_coords(lat, lng, db=None):
+    """
+    Location name for coordinates, cheapest source first:
+    1. in-process memo / 2. offline gazetteer (nearest station within OFFLINE_MAX_DISTANCE_M)
+    3. persistent geocode_cache table / 4. Nominatim (result is cached in 1 and 3).
+    Coordinates are snapped to a ~100m grid for caching.
+    """
+    cell_key = _geocode_cell_key(lat, lng)
+    if cell_key in _GEOCODE_MEMO:
+        return _GEOCODE_MEMO[cell_key]
+
+    address = _get_gazetteer().lookup(lat, lng, OFFLINE_MAX_DISTANCE_M)
+    if address:
+        _GEOCODE_MEMO[cell_key] = address
+        return address
+
+    db = db or _get_geocode_db()
+    try:
+        address = db.get_geocode(cell_key)
+    except Exception as e:
+        print(f"Geocode Cache Error: {e}")
+        address = None
+
+    if not address:
+        address = reverse_geocode_nominatim(lat, lng)
+        if not address:
+            return None # Don't cache failures
+        try:
+            db.save_geocode(cell_key, address)
+        except Exception as e:
+            print(f"Geocode Cache Error: {e}")
+
+    _GEOCODE_MEMO[cell_key] = address
+    return address
+
 def katech_to_wgs84(mapx, mapy):
     """
     Convert Naver's Search API coordinates to WGS84 (Lat, Lon).
@@ -81,3 +168,239 @@ def calculate_distance(lat1, lon1, mapx, mapy):
         return geodesic((lat1, lon1), (lat2, lon2)).meters
     except:
         return 999999
+
+def naver_coords_to_arrays(places):
+    """
+    Convert the 'mapx'/'mapy' fields of many places to (lats, lons) NumPy arrays in one go.
+    Same rules as katech_to_wgs84; unparseable or legacy coordinates become NaN.
+    """
+    n = len(places)
+    mx = np.full(n, np.nan)
+    my = np.full(n, np.nan)
+    for i, place in enumerate(places):
+        x, y = place.get('mapx'), place.get('mapy')
+        if not x or not y:
+            continue
+        try:
+            mx[i] = float(x)
+            my[i] = float(y)
+        except (TypeError, ValueError):
+            pass
+
+    valid = (mx > 120000000) & (my > 30000000)
+    lats = np.where(valid, my / 10000000.0, np.nan)
+    lons = np.where(valid, mx / 10000000.0, np.nan)
+    return lats, lons
+
+def haversine_distances(lat1, lon1, lats, lons):
+    """
+    Vectorized great-circle distance in meters from one WGS84 point to arrays of points.
+    NaN coordinates get INVALID_DISTANCE, like calculate_distance.
+    At city scale this stays within ~0.5% of the ellipsoidal geodesic.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lons - lon1)
+
+    a = np.sin(dphi / 2.0) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2.0) ** 2
+    dist = 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return np.where(np.isnan(dist), INVALID_DISTANCE, dist)
+
+def calculate_distances(lat1, lon1, places):
+    """Batch version of calculate_distance: distances (meters) from (lat1, lon1) to every place."""
+    lats, lons = naver_coords_to_arrays(places)
+    return haversine_distances(lat1, lon1, lats, lons)
+
+@metrics.timed("radius_filter")
+def select_radius(lat, lon, places, ladder=DEFAULT_RADIUS_LADDER, min_count=1):
+    """
+    Smallest radius from `ladder` that contains at least `min_count` places.
+    Distances are computed and sorted once; each rung is a binary search.
+    Returns (radius, places_nearest_first). If no rung qualifies, radius is None
+    and every place is returned, still nearest first.
+    Places with valid coordinates are returned as shallow copies with a 'distance_m' field.
+    """
+    if not places:
+        return None, []
+
+    distances = calculate_distances(lat, lon, places)
+    order = np.argsort(distances, kind='stable')
+    sorted_distances = distances[order]
+
+    radius = None
+    count = len(places)
+    for r in sorted(ladder):
+        n = int(np.searchsorted(sorted_distances, r, side='right'))
+        if n >= max(min_count, 1):
+            radius, count = r, n
+            break
+
+    nearby = []
+    for i, d in zip(order[:count], sorted_distances[:count]):
+        place = places[i]
+        if d < INVALID_DISTANCE:
+            # Shallow copy: input places may be shared (cached) between users
+            place = dict(place, distance_m=int(round(float(d))))
+        nearby.append(place)
+    return radius, nearby
+
+def place_key(place):
+    """Dedup key used across the app: (mapx, mapy, title without <b> tags)."""
+    title_clean = place.get('title', '').replace('<b>', '').replace('</b>', '')
+    return (place.get('mapx'), place.get('mapy'), title_clean)
+
+class GridIndex:
+    """
+    Uniform grid (bucket) spatial index over places with Naver coordinates.
+    Cells are ~cell_size_m squares around Seoul's latitude (ref_lat); elsewhere
+    they are narrower or wider east-west, which queries size their scans for.
+    Supports incremental inserts, radius queries and k-nearest queries.
+    """
+
+    METERS_PER_DEG_LAT = 111320.0
+
+    def __init__(self, cell_size_m=250, ref_lat=37.5):
+        self.cell_size_m = cell_size_m
+        self._lat_step = cell_size_m / self.METERS_PER_DEG_LAT
+        self._lon_step = cell_size_m / (self.METERS_PER_DEG_LAT * math.cos(math.radians(ref_lat)))
+        self._cells = defaultdict(list)  # (ix, iy) -> [entry ids]
+        self._lats = []
+        self._lons = []
+        self._places = []
+        self._created_at = []
+        self._ids = {}  # place_key -> entry id
+        self._bounds = None  # (min_ix, min_iy, max_ix, max_iy) of occupied cells
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._places)
+
+    def _cell(self, lat, lon):
+        return (int(math.floor(lon / self._lon_step)), int(math.floor(lat / self._lat_step)))
+
+    def _cell_width_m(self, lat):
+        """East-west size of a cell in meters at latitude lat (cell_size_m only at ref_lat)."""
+        return self._lon_step * self.METERS_PER_DEG_LAT * math.cos(math.radians(min(abs(lat), 89.9)))
+
+    def _min_cell_m(self, lat, reach_m):
+        """Smallest cell side within reach_m of latitude lat (cells narrow toward the pole)."""
+        return min(self.cell_size_m, self._cell_width_m(abs(lat) + reach_m / self.METERS_PER_DEG_LAT))
+
+    def add(self, place, created_at=None):
+        """
+        Insert or refresh one place. Returns False if it has no usable coordinates.
+        A place already in the index (same place_key) is replaced, not duplicated.
+        """
+        lat, lon = katech_to_wgs84(place.get('mapx'), place.get('mapy'))
+        if lat is None:
+            return False
+        created_at = time.time() if created_at is None else created_at
+        key = place_key(place)
+        with self._lock:
+            entry_id = self._ids.get(key)
+            if entry_id is not None:
+                if created_at >= self._created_at[entry_id]:
+                    self._places[entry_id] = place
+                    self._created_at[entry_id] = created_at
+                return True
+            entry_id = len(self._places)
+            self._ids[key] = entry_id
+            self._lats.append(lat)
+            self._lons.append(lon)
+            self._places.append(place)
+            self._created_at.append(created_at)
+            ix, iy = self._cell(lat, lon)
+            self._cells[(ix, iy)].append(entry_id)
+            if self._bounds is None:
+                self._bounds = (ix, iy, ix, iy)
+            else:
+                b = self._bounds
+                self._bounds = (min(b[0], ix), min(b[1], iy), max(b[2], ix), max(b[3], iy))
+        return True
+
+    def add_many(self, places, created_at=None):
+        """Insert a batch of places. Returns how many had usable coordinates."""
+        return sum(1 for place in places if self.add(place, created_at))
+
+    def _candidates(self, lat, lon, cells_x, cells_y):
+        cx, cy = self._cell(lat, lon)
+        ids = []
+        for ix in range(cx - cells_x, cx + cells_x + 1):
+            for iy in range(cy - cells_y, cy + cells_y + 1):
+                bucket = self._cells.get((ix, iy))
+                if bucket:
+                    ids.extend(bucket)
+        return ids
+
+    def _distances(self, lat, lon, ids):
+        lats = np.fromiter((self._lats[i] for i in ids), dtype=float, count=len(ids))
+        lons = np.fromiter((self._lons[i] for i in ids), dtype=float, count=len(ids))
+        return haversine_distances(lat, lon, lats, lons)
+
+    def _fresh(self, entry_id, max_age, now):
+        return max_age is None or now - self._created_at[entry_id] <= max_age
+
+    def query_radius(self, lat, lon, radius_m, max_age=None):
+        """
+        Places within radius_m of (lat, lon), nearest first, as (distance_m, place) pairs.
+        - max_age: ignore entries older than this many seconds
+        """
+        cells_y = int(math.ceil(radius_m / self.cell_size_m))
+        cells_x = int(math.ceil(radius_m / self._min_cell_m(lat, radius_m)))
+        now = time.time()
+        with self._lock:
+            ids = [i for i in self._candidates(lat, lon, cells_x, cells_y) if self._fresh(i, max_age, now)]
+            if not ids:
+                return []
+            dists = self._distances(lat, lon, ids)
+            hits = sorted((float(d), i) for d, i in zip(dists, ids) if d <= radius_m)
+            return [(d, self._places[i]) for d, i in hits]
+
+    def nearest(self, lat, lon, k, max_radius_m=None, max_age=None):
+        """
+        k nearest places as (distance_m, place) pairs, searching outward ring by ring.
+        Stops once the k-th distance is closer than any unvisited cell can be.
+        """
+        if k <= 0:
+            return []
+        now = time.time()
+        with self._lock:
+            if not self._places:
+                return []
+            cx, cy = self._cell(lat, lon)
+            # Enough rings to cover every occupied cell
+            min_ix, min_iy, max_ix, max_iy = self._bounds
+            max_rings = max(abs(min_ix - cx), abs(max_ix - cx), abs(min_iy - cy), abs(max_iy - cy))
+            if max_radius_m is not None:
+                max_rings = min(max_rings, int(math.ceil(max_radius_m / self._min_cell_m(lat, max_radius_m))))
+
+            found = []  # (distance, id)
+            ring = 0
+            while ring <= max_rings:
+                ids = []
+                for ix in range(cx - ring, cx + ring + 1):
+                    for iy in range(cy - ring, cy + ring + 1):
+                        # Only the border of the current ring; inner cells were visited already
+                        if ring and abs(ix - cx) != ring and abs(iy - cy) != ring:
+                            continue
+                        bucket = self._cells.get((ix, iy))
+                        if bucket:
+                            ids.extend(i for i in bucket if self._fresh(i, max_age, now))
+                if ids:
+                    found.extend(zip(self._distances(lat, lon, ids).tolist(), ids))
+                # Any point outside the visited square is at least `ring` whole cells away
+                # (with a small margin for the flat-cell approximation)
+                if len(found) >= k:
+                    found.sort()
+                    if found[k - 1][0] <= ring * self._min_cell_m(lat, ring * self.cell_size_m) * 0.95:
+                        break
+                ring += 1
+
+            found.sort()
+            if max_radius_m is not None:
+                found = [(d, i) for d, i in found if d <= max_radius_m]
+            return [(d, self._places[i]) for d, i in found[:k]]
@@ -0,0 +1,66 @@
+import html
+import re
+
+from backend import metrics
+
+# Above this many markers, draw one clustered layer instead of individual Marker objects
+CLUSTER_THRESHOLD = 30
+DEFAULT_CENTER = [37.4979, 127.0276] # Default Gangnam
+
+# Client-side marker factory for FastMarkerCluster rows: [lat, lng, popup, tooltip]
+_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindPopup(row[2]);
+    marker.bindTooltip(row[3]);
+    return marker;
+};
+"""
+
+
+def _clean_html(raw_html):
+    return re.sub('<.*?>', '', raw_html or '')
+
+
+@metrics.timed("map_render")
+def build_map(places, cluster_threshold=CLUSTER_THRESHOLD, zoom_start=14):
+    """
+    Folium map with one marker per place that has 'lat'/'lng'.
+    Large result sets are sent as a single FastMarkerCluster data layer
+    (markers are created in the browser) instead of N Marker elements.
+    """
+    # Folium pulls in branca/jinja2/pandas (~0.5s); import it when the first map is built, not at app start
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    located = [p for p in places if 'lat' in p and 'lng' in p]
+
+    # Calculate center from matched places if coords exist
+    if located:
+        center = [sum(p['lat'] for p in located) / len(located), sum(p['lng'] for p in located) / len(located)]
+    else:
+        center = DEFAULT_CENTER
+
+    m = folium.Map(location=center, zoom_start=zoom_start)
+
+    if len(located) > cluster_threshold:
+        rows = [
+            [p['lat'], p['lng'], html.escape(_clean_html(p.get('title'))), html.escape(p.get('category') or '')]
+            for p in located
+        ]
+        FastMarkerCluster(rows, callback=_MARKER_CALLBACK).add_to(m)
+    else:
+        for p in located:
+            folium.Marker(
+                [p['lat'], p['lng']],
+                popup=_clean_html(p.get('title')),
+                tooltip=p.get('category')
+            ).add_to(m)
+    return m
+
+
+def render_map_html(places, cluster_threshold=CLUSTER_THRESHOLD):
+    """Standalone HTML document for the map (for static embedding without st_folium)."""
+    m = build_map(places, cluster_threshold)
+    with metrics.span("map_render.html"):
+        return m.get_root().render()
@@ -0,0 +1,192 @@
+"""
+Menu dictionary (Korean dish names) used to pull dishes out of titles and descriptions.
+Seeded from the Category Explosion keywords and Naver category leaves,
+then expanded with "<ingredient><dish type>" combinations (e.g. 김치 + 찌개).
+"""
+from functools import lru_cache
+
+from backend.text_match import LongestMatchTrie
+
+# Category Explosion keywords used by NaverPlaceAPI.search_places
+DETAILED_KEYWORDS = [
+    # Korean
+    '한식', '국밥', '해장국', '삼겹살', '갈비', '곱창', '족발', '보쌈', '김치찌개', '된장찌개', '백반', '냉면', '칼국수',
+    # Chinese
+    '중식', '짜장면', '짬뽕', '탕수육', '마라탕', '양꼬치',
+    # Japanese
+    '일식', '초밥', '스시', '돈까스', '라멘', '우동', '이자카야', '덮밥',
+    # Western
+    '양식', '파스타', '피자', '스테이크', '브런치', '버거', '샐러드',
+    # Asian / Others
+    '아시안', '쌀국수', '타코', '카레',
+    # Snack / Cafe
+    '분식', '떡볶이', '김밥', '치킨', '카페', '디저트', '베이커리'
+]
+
+# Leaf names as they appear in Naver's `category` field ("한식>찌개,전골")
+NAVER_CATEGORY_DISHES = [
+    '찌개', '전골', '국밥', '국수', '곰탕', '설렁탕', '감자탕', '순대', '순댓국', '해장국', '육류', '고기요리',
+    '닭갈비', '닭볶음탕', '찜닭', '오리요리', '양갈비', '곱창', '막창', '돼지고기구이', '소고기구이', '생선구이',
+    '생선회', '해물', '조개', '낙지', '주꾸미', '아귀찜', '해물찜', '게요리', '장어', '추어탕', '삼계탕', '백숙',
+    '두부요리', '기사식당', '한정식', '쌈밥', '보리밥', '비빔밥', '죽', '도시락', '만두', '냉면', '막국수', '칼국수',
+    '수제비', '요리주점', '포장마차', '이자카야', '돈가스', '카레', '라면', '우동', '소바', '덮밥', '일식당',
+    '샤브샤브', '오뎅', '꼬치', '참치회', '복어요리', '중식당', '양꼬치', '딤섬', '마라탕', '훠궈',
+    '이탈리아음식', '스파게티', '파스타', '피자', '햄버거', '스테이크', '립', '패밀리레스토랑', '브런치',
+    '샐러드', '샌드위치', '멕시코', '남미음식', '베트남음식', '태국음식', '인도음식', '쌀국수', '떡볶이',
+    '김밥', '토스트', '핫도그', '치킨', '닭강정', '족발', '보쌈', '베이커리', '케이크', '와플', '빙수',
+]
+
+# Stand-alone dish names
+BASE_DISHES = [
+    '백반', '설렁탕', '곰탕', '갈비탕', '감자탕', '해장국', '순대국', '순댓국', '육개장', '부대찌개', '닭갈비',
+    '닭볶음탕', '닭한마리', '찜닭', '불고기', '제육볶음', '쭈꾸미', '낙지볶음', '아구찜', '해물찜', '갈비찜',
+    '삼계탕', '추어탕', '막국수', '쫄면', '라면', '우거지', '콩국수', '수제비', '육회', '물회', '대게', '킹크랩',
+    '조개구이', '장어', '막창', '대창', '양곱창', '차돌박이', '우삼겹', '항정살', '목살', '가브리살', '갈매기살',
+    '소고기', '한우', '오리고기', '훈제오리', '양고기', '돼지갈비', '소갈비', 'LA갈비', '떡갈비', '족발', '보쌈',
+    '수육', '편육', '순대', '곱창볶음', '닭발', '닭똥집', '오돌뼈', '두루치기', '김치찜', '등갈비', '뼈해장국',
+    '황태해장국', '콩나물국밥', '돼지국밥', '순대국밥', '소머리국밥', '굴국밥', '쌈밥', '보리밥', '한정식',
+    '죽', '전복죽', '호박죽', '도시락', '생선구이', '고등어구이', '갈치조림', '코다리', '꼬막비빔밥', '해물탕',
+    '매운탕', '연포탕', '알탕', '꽃게탕', '간장게장', '양념게장', '낙곱새', '곱도리탕',
+    '짜장면', '짬뽕', '탕수육', '마라탕', '마라샹궈', '훠궈', '양꼬치', '딤섬', '샤오롱바오', '꿔바로우', '깐풍기',
+    '유린기', '양장피', '팔보채', '동파육', '마파두부', '고추잡채', '깐쇼새우', '크림새우', '멘보샤', '짜장밥',
+    '짬뽕밥', '울면', '기스면', '우육면', '도삭면', '마라롱샤', '군만두', '물만두', '교자', '춘권',
+    '초밥', '스시', '사시미', '돈까스', '돈가스', '돈카츠', '라멘', '우동', '소바', '덮밥', '규동', '가츠동',
+    '텐동', '사케동', '부타동', '오야코동', '카이센동', '에비동', '오니기리', '텐푸라', '튀김', '샤브샤브',
+    '스키야키', '나베', '오마카세', '야키토리', '오코노미야키', '타코야끼', '야키소바', '모츠나베', '규카츠',
+    '장어덮밥', '히츠마부시', '연어덮밥', '회덮밥', '알밥', '오뎅', '냉소바', '자루소바', '온소바', '카레',
+    '파스타', '피자', '스테이크', '브런치', '버거', '햄버거', '샐러드', '리조또', '그라탕', '라자냐', '뇨끼',
+    '감바스', '바베큐', '립', '폭립', '핫도그', '샌드위치', '토스트', '와플', '팬케이크', '베이글', '포케',
+    '부리또', '부리토', '퀘사디아', '나초', '타코', '케밥', '함박스테이크', '오므라이스', '하이라이스',
+    '필라프', '빠에야', '스튜', '수프', '클램차우더', '피쉬앤칩스', '슈니첼', '라구', '브루스케타',
+    '쌀국수', '팟타이', '분짜', '반미', '나시고랭', '미고랭', '똠얌꿍', '월남쌈', '탄두리치킨', '난', '커리',
+    '팟카파오', '카오팟', '뿌팟퐁커리', '반쎄오', '락사', '비리야니', '짜조', '분보후에', '쏨땀',
+    '떡볶이', '김밥', '치킨', '순대', '튀김', '어묵', '라볶이', '쫄볶이', '주먹밥', '컵밥', '닭강정', '핫바',
+    '닭꼬치', '붕어빵', '호떡', '계란빵', '만두', '찐빵', '토스트',
+    '베이커리', '케이크', '빙수', '마카롱', '크로플', '도넛', '타르트', '스콘', '크루아상', '젤라또',
+]
+
+# "<prefix><suffix>" families, e.g. 김치 + 찌개 -> 김치찌개
+DISH_FAMILIES = {
+    '찌개': ['김치', '된장', '순두부', '부대', '동태', '고추장', '청국장', '참치김치', '돼지김치', '차돌된장',
+            '우렁된장', '두부', '알', '꽁치김치', '생태', '짜글이', '스팸김치', '애호박', '비지', '버섯'],
+    '탕': ['갈비', '감자', '곰', '설렁', '매운', '해물', '알', '추어', '삼계', '도가니', '꼬리곰', '내장', '대구',
+          '우럭', '연포', '닭볶음', '마라', '꽃게', '뼈다귀', '갈낙', '낙지', '조개', '오리', '흑염소', '전복'],
+    '국': ['순대', '선지해장', '황태', '소고기무', '미역', '북엇', '콩나물', '시래기', '우거지', '굴', '떡만둣',
+          '된장'],
+    '국밥': ['돼지', '순대', '소머리', '콩나물', '따로', '선지', '굴', '내장', '수육', '뼈다귀', '소고기', '육개장',
+            '우거지', '시래기', '한우', '순두부'],
+    '해장국': ['뼈', '황태', '선지', '우거지', '콩나물', '올갱이', '양평', '내장', '북어'],
+    '전골': ['곱창', '만두', '버섯', '불고기', '소고기', '부대', '낙지', '두부', '해물', '대창', '돼지', '밀푀유'],
+    '구이': ['소금', '양념갈비', '장어', '생선', '고등어', '갈치', '삼치', '조개', '막창', '곱창', '대창', '차돌',
+            '항정살', '목살', '오리', '양갈비', '새우', '가리비', '꽁치', '연어', '소고기', '돼지고기', '한우',
+            '양', '전어', '황태', '더덕', '꼼장어', '닭', '불고기', '등심', '삼겹살', '오겹살', '우삼겹'],
+    '볶음': ['제육', '오징어', '낙지', '쭈꾸미', '주꾸미', '곱창', '김치', '멸치', '어묵', '떡', '닭', '오삼',
+            '돼지', '소고기', '조개', '두부김치', '순대', '막창', '닭똥집', '고추잡채', '마늘'],
+    '조림': ['갈치', '고등어', '코다리', '두부', '장조림', '감자', '은대구', '메로', '꽁치', '병어'],
+    '찜': ['갈비', '아구', '해물', '계란', '닭', '김치', '꽃게', '대게', '등갈비', '매운갈비', '코다리', '소갈비',
+          '돼지갈비', '미더덕', '묵은지', '뼈', '사태', '대하'],
+    '덮밥': ['회', '제육', '오징어', '참치마요', '가츠', '규', '부타', '사케', '연어', '장어', '텐', '카레',
+            '마파두부', '스테이크', '치킨마요', '김치', '불고기', '낙지', '오야코', '에비', '우나기', '카이센',
+            '쭈꾸미', '잡채', '짜장', '새우튀김', '차슈', '명란', '아보카도', '스팸마요', '돈까스', '목살'],
+    '까스': ['돈', '치즈돈', '생선', '치킨', '등심돈', '안심돈', '고구마치즈돈', '왕돈', '함박', '새우', '경양식돈',
+            '수제돈', '매운돈', '모둠'],
+    '가스': ['돈', '치즈돈', '생선', '치킨', '등심돈', '안심돈', '왕돈', '경양식돈', '수제돈'],
+    '카츠': ['돈', '규', '멘치', '히레', '로스', '치즈', '에비', '치킨', '토리', '사케', '모둠'],
+    '라멘': ['돈코츠', '쇼유', '미소', '시오', '탄탄', '츠케', '마제', '지로', '토리파이탄', '매운', '이에케',
+            '돈코츠쇼유', '카라', '니보시', '차슈', '교카이', '토마토', '블랙', '해산물', '닭'],
+    '우동': ['유부', '튀김', '카레', '가케', '냉', '붓카케', '니쿠', '볶음', '키츠네', '냄비', '새우튀김', '어묵',
+            '자루', '명란크림', '텐푸라', '고기', '가마타마', '사누키'],
+    '소바': ['냉', '자루', '온', '메밀', '마제', '야키', '니싱', '텐', '오로시', '판'],
+    '초밥': ['모듬', '연어', '광어', '참치', '장어', '새우', '유부', '생', '특선', '회전', '활어', '계란',
+            '소고기', '한우', '고등어', '우니', '도미', '가리비', '문어', '단새우', '김', '마끼'],
+    '스시': ['오마카세', '모듬', '연어', '참치', '특선', '회전', '에도마에', '테마키'],
+    '파스타': ['크림', '토마토', '로제', '알리오올리오', '봉골레', '까르보나라', '라구', '빠네', '명란', '새우',
+              '버섯', '오일', '해산물', '트러플', '바질', '페스토', '먹물', '게살', '뽀모도로', '아라비아따',
+              '감바스', '베이컨', '시금치', '연어', '우니', '성게', '랍스터', '볼로네제', '쉬림프', '투움바'],
+    '스파게티': ['미트', '토마토', '크림', '해물', '까르보나라', '봉골레', '오일', '미트볼', '나폴리탄'],
+    '리조또': ['크림', '토마토', '버섯', '해산물', '트러플', '먹물', '새우', '로제', '치즈', '게살', '밀라노'],
+    '피자': ['페퍼로니', '치즈', '고르곤졸라', '불고기', '포테이토', '마르게리타', '콤비네이션', '하와이안',
+            '쉬림프', '화덕', '시카고', '뉴욕', '수제', '마르게리따', '디아볼라', '콰트로치즈', '베이컨',
+            '고구마', '슈퍼슈프림', '트러플', '나폴리', '바질', '조각', '딥디쉬'],
+    '버거': ['치즈', '수제', '불고기', '새우', '치킨', '베이컨', '더블', '스매시', '와퍼', '머쉬룸', '아보카도',
+            '데리야끼', '빅', '패티', '치킨패티', '쉬림프', '한우', '클래식', '트러플', '칠리', '스테이크'],
+    '스테이크': ['안심', '등심', '채끝', '티본', '토마호크', '부채살', '살치살', '찹', '연어', '찹스', '수제',
+               '햄버그', '함박', '한우', '와규', '립아이', '뉴욕', '부채', '숯불', '치킨', '포크'],
+    '샐러드': ['연어', '닭가슴살', '리코타', '시저', '콥', '그릭', '리코타치즈', '과일', '단호박', '감자', '코울슬로',
+             '케이준', '부라타', '카프레제', '참치', '훈제오리', '리코타', '쉬림프', '스테이크', '두부', '퀴노아',
+             '치킨', '연어포케'],
+    '포케': ['연어', '참치', '닭가슴살', '새우', '두부', '스테이크', '하와이안'],
+    '국수': ['잔치', '비빔', '멸치', '열무', '콩', '김치말이', '고기', '물', '쌀', '칼', '잔치', '장터', '메밀',
+            '들깨', '닭', '해물', '어묵', '콩나물', '짬뽕', '막', '고등어', '제주고기', '손'],
+    '칼국수': ['바지락', '해물', '닭', '팥', '들깨', '버섯', '장', '얼큰', '김치', '낙지', '샤브', '칼제비',
+             '매생이', '손', '사골', '멸치', '감자', '굴', '옹심이'],
+    '냉면': ['물', '비빔', '회', '평양', '함흥', '밀', '열무', '칡', '진주', '고기', '코다리', '명태', '동치미',
+            '메밀', '초계', '냉', '육쌈', '갈비'],
+    '만두': ['김치', '고기', '군', '물', '찐', '왕', '새우', '갈비', '손', '떡', '납작', '편수', '교자', '해물',
+            '고추', '부추', '수제', '튀김', '굴림'],
+    '떡볶이': ['치즈', '로제', '짜장', '국물', '기름', '즉석', '궁중', '라', '매운', '크림', '마라', '가래',
+             '쌀', '밀', '옛날', '엽기', '카레', '해물', '차돌', '곱창', '짜파'],
+    '김밥': ['참치', '치즈', '돈까스', '소고기', '야채', '멸치', '계란', '충무', '꼬마', '마약', '김치', '불고기',
+            '땡초', '유부', '스팸', '제육', '우엉', '샐러드', '키토', '묵은지', '새우', '오징어', '연어', '크래미',
+            '고추', '진미채', '명란'],
+    '전': ['해물파', '김치', '감자', '부추', '녹두', '육', '굴', '동태', '호박', '고추', '깻잎', '동그랑땡',
+          '새우', '버섯', '표고', '메밀', '배추', '꼬치', '파', '빈대떡', '모둠'],
+    '비빔밥': ['돌솥', '산채', '육회', '꼬막', '멍게', '열무', '참치', '전주', '새싹', '낙지', '알', '연어',
+             '불고기', '소고기', '나물', '보리', '회', '콩나물', '성게', '꼬들'],
+    '볶음밥': ['김치', '새우', '게살', '낙지', '카레', '차돌', '스팸', '파인애플', '짜장', '계란', '소고기',
+             '해물', '양념', '베이컨', '마늘', '치킨', '불고기', '곱창', '날치알'],
+    '짜장': ['간', '쟁반', '삼선', '유니', '사천', '옛날', '백', '유슬', '해물', '고추', '송이'],
+    '짬뽕': ['삼선', '고추', '굴', '백', '차돌', '불', '해물', '고기', '나가사키', '사천', '볶음',
+            '매운', '전복', '꽃게'],
+    '탕수육': ['찹쌀', '꿔바', '등심', '소고기', '돼지고기', '새우', '옛날', '경양식', '유린', '깐풍', '미니'],
+    '치킨': ['후라이드', '양념', '간장', '마늘', '반반', '순살', '파닭', '숯불', '오븐', '전기구이', '허니', '치즈',
+            '매운', '갈릭', '크리스피', '커리', '바베큐', '고추', '마라', '레드', '옛날'],
+    '쌀국수': ['소고기', '양지', '차돌', '해물', '닭', '매운', '베트남', '비빔', '분', '분보', '퍼보', '똠얌'],
+    '카레': ['일본식', '인도', '치킨', '버터치킨', '돈까스', '새우', '키마', '야채', '비프', '수프', '코코이찌방',
+            '에그', '함박', '규', '가츠', '시금치', '스파이시', '치즈', '마살라', '카츠'],
+    '커리': ['그린', '레드', '옐로우', '버터치킨', '마살라', '치킨', '시금치', '팔락', '마크니', '비프', '키마',
+            '새우', '빈달루', '스리랑카', '태국', '푸팟퐁'],
+    '삼겹살': ['대패', '벌집', '통', '숙성', '생', '오겹', '흑돼지', '미나리', '솥뚜껑', '냉동', '와인',
+             '허브', '된장', '고추장', '목', '항정'],
+    '갈비': ['돼지', '소', '양념', '생', '왕', '숯불', 'LA', '떡', '수원', '이동', '포천', '돼지생', '닭', '양',
+            '쪽', '찜', '뼈', '등', '한우'],
+    '곱창': ['소', '돼지', '한우', '양', '야채', '알', '순대', '막', '황소', '고추장', '소금'],
+    '족발': ['냉채', '불', '마늘', '매운', '오향', '앞다리', '미니', '반반', '수제'],
+    '보쌈': ['굴', '마늘', '김치', '반반'],
+    '순대': ['모듬', '찹쌀', '피', '아바이', '백암', '병천', '오징어', '야채', '토종', '막'],
+    '닭갈비': ['춘천', '숯불', '철판', '치즈', '뼈없는', '소금', '간장', '매운', '우동'],
+    '샤브샤브': ['소고기', '해물', '월남쌈', '버섯', '편백찜', '훠궈', '스키야키', '한우', '샐러드바'],
+    '튀김': ['새우', '오징어', '야채', '고구마', '김말이', '모둠', '고추', '만두', '텐', '돈'],
+    '샌드위치': ['햄치즈', '클럽', '에그', '치킨', '참치', '불고기', '베이컨', '잠봉뵈르', '루벤', '파니니',
+               '쉬림프', '아보카도', '과일', '연어'],
+    '토스트': ['프렌치', '햄치즈', '계란', '길거리', '에그', '베이컨', '불고기', '크림치즈', '허니버터'],
+    '케이크': ['치즈', '생크림', '초코', '딸기', '당근', '레터링', '티라미수', '녹차', '레드벨벳', '롤', '바스크치즈',
+             '망고', '무화과', '밤'],
+    '빙수': ['팥', '망고', '딸기', '인절미', '녹차', '초코', '멜론', '흑임자', '눈꽃', '과일', '우유'],
+}
+
+
+# Lunch-set variants ("제육볶음정식", "돈까스세트") of the rice/soup families above
+MEAL_SUFFIXES = ['정식', '세트', '백반']
+MEAL_FAMILIES = ['찌개', '탕', '국밥', '해장국', '구이', '볶음', '조림', '찜', '덮밥', '까스', '가스', '카츠',
+                 '라멘', '우동', '소바', '초밥', '전골', '비빔밥', '카레']
+
+
+def build_menu_lexicon(extra_terms=()):
+    """Return the full set of dish names (2+ characters)."""
+    terms = set(DETAILED_KEYWORDS) | set(NAVER_CATEGORY_DISHES) | set(BASE_DISHES)
+    for suffix, prefixes in DISH_FAMILIES.items():
+        terms.add(suffix)
+        for prefix in prefixes:
+            dish = prefix + suffix
+            terms.add(dish)
+            if suffix in MEAL_FAMILIES:
+                terms.update(dish + meal for meal in MEAL_SUFFIXES)
+    terms.update(extra_terms)
+    return {t for t in terms if len(t) > 1}
+
+
+@lru_cache(maxsize=1)
+def get_menu_trie():
+    """Longest-match trie over the default menu lexicon (compiled once per process)."""
+    return LongestMatchTrie(build_menu_lexicon())
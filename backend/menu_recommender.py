@@ -1,6 +1,18 @@
 from collections import Counter
+import copy
+import random
 import re
 
+from backend import metrics
+from backend.menu_lexicon import get_menu_trie
+from backend.sampling import AliasSampler
+from backend.text_match import compile_matcher
+
+# Size of the candidate pool the chips / random pick are drawn from
+CANDIDATE_POOL_SIZE = 50
+# Weight multiplier for keywords matching a favorite
+FAVORITE_BOOST = 3
+
 class MenuRecommender:
     def __init__(self):
         # Common generic terms to ignore
@@ -8,7 +20,51 @@ class MenuRecommender:
             "음식점", "식당", "맛집", "한식", "양식", "중식", "일식", "분식", 
             "전문점", "요리", "집", "카페", "디저트", "입구", "거리", "역"
         }
+        # Inverted index built during extract_top_menus: {menu keyword: [place ids]}
+        # Place ids are positions in the `places` list passed to extract_top_menus.
+        self.menu_index = {}
+        # Weighted sampler over the candidate pool, rebuilt once per fetch
+        self.sampler = AliasSampler([], [])
+        # Raw keyword frequencies and the preference-adjusted weights derived from them
+        self.raw_counter = Counter()
+        self.counter = Counter()
+        self.dislikes = frozenset()
+        self.favorites = frozenset()
+
+    @staticmethod
+    def _place_text_fields(place):
+        return (place.get('category', ''), place.get('title', ''), place.get('description', ''))
+
+    def build_menu_index(self, places, keywords):
+        """
+        Map each menu keyword to the ids of the places whose category, title
+        or description contains it. Runs once per fetch so chip clicks don't
+        have to rescan every place.
+        """
+        index = {kw: [] for kw in keywords}
+        matcher = compile_matcher(index)
+        for place_id, place in enumerate(places):
+            # One automaton pass per place; the separator keeps matches inside a field
+            text = "\n".join(self._place_text_fields(place))
+            for kw in matcher.find_all(text):
+                index[kw].append(place_id)
+        return index
+
+    @staticmethod
+    def lookup_places(menu, places, menu_index=None):
+        """
+        Return the places matching a menu keyword.
+        Uses the inverted index when the keyword is in it (O(matches)),
+        otherwise falls back to a substring scan.
+        """
+        if menu_index and menu in menu_index:
+            return [places[i] for i in menu_index[menu]]
+        return [
+            p for p in places
+            if menu in p.get('category', '') or menu in p.get('title', '') or menu in p.get('description', '')
+        ]
 
+    @metrics.timed("menu_extraction")
     def extract_top_menus(self, places, top_n=15, dislikes=None, favorites=None):
         """
         Extract popular menu keywords from a list of places.
@@ -16,56 +72,160 @@ class MenuRecommender:
         - favorites: list of keywords to boost/prioritize
         """
         target_places = places
+        self.raw_counter = Counter()
+        self.counter = Counter()
+        self.menu_index = {}
+        self.sampler = AliasSampler([], [])
+        self.dislikes = frozenset(dislikes or ())
+        self.favorites = frozenset(favorites or ())
         
         if not target_places:
             return []
-            
-        dislikes = set(dislikes) if dislikes else set()
-        favorites = set(favorites) if favorites else set()
 
+        menu_trie = get_menu_trie()
         keywords = []
+        # Category strings repeat a lot across places, parse each distinct one once
+        parsed_categories = {}
         
         for place in target_places:
             # 1. Extract from Category
             category = place.get('category', '')
             if category:
-                parts = re.split(r'[>,]', category)
-                for part in parts:
-                    clean_part = part.strip()
-                    
-                    # Filtering: Check if contained in dislikes
-                    if any(bad in clean_part for bad in dislikes):
-                        continue
-                        
-                    if len(clean_part) > 1 and clean_part not in self.stop_words:
-                        keywords.append(clean_part)
-            
-            # 2. Extract from Title (sometimes)
-            # e.g., "시골김치찌개" -> "김치찌개" extraction is hard without heavy NLP.
-            # But sometimes title IS the menu name e.g. "마포만두".
-            # For now, let's rely mostly on category and description keywords if available.
-            
-            # 3. Description checks?
-            # If description contains known menu names, add them?
-            # Simple heuristic: if description has "돈까스", add it.
-            # This requires a predefined menu dictionary which we don't have yet.
-            # So we stick to Category data which Naver usually provides well.
-
-        # Count frequencies
-        counter = Counter(keywords)
+                parts = parsed_categories.get(category)
+                if parts is None:
+                    parts = []
+                    for part in re.split(r'[>,]', category):
+                        clean_part = part.strip()
+                        if len(clean_part) > 1 and clean_part not in self.stop_words:
+                            parts.append(clean_part)
+                    parsed_categories[category] = parts
+                keywords.extend(parts)
+            else:
+                parts = []
+
+            # 2. Extract from Title & 3. Description
+            # Longest-match lookup in the menu dictionary: "시골김치찌개" -> "김치찌개".
+            # Counted once per place, and not again if the category already had it.
+            title = place.get('title', '').replace('<b>', '').replace('</b>', '')
+            dishes = dict.fromkeys(menu_trie.extract(title))
+            dishes.update(dict.fromkeys(menu_trie.extract(place.get('description', ''))))
+            for dish in dishes:
+                if dish not in parts and dish not in self.stop_words:
+                    keywords.append(dish)
+
+        # Count frequencies (raw, before preferences, so they can be re-applied as a delta)
+        self.raw_counter = Counter(keywords)
+
+        # Inverted index for instant restaurant matching (chip click / random pick)
+        self.menu_index = self.build_menu_index(target_places, self.raw_counter)
+
+        # Filtering + Boosting
+        self.counter = self._apply_preferences(self.raw_counter)
+        self._rebuild_sampler()
         
-        # Boosting: Multiply count for favorites
-        for key in counter:
-            if any(fav in key for fav in favorites):
-                counter[key] *= 3 # Boost weight
+        # Sample 15 (weighted, without replacement)
+        return self.sample_menus(top_n)
+
+    def _apply_preferences(self, keys):
+        """
+        Preference-adjusted weights for the given keys.
+        Preferences are compiled into (cached) Aho-Corasick automata:
+        one linear pass per key instead of one scan per preference term.
+        """
+        dislike_matcher = compile_matcher(self.dislikes)
+        favorite_matcher = compile_matcher(self.favorites)
+
+        weights = Counter()
+        for key in keys:
+            # Filtering: Check if contained in dislikes
+            if dislike_matcher.contains_any(key):
+                continue
+            count = self.raw_counter[key]
+            # Boosting: Multiply count for favorites
+            if favorite_matcher.contains_any(key):
+                count *= FAVORITE_BOOST
+            weights[key] = count
+        return weights
 
+    def _rebuild_sampler(self):
         # PIVOT: Random variety
-        # Get top 50 candidates
-        candidates = [item for item, count in counter.most_common(50)]
-        
-        # Sample random 15
-        import random
-        if len(candidates) > top_n:
-            return random.sample(candidates, top_n)
-        else:
-            return candidates
+        # Get top 50 candidates, keep their (boosted) frequencies as weights
+        candidates = self.counter.most_common(CANDIDATE_POOL_SIZE)
+        self.sampler = AliasSampler(
+            [item for item, count in candidates],
+            [count for item, count in candidates]
+        )
+
+    def update_preferences(self, dislikes=None, favorites=None, top_n=15, exclude=None):
+        """
+        Re-rank after a preference change without re-extracting keywords.
+        Only keys matching an added/removed dislike or favorite are re-weighted,
+        then the candidate pool is resampled.
+        """
+        dislikes = frozenset(dislikes or ())
+        favorites = frozenset(favorites or ())
+        changed_terms = (self.dislikes ^ dislikes) | (self.favorites ^ favorites)
+        self.dislikes = dislikes
+        self.favorites = favorites
+
+        if changed_terms:
+            change_matcher = compile_matcher(changed_terms)
+            affected = [key for key in self.raw_counter if change_matcher.contains_any(key)]
+            updated = self._apply_preferences(affected)
+            for key in affected:
+                if key in updated:
+                    self.counter[key] = updated[key]
+                else:
+                    self.counter.pop(key, None)
+            self._rebuild_sampler()
+
+        return self.sample_menus(top_n, exclude=exclude)
+
+    def with_preferences(self, dislikes=None, favorites=None):
+        """
+        Per-user view of an (app-wide, cached) recommender.
+        Shares raw_counter and menu_index with self, but gets its own
+        preference-adjusted weights and sampler, so self is never modified.
+        """
+        view = copy.copy(self)
+        view.counter = Counter(self.counter)
+        view.update_preferences(dislikes, favorites, top_n=0)
+        return view
+
+    def to_dict(self):
+        """JSON-serializable extraction result (raw counts + inverted index), without preferences."""
+        return {"counts": dict(self.raw_counter), "menu_index": self.menu_index}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a recommender from to_dict() output (e.g. a JSON service response)."""
+        recommender = cls()
+        recommender.raw_counter = Counter(data.get("counts") or {})
+        recommender.menu_index = {menu: list(ids) for menu, ids in (data.get("menu_index") or {}).items()}
+        recommender.counter = recommender._apply_preferences(recommender.raw_counter)
+        recommender._rebuild_sampler()
+        return recommender
+
+    def sample_menus(self, top_n=15, exclude=None):
+        """Weighted sample of distinct menus from the current candidate pool."""
+        return self.sampler.sample(top_n, exclude=exclude)
+
+    def pick_random(self, exclude=None, among=None):
+        """
+        Weighted random menu, honoring the favorite boost.
+        - exclude: recently shown menus to skip (falls back to them if nothing else is left)
+        - among: the chips on screen; the pick is one of them (O(len(among))).
+          Without it the pick comes from the whole candidate pool in O(1).
+        """
+        if among is not None:
+            shown = [menu for menu in among if self.counter.get(menu, 0) > 0]
+            if not shown:
+                return None
+            excluded = set(exclude or ())
+            candidates = [menu for menu in shown if menu not in excluded] or shown
+            return random.choices(candidates, weights=[self.counter[menu] for menu in candidates])[0]
+
+        menu = self.sampler.draw(exclude=exclude)
+        if menu is None and exclude:
+            menu = self.sampler.draw()
+        return menu
@@ -0,0 +1,217 @@
+"""
+Lightweight spans / counters for the pipeline, exportable as Prometheus text.
+
+    with metrics.span("process_places"):
+        ...
+    metrics.incr("cache_requests", layer="search", result="hit")
+
+Disabled unless LUNCH_METRICS=1 (or metrics.enable()): span() then returns a shared
+no-op context manager and incr() returns immediately, so instrumentation costs a
+function call. Data is per process (each service worker exports its own).
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+# Histogram buckets in seconds (API calls ~50-300ms, in-process stages ~1-100ms)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RECENT_SPANS = 200
+PREFIX = "lunch_"
+
+_ENABLED = os.getenv("LUNCH_METRICS", "").lower() in ("1", "true", "yes")
+_LOCK = threading.Lock()
+_COUNTERS = {}    # (name, labels) -> value
+_HISTOGRAMS = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+_RECENT = deque(maxlen=RECENT_SPANS)
+
+
+def enabled():
+    return _ENABLED
+
+
+def enable(on=True):
+    global _ENABLED
+    _ENABLED = bool(on)
+
+
+def reset():
+    with _LOCK:
+        _COUNTERS.clear()
+        _HISTOGRAMS.clear()
+        _RECENT.clear()
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
+
+
+def incr(name, value=1, **labels):
+    """Add value to a counter (no-op when disabled)."""
+    if not _ENABLED:
+        return
+    key = _key(name, labels)
+    with _LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + value
+
+
+def observe(name, seconds, **labels):
+    """Record one duration into the histogram for name/labels."""
+    if not _ENABLED:
+        return
+    key = _key(name, labels)
+    with _LOCK:
+        hist = _HISTOGRAMS.get(key)
+        if hist is None:
+            hist = _HISTOGRAMS[key] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+                break
+        else:
+            hist[len(BUCKETS)] += 1
+        hist[-1] += seconds
+
+
+class _Span:
+    __slots__ = ("name", "labels", "ignore", "start")
+
+    def __init__(self, name, labels, ignore=()):
+        self.name = name
+        self.labels = labels
+        self.ignore = ignore
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        observe("stage_seconds", seconds, stage=self.name, **self.labels)
+        _RECENT.append(dict(self.labels, stage=self.name, ms=round(seconds * 1000, 2), at=time.time()))
+        if exc_type is not None and not issubclass(exc_type, self.ignore):
+            incr("errors", stage=self.name)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name, ignore=(), **labels):
+    """
+    Time a block as stage `name`; exceptions also count as errors{stage=name},
+    except those of the `ignore` types (control flow such as Streamlit's reruns).
+    """
+    if not _ENABLED:
+        return _NOOP
+    return _Span(name, labels, ignore)
+
+
+def timed(name):
+    """Decorator form of span() for functions with several return points."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+            with _Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def recent_spans(limit=50):
+    """Most recent spans, newest first (for the in-app debug panel)."""
+    with _LOCK:
+        spans = list(_RECENT)[-limit:]
+    return spans[::-1]
+
+
+def counters():
+    """{(name, labels): value} copy of all counters."""
+    with _LOCK:
+        return dict(_COUNTERS)
+
+
+def stage_summary():
+    """[{"stage", "count", "total_ms", "avg_ms"}] per stage, slowest total first."""
+    with _LOCK:
+        items = list(_HISTOGRAMS.items())
+    totals = {}
+    for (name, labels), hist in items:
+        if name != "stage_seconds":
+            continue
+        stage = dict(labels).get("stage")
+        count, total = totals.get(stage, (0, 0.0))
+        totals[stage] = (count + sum(hist[:-1]), total + hist[-1])
+    rows = [
+        {"stage": stage, "count": count, "total_ms": round(total * 1000, 1),
+         "avg_ms": round(total * 1000 / count, 2) if count else 0.0}
+        for stage, (count, total) in totals.items()
+    ]
+    return sorted(rows, key=lambda r: -r["total_ms"])
+
+
+def hit_ratios():
+    """{layer: hit ratio} from cache_requests{layer, result} counters."""
+    hits, totals = {}, {}
+    for (name, labels), value in counters().items():
+        if name != "cache_requests":
+            continue
+        labels = dict(labels)
+        layer = labels.get("layer")
+        totals[layer] = totals.get(layer, 0) + value
+        if labels.get("result") == "hit":
+            hits[layer] = hits.get(layer, 0) + value
+    return {layer: hits.get(layer, 0) / total for layer, total in totals.items() if total}
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def export_prometheus():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    with _LOCK:
+        counter_items = sorted(_COUNTERS.items())
+        hist_items = sorted((key, list(hist)) for key, hist in _HISTOGRAMS.items())
+
+    lines = []
+    seen = set()
+    for (name, labels), value in counter_items:
+        metric = f"{PREFIX}{name}_total"
+        if metric not in seen:
+            seen.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+    for (name, labels), hist in hist_items:
+        metric = f"{PREFIX}{name}"
+        if metric not in seen:
+            seen.add(metric)
+            lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, count in zip(BUCKETS, hist):
+            cumulative += count
+            lines.append(f"{metric}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+        cumulative += hist[len(BUCKETS)]
+        lines.append(f"{metric}_bucket{_format_labels(labels, [('le', '+Inf')])} {cumulative}")
+        lines.append(f"{metric}_sum{_format_labels(labels)} {hist[-1]:.6f}")
+        lines.append(f"{metric}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
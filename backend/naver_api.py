@@ -12,16 +12,91 @@ from urllib.parse import quote
 API_CACHE = {}
 CACHE_DURATION = 3600  # 1 hour
 
+import threading
+
+from backend import metrics
 from backend.db_manager import DatabaseManager
+from backend.geo_utils import GridIndex, place_key
+from backend.menu_lexicon import DETAILED_KEYWORDS
+from backend.query import canonical_query, parse_query
+from backend.rate_limiter import get_shared_limiter
+from backend.text_match import compile_matcher
+
+# Spatial cache lookup (search_places with coords): reuse cached places from
+# other queries when enough fresh ones lie within the radius
+SPATIAL_REUSE_RADIUS_M = 1000
+SPATIAL_MIN_PLACES = 30
+SPATIAL_MAX_AGE = 86400  # same as the DB cache expiry
+
+# Spatial index over every cached place, shared by all NaverPlaceAPI instances.
+# One per search mode: a hidden-gem ("random") search never reuses popular results.
+# Format: { db_path: { search_mode: GridIndex } }
+SPATIAL_INDEXES = {}
+_SPATIAL_INDEX_LOCK = threading.Lock()
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution: the first caller runs it, the rest wait."""
+
+    def __init__(self):
+        self._calls = {}  # key -> Future
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """(result, shared): shared is True when another caller's execution was joined."""
+        import concurrent.futures
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = concurrent.futures.Future()
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return result, False
+
+
+# Live fetches in progress, keyed by (db_path, cache key): one explosion per canonical query
+SEARCH_FLIGHTS = SingleFlight()
+
+# Local Search endpoint; NAVER_API_BASE_URL points everything at a stub (backend/stub_server.py)
+NAVER_LOCAL_SEARCH_URL = "https://openapi.naver.com/v1/search/local.json"
+
+# Pagination (_fetch_items_with_pagination)
+PAGE_SIZE = 5               # display limit of the Local Search API
+PAGE_MAX_START = 1000       # largest 'start' the API accepts
+PAGE_MAX_CONCURRENCY = 4    # pages fetched ahead at most (only with a rate limiter)
+PAGE_POLITE_DELAY = 0.05    # pause after each page when no rate limiter is configured
+
+# Per-request usage log (CSV). NAVER_USAGE_LOG overrides the path; set it empty to disable.
+DEFAULT_USAGE_LOG = "api_usage.csv"
+_USAGE_LOG_FROM_ENV = object()
 
 class NaverPlaceAPI:
-    def __init__(self, client_id, client_secret):
+    def __init__(self, client_id, client_secret, base_url=None, db=None, rate_limiter=None,
+                 usage_log=_USAGE_LOG_FROM_ENV):
         self.client_id = client_id
         self.client_secret = client_secret
-        self.base_url = "https://openapi.naver.com/v1/search/local.json"
+        self.base_url = base_url or os.getenv("NAVER_API_BASE_URL") or NAVER_LOCAL_SEARCH_URL
+        # Token bucket shared by all API calls (None = unthrottled unless NAVER_API_RATE is set)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_shared_limiter()
+        # Usage CSV path, None = don't log (tests, benchmarks, load tests)
+        if usage_log is _USAGE_LOG_FROM_ENV:
+            usage_log = os.getenv("NAVER_USAGE_LOG", DEFAULT_USAGE_LOG) or None
+        self.usage_log = usage_log
         
         # Database Manager
-        self.db = DatabaseManager()
+        self.db = db if db is not None else DatabaseManager()
         
         # Legacy Migration
         legacy_cache = "restaurant_cache.json"
@@ -31,11 +106,12 @@ class NaverPlaceAPI:
              print(f"Migration result: {msg}")
 
         # Setup logging (kept for general class logging, though _log_request now writes directly)
-        logging.basicConfig(
-            filename='api_usage.csv', 
-            level=logging.INFO, 
-            format='%(asctime)s,%(message)s'
-        )
+        if self.usage_log:
+            logging.basicConfig(
+                filename=self.usage_log,
+                level=logging.INFO, 
+                format='%(asctime)s,%(message)s'
+            )
         self.logger = logging.getLogger('NaverAPI')
 
     # File cache methods removed in favor of DB
@@ -52,192 +128,438 @@ class NaverPlaceAPI:
             "X-Naver-Client-Secret": self.client_secret
         }
 
+    def _throttle(self):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
     def _log_request(self, endpoint, params, status):
         # This now writes directly to the CSV, bypassing the standard logging setup for this specific log.
-        with open("api_usage.csv", "a", encoding='utf-8') as f:
+        if not self.usage_log:
+            return
+        with open(self.usage_log, "a", encoding='utf-8') as f:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             # Convert params dict to a string for logging
             params_str = '&'.join(f"{k}={v}" for k, v in params.items())
             f.write(f"{timestamp},{endpoint},{params_str},{status}\n")
 
+    @staticmethod
+    def _mode_key_patterns(search_mode):
+        # Search cache keys end in "_{mode}_v3"; page keys carry the sort ("comment" = popular)
+        sort = "random" if search_mode == 'random' else "comment"
+        return (f"%_{search_mode}_v3", f"page:%:{sort}:%")
+
+    def get_spatial_index(self, search_mode='popular'):
+        """
+        Grid index over the places cached in the DB for one search mode. Built once
+        per process (per DB file) and kept up to date as search_places ingests new items.
+        """
+        with _SPATIAL_INDEX_LOCK:
+            indexes = SPATIAL_INDEXES.setdefault(self.db.db_path, {})
+            index = indexes.get(search_mode)
+            if index is None:
+                index = GridIndex()
+                for pattern in self._mode_key_patterns(search_mode):
+                    for items, created_at in self.db.iter_cached_items(key_pattern=pattern):
+                        index.add_many(items, created_at)
+                indexes[search_mode] = index
+        return index
+
+    def _index_items(self, items, created_at, search_mode='popular'):
+        # Only update an index that already exists; otherwise it's built from the DB on first use
+        index = SPATIAL_INDEXES.get(self.db.db_path, {}).get(search_mode)
+        if index is not None:
+            index.add_many(items, created_at)
+
+    def search_nearby_cached(self, lat, lng, radius_m=1000, k=None, max_age=None, search_mode='popular'):
+        """
+        Places near a WGS84 point, answered from the local store only (no API call).
+        Only places cached by searches in search_mode are considered.
+        - k: return only the k nearest (within radius_m)
+        - max_age: ignore places cached more than this many seconds ago
+        Returns {"items": [...]} nearest first, like search_places.
+        """
+        index = self.get_spatial_index(search_mode)
+        if k is not None:
+            hits = index.nearest(lat, lng, k, max_radius_m=radius_m, max_age=max_age)
+        else:
+            hits = index.query_radius(lat, lng, radius_m, max_age=max_age)
+        return {"items": [place for dist, place in hits]}
+
     # _get_cache_key is no longer needed as the file cache uses the query directly as a key.
     # def _get_cache_key(self, endpoint, params):
     #     # Create a stable string representation of params for the key
     #     # params_str = str(sorted(params.items()))
     #     # return f"{endpoint}:{params_str}"
-    def _fetch_items_with_pagination(self, query, max_items=30):
+    @staticmethod
+    def _page_cache_key(query, sort, start):
+        # Keyed by the text actually sent: pages of "을지로 밥집" and "을지로 맛집" differ
+        return f"page:{' '.join(query.split())}:{sort}:{start}:{PAGE_SIZE}"
+
+    def _fetch_page(self, query, start, sort, force_refresh=False, cancelled=None):
         """
-        Fetch items using pagination because Naver Local API limits display=5.
-        Loops until max_items is reached or no more items.
+        One result page (start, PAGE_SIZE), from the page cache or the API.
+        Returns the items, or None on an error / when cancelled before the call went out.
+        Successful pages (empty ones included) are cached individually.
         """
-        all_items = []
-        start = 1
-        display_per_req = 5 # Fixed limit by Naver
-        
-        while len(all_items) < max_items:
-            params = {
-                "query": query,
-                "display": display_per_req,
-                "start": start,
-                "sort": "comment"
-            }
-            
-            headers = self._get_headers()
+        cache_key = self._page_cache_key(query, sort, start)
+        if not force_refresh:
+            cached_entry = self.db.get_cache(cache_key)
+            if cached_entry is not None:
+                metrics.incr("cache_requests", layer="page", result="hit")
+                return cached_entry['items']
+        metrics.incr("cache_requests", layer="page", result="refresh" if force_refresh else "miss")
+
+        params = {
+            "query": query,
+            "display": PAGE_SIZE,
+            "start": start,
+            "sort": sort
+        }
+        with metrics.span("search.fetch_page"):
             try:
-                response = requests.get(self.base_url, headers=headers, params=params)
+                # Checked on both sides of the throttle: waiting for a token can take a while
+                if cancelled is not None and cancelled():
+                    return None
+                self._throttle()
+                if cancelled is not None and cancelled():
+                    metrics.incr("pages_cancelled")
+                    return None
+                metrics.incr("api_calls")
+                response = requests.get(self.base_url, headers=self._get_headers(), params=params)
                 self._log_request("search_page", params, response.status_code)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    items = data.get('items', [])
-                    if not items:
-                        print(f"  Start: {start} -> No items returned.")
-                        break # No more data
-                        
-                    print(f"  Start: {start} -> Got {len(items)} items. First: {items[0]['title']}")
-                    all_items.extend(items)
-                    start += display_per_req
-                    time.sleep(0.05) # Polite delay
-                else:
-                    break
+                metrics.incr("api_bytes", len(response.content))
+                if response.status_code != 200:
+                    metrics.incr("api_errors", status=response.status_code)
+                    return None
+                items = response.json().get('items', [])
             except Exception as e:
+                metrics.incr("api_errors", status="exception")
                 print(f"Pagination Error: {e}")
+                return None
+
+        print(f"  Start: {start} -> Got {len(items)} items.")
+        self.db.save_cache(cache_key, {"timestamp": time.time(), "items": items})
+        if self.rate_limiter is None:
+            time.sleep(PAGE_POLITE_DELAY) # Polite delay
+        return items
+
+    def _fetch_items_with_pagination(self, query, max_items=30, sort="comment",
+                                     max_concurrency=PAGE_MAX_CONCURRENCY, force_refresh=False):
+        """
+        Fetch items using pagination because Naver Local API limits display=5.
+        Pages are fetched speculatively: the look-ahead window starts at one page and
+        doubles while pages come back full (up to max_concurrency), with every call
+        going through the rate limiter. Without a limiter pages are fetched one at a
+        time with a polite delay. The first short, empty or failed page ends the
+        listing: queued pages beyond it are cancelled and their results ignored.
+        Pages still in flight are not waited for: they finish in the background and
+        only write their own page cache row.
+        Pages are cached one by one, so a later, deeper pagination only fetches the new pages.
+        """
+        import concurrent.futures
+
+        if self.rate_limiter is None:
+            max_concurrency = 1  # No request budget to stay within: don't speculate
+
+        starts = list(range(1, min(max_items, PAGE_MAX_START + PAGE_SIZE - 1) + 1, PAGE_SIZE))
+        pages = {}       # page index -> items (None = failed / cancelled)
+        last = [None]    # index of the first page that ends the listing
+        window = 1
+        next_index = 0
+        in_flight = {}   # future -> page index
+
+        def beyond_last(index):
+            return last[0] is not None and index > last[0]
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            with metrics.span("search.paginate"):
+                while True:
+                    while next_index < len(starts) and len(in_flight) < window and not beyond_last(next_index):
+                        index = next_index
+                        future = executor.submit(self._fetch_page, query, starts[index], sort, force_refresh,
+                                                 lambda index=index: beyond_last(index))
+                        in_flight[future] = index
+                        next_index += 1
+                    needed = len(starts) if last[0] is None else last[0] + 1
+                    if all(i in pages for i in range(needed)) or not in_flight:
+                        break
+
+                    done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        index = in_flight.pop(future)
+                        items = pages[index] = future.result()
+                        if items is None or len(items) < PAGE_SIZE:
+                            if last[0] is None or index < last[0]:
+                                last[0] = index
+                        else:
+                            window = min(max_concurrency, window * 2)
+                    for future, index in list(in_flight.items()):
+                        if beyond_last(index) and future.cancel():
+                            del in_flight[future]
+                            metrics.incr("pages_cancelled")
+        finally:
+            # Requests already sent can't be aborted; they finish (and get cached) in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        all_items = []
+        for index in range(len(starts)):
+            items = pages.get(index)
+            if not items:
                 break
-                
-        return all_items
-    def search_places(self, query, display=5, search_mode='popular', force_refresh=False):
+            all_items.extend(items)
+            if len(items) < PAGE_SIZE:
+                break
+        return all_items[:max_items]
+
+    def _search_nearby_coverage(self, coords, query, radius_m, min_places, max_age, search_mode='popular'):
+        """
+        Spatial cache lookup: cached places around coords, restricted to the
+        categories named in the query. Returns the items only if there are at
+        least min_places of them (coverage threshold), else None.
+        """
+        lat, lng = coords
+        items = self.search_nearby_cached(lat, lng, radius_m=radius_m, max_age=max_age, search_mode=search_mode)['items']
+
+        detected_categories = parse_query(query).categories
+        if detected_categories:
+            matcher = compile_matcher(detected_categories)
+            items = [
+                item for item in items
+                if matcher.contains_any(item.get('category', '')) or matcher.contains_any(item.get('title', ''))
+            ]
+
+        if len(items) >= min_places:
+            return items
+        print(f"  Spatial cache coverage too low ({len(items)} < {min_places} places within {radius_m}m).")
+        return None
+
+    @staticmethod
+    def _cache_key(query, search_mode):
+        # Canonical text: whitespace / category order variants share one entry
+        return f"{canonical_query(query)}_{search_mode}_v3" # v3 for clean concurrent strategy
+
+    def _cached_items(self, query, search_mode, coords, radius_m, min_places, max_age):
+        """Items from the DB cache or, with coords, the spatial cache. None on a miss."""
+        cache_key = self._cache_key(query, search_mode)
+        with metrics.span("search.cache_lookup", layer="sqlite"):
+            cached_entry = self.db.get_cache(cache_key)
+        if cached_entry:
+            metrics.incr("cache_requests", layer="search", result="hit")
+            print(f"✅ Local Cache Hit (SQLite) for '{cache_key}'")
+            return cached_entry['items']
+
+        # Spatial Cache: nearby places cached under a different query text
+        if coords:
+            with metrics.span("search.cache_lookup", layer="spatial"):
+                nearby_items = self._search_nearby_coverage(coords, query, radius_m, min_places, max_age, search_mode)
+            if nearby_items is not None:
+                metrics.incr("cache_requests", layer="search", result="hit")
+                print(f"✅ Spatial Cache Hit: {len(nearby_items)} places within {radius_m}m of {coords}")
+                return nearby_items
+        return None
+
+    @staticmethod
+    def _target_keywords(query):
+        """
+        Keywords to explode a query into. Every detailed keyword for a generic query
+        ("강남역 맛집"); only the named ones for a precise query ("강남역 피자 맛집"),
+        so we don't spend quota on "Pizza" when the user asked for "Gukbap".
+        Categories are whole tokens of the parsed query: "카페거리 맛집" stays generic.
+        """
+        detected_categories = list(parse_query(query).categories)
+        if detected_categories:
+            print(f"🎯 Precise Query Detected: Found categories {detected_categories}. Improving efficiency.")
+            return detected_categories
+        return DETAILED_KEYWORDS
+
+    @staticmethod
+    def _sub_query(query, keyword):
+        # E.g. query="강남역 한식 일식 맛집" and keyword="한식" -> "강남역 한식 맛집",
+        # the same sub-query the generic "강남역 맛집" sends for that keyword.
+        # The user's intent word is kept ("을지로 밥집" -> "을지로 국밥 밥집").
+        parsed = parse_query(query)
+        if parsed.categories == (keyword,):
+            return " ".join(query.split())  # Already narrowed: send it as typed ("강남역 한식당")
+        return parsed.search_text([keyword])
+
+    def _fetch_sub_query(self, sub_query, search_mode):
+        """
+        One Local Search call (first page). Errors are counted and return [].
+        Goes through the single-flight layer, so search_places and search_many running
+        at the same time send each identical sub-query once (the result list is shared).
+        """
+        flight_key = ("sub_query", self.base_url, sub_query, search_mode)
+        items, shared = SEARCH_FLIGHTS.do(flight_key, lambda: self._request_sub_query(sub_query, search_mode))
+        if shared:
+            metrics.incr("sub_query_flights_joined")
+        return items
+
+    def _request_sub_query(self, sub_query, search_mode):
+        params = {
+            "query": sub_query,
+            "display": 5, # Limit is 5
+            "start": 1, 
+            "sort": "random" if search_mode == 'random' else "comment"
+        }
+        with metrics.span("search.fetch_keyword"):
+            metrics.incr("api_calls")
+            try:
+                self._throttle()
+                resp = requests.get(self.base_url, headers=self._get_headers(), params=params)
+                metrics.incr("api_bytes", len(resp.content))
+                if resp.status_code == 200:
+                    return resp.json().get('items', [])
+                metrics.incr("api_errors", status=resp.status_code)
+            except:
+                metrics.incr("api_errors", status="exception")
+        return []
+
+    def _save_items(self, query, search_mode, items):
+        if not items:
+            return  # Failed / unauthorized fetches must not be served as an empty cache hit
+        cache_data = {
+            "timestamp": time.time(),
+            "items": items
+        }
+        with metrics.span("search.save"):
+            self.db.save_cache(self._cache_key(query, search_mode), cache_data)
+            self._index_items(items, cache_data["timestamp"], search_mode)
+
+    def search_places(self, query, display=5, search_mode='popular', force_refresh=False,
+                      coords=None, radius_m=SPATIAL_REUSE_RADIUS_M, min_places=SPATIAL_MIN_PLACES,
+                      max_age=SPATIAL_MAX_AGE):
         """
         Search for places with persistent caching and deduplication.
         Uses 'Category Explosion' strategy: querying many specific keywords in parallel
         to overcome the API's 'display=5' per request limit.
         force_refresh: If True, ignore existing cache and fetch fresh data.
+        coords: (lat, lng) of the user. If given, places cached by *other* queries
+            within radius_m are reused when at least min_places of them were
+            cached less than max_age seconds ago (e.g. "역삼역" serving "역삼동").
         """
-        import concurrent.futures
-        
-        # Construct Cache Key
-        cache_key = f"{query}_{search_mode}_v3" # v3 for clean concurrent strategy
-        
-        # 1. Check DB Cache (Skip if force_refresh is True)
+        # 1. Check DB Cache / Spatial Cache (Skip if force_refresh is True)
         if not force_refresh:
-            cached_entry = self.db.get_cache(cache_key)
-            if cached_entry:
-                print(f"✅ Local Cache Hit (SQLite) for '{cache_key}'")
-                return {"items": cached_entry['items']}
-            else:
-                 pass # Cache miss or expired
+            cached_items = self._cached_items(query, search_mode, coords, radius_m, min_places, max_age)
+            if cached_items is not None:
+                return {"items": cached_items}
+
+        # 2. Single-flight: concurrent searches for the same canonical query share one fetch
+        flight_key = (self.db.db_path, self._cache_key(query, search_mode))
+        all_items, shared = SEARCH_FLIGHTS.do(flight_key, lambda: self._fetch_and_save(query, search_mode, force_refresh))
+        if shared:
+            metrics.incr("cache_requests", layer="search", result="hit")
+            metrics.incr("search_flights_joined")
+        return {"items": all_items}
 
-        # 2. Category Explosion Strategy
+    def _fetch_and_save(self, query, search_mode, force_refresh=False):
+        import concurrent.futures
+
+        metrics.incr("cache_requests", layer="search", result="refresh" if force_refresh else "miss")
+
+        # Category Explosion Strategy
         # Naver Local Search limits 'display' to 5 and 'start' parameter is unreliable.
         # Solution: Query many detailed keywords to aggregate unique results.
-        
-        detailed_keywords = [
-            # Korean
-            '한식', '국밥', '해장국', '삼겹살', '갈비', '곱창', '족발', '보쌈', '김치찌개', '된장찌개', '백반', '냉면', '칼국수',
-            # Chinese
-            '중식', '짜장면', '짬뽕', '탕수육', '마라탕', '양꼬치',
-            # Japanese
-            '일식', '초밥', '스시', '돈까스', '라멘', '우동', '이자카야', '덮밥',
-            # Western
-            '양식', '파스타', '피자', '스테이크', '브런치', '버거', '샐러드',
-            # Asian / Others
-            '아시안', '쌀국수', '타코', '카레',
-            # Snack / Cafe
-            '분식', '떡볶이', '김밥', '치킨', '카페', '디저트', '베이커리'
-        ]
-        
         all_items = []
         seen_keys = set() 
         
-        print(f"📡 Fetching live data via Category Explosion ({len(detailed_keywords)} keywords) for '{query}'...")
-        
-        def fetch_category(keyword):
-            # Construct sub-query
-            # If query already contains keyword, skip appending to avoid redundancy if meaningful?
-            # E.g. query="강남역 국밥 맛집" and keyword="국밥" -> "강남역 국밥 맛집"
-            if keyword in query:
-                sub_query = query
-            else:
-                # Insert keyword before '맛집' if possible, or just append
-                if '맛집' in query:
-                    sub_query = query.replace('맛집', f'{keyword} 맛집')
-                else:
-                    sub_query = f"{query} {keyword}"
-            
-            # Param Logic based on Mode
-            sort_method = "comment"
-            if search_mode == 'random':
-                sort_method = "random" 
-            
-            params = {
-                "query": sub_query,
-                "display": 5, # Limit is 5
-                "start": 1, 
-                "sort": sort_method
-            }
-            
-            try:
-                resp = requests.get(self.base_url, headers=self._get_headers(), params=params)
-                if resp.status_code == 200:
-                    return resp.json().get('items', [])
-            except:
-                pass
-            return []
+        target_keywords = self._target_keywords(query)
+        print(f"📡 Fetching live data via Category Explosion ({len(target_keywords)} keywords) for '{query}'...")
 
         # Use ThreadPool to fetch fast
-        # Only trigger explosion if query is generic (e.g. contains "맛집") or user explicitly wants variety.
-        # If user queried "강남역 스시", we probably shouldn't search for "Pork Belly".
-        # Heuristic: If query matches one of detailed_keywords, ONLY search that + related?
-        # For simplicity in this implementation (Category Explosion), we assume the user WANTS variety if they are using this app.
-        # However, if query is specific, we might get irrelevant results.
-        # Let's filter: if query contains a category, only search that.
-        
-        target_keywords = detailed_keywords
-        
-        # Check if query contains any of the keywords
-        detected_categories = [k for k in detailed_keywords if k in query]
-        if detected_categories:
-            # Hybrid Search Strategy:
-            # If the user specifically asks for "Samsun Gukbap", we focus our limited API calls 
-            # on "Korean", "Gukbap" related keywords rather than spending quota on "Pizza".
-            
-            # However, we must be careful. If user asks "Gangnam delicious places", detected is empty -> Search All.
-            # If user asks "Gangnam Date", detected is empty -> Search All.
-            # If user asks "Gangnam Pizza", detected is ["Pizza"] -> Search only Pizza related.
-            
-            print(f"🎯 Precise Query Detected: Found categories {detected_categories}. Improving efficiency.")
-            
-            # Filter target_keywords to only include those that are RELEVANT to the detected categories.
-            # Simple approach: Only search for the detected specific keywords? 
-            # Better approach: If specific keyword is found, search that AND related broad categories.
-            # But our `detailed_keywords` list is flat.
-            
-            # Let's just narrow down to the detected ones to be strictly efficient as per request.
-            target_keywords = detected_categories
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_keyword = {executor.submit(fetch_category, kw): kw for kw in target_keywords}
-            
-            for future in concurrent.futures.as_completed(future_to_keyword):
-                items = future.result()
+        with metrics.span("search.fetch_all"), \
+                concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+            future_to_keyword = {
+                executor.submit(self._fetch_sub_query, self._sub_query(query, kw), search_mode): kw
+                for kw in target_keywords
+            }
+            results = [future.result() for future in concurrent.futures.as_completed(future_to_keyword)]
+
+        with metrics.span("search.dedupe"):
+            for items in results:
                 for item in items:
-                    # Clean title for key
-                    title_clean = item['title'].replace('<b>', '').replace('</b>', '')
-                    unique_key = (item.get('mapx'), item.get('mapy'), title_clean)
-                    
+                    unique_key = place_key(item)
                     if unique_key not in seen_keys:
                         seen_keys.add(unique_key)
                         all_items.append(item)
         
         print(f"  -> Aggregated {len(all_items)} unique items.")
 
-        # 3. Save to Cache
-        cache_data = {
-            "timestamp": time.time(),
-            "items": all_items
-        }
-        self.db.save_cache(cache_key, cache_data)
-        
-        return {"items": all_items}
+        # Save to Cache
+        self._save_items(query, search_mode, all_items)
+        return all_items
+
+    def search_many(self, locations, search_mode='popular', force_refresh=False,
+                    radius_m=SPATIAL_REUSE_RADIUS_M, min_places=SPATIAL_MIN_PLACES,
+                    max_age=SPATIAL_MAX_AGE, max_workers=20):
+        """
+        Bulk search_places for many locations (e.g. an office-wide dashboard).
+        locations: queries ("강남역 맛집") or (query, coords) pairs.
+        Cached locations are answered from the DB / spatial cache; for the rest every
+        location x keyword sub-query goes through one shared work queue, identical
+        sub-queries are sent once (also across concurrent searches, see _fetch_sub_query),
+        and places are deduplicated globally by (mapx, mapy, title): each location's view
+        holds references into one shared set.
+        Returns {location: {"items": [...]}} in input order, keyed by location_key():
+        the query, or (query, coords) when coords were given. Items are shared: treat them as read-only.
+        """
+        import concurrent.futures
+
+        locations_by_key = {}  # location_key -> (query, coords); the same query at two points stays two requests
+        for location in locations:
+            query, coords = (location, None) if isinstance(location, str) else location
+            locations_by_key.setdefault(self.location_key(query, coords), (query, coords))
+
+        results = dict.fromkeys(locations_by_key)
+        plans = {}  # location_key -> [sub_query, ...]
+        for key, (query, coords) in locations_by_key.items():
+            if not force_refresh:
+                cached_items = self._cached_items(query, search_mode, coords, radius_m, min_places, max_age)
+                if cached_items is not None:
+                    results[key] = cached_items
+                    continue
+            metrics.incr("cache_requests", layer="search", result="refresh" if force_refresh else "miss")
+            plans[key] = [self._sub_query(query, kw) for kw in self._target_keywords(query)]
+
+        shared = {}  # place_key -> item, across all locations (cached ones included)
+        for items in results.values():
+            for item in items or ():
+                shared.setdefault(place_key(item), item)
+
+        if plans:
+            unique_sub_queries = list(dict.fromkeys(s for subs in plans.values() for s in subs))
+            total = sum(len(subs) for subs in plans.values())
+            metrics.incr("bulk_sub_queries_deduped", total - len(unique_sub_queries))
+            print(f"📡 Bulk fetch: {len(plans)} locations, {len(unique_sub_queries)} unique sub-queries (of {total})")
+
+            with metrics.span("search.fetch_all"), \
+                    concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                fetched = dict(zip(
+                    unique_sub_queries,
+                    executor.map(lambda s: self._fetch_sub_query(s, search_mode), unique_sub_queries)
+                ))
+
+            with metrics.span("search.dedupe"):
+                for key, subs in plans.items():
+                    view, seen_keys = [], set()
+                    for sub_query in dict.fromkeys(subs):
+                        for item in fetched[sub_query]:
+                            unique_key = place_key(item)
+                            if unique_key not in seen_keys:
+                                seen_keys.add(unique_key)
+                                view.append(shared.setdefault(unique_key, item))
+                    results[key] = view
+            print(f"  -> {len(shared)} unique places shared by {len(results)} locations.")
+
+            for key in plans:
+                self._save_items(locations_by_key[key][0], search_mode, results[key])
+
+        return {key: {"items": items} for key, items in results.items()}
+
+    @staticmethod
+    def location_key(query, coords=None):
+        """Key of a search_many location: the query alone, or (query, (lat, lng))."""
+        return query if not coords else (query, tuple(coords))
 
     # Note: Naver Search API doesn't provide full review texts directly in the listing.
     # We might need a separate way to get detailed reviews if the basic search result isn't enough.
@@ -1,4 +1,9 @@
 import re
+import json
+import hashlib
+
+# Bump when the scoring rules in analyze_reviews change (keyword lists are hashed automatically)
+SCORING_VERSION = 1
 
 class ReviewAnalyzer:
     def __init__(self):
@@ -14,7 +19,24 @@ class ReviewAnalyzer:
             r"웨이팅", r"대기", r"기다림",
             r"오래", r"정신없다"
         ]
-        
+
+    @property
+    def lexicon_version(self):
+        """
+        Short fingerprint of the keyword lists and scoring rules.
+        Cached results are only valid for the same version.
+        """
+        payload = json.dumps(
+            [SCORING_VERSION, self.positive_keywords, self.negative_keywords],
+            ensure_ascii=False
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def text_hash(text):
+        """Stable hash of a review text, used as the NLP cache key."""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
     def analyze_reviews(self, reviews):
         """
         Analyze a list of review texts.
@@ -0,0 +1,35 @@
+from backend.geo_utils import DEFAULT_RADIUS_LADDER, select_radius
+from backend.menu_recommender import MenuRecommender
+
+# Items requested per search (Category Explosion fills up to this many)
+SEARCH_DISPLAY = 50
+
+
+def fetch_place_items(api, query, mode='popular', coords=None, force_refresh=False, display=SEARCH_DISPLAY):
+    """Raw Naver items for a query; the API keeps its own SQLite / spatial caches."""
+    raw_data = api.search_places(
+        query, display=display, search_mode=mode, force_refresh=force_refresh, coords=coords
+    )
+    return raw_data['items'] if raw_data else []
+
+
+def recommend_from_items(items, processor, coords=None, ladder=DEFAULT_RADIUS_LADDER, min_count=1):
+    """
+    process -> smart radius filter -> menu extraction for raw Naver items.
+    Shared by the Streamlit app and the JSON service (backend/service.py).
+    coords: (lat, lng) of the user, or None to skip radius filtering.
+    Returns {"places", "radius", "recommender"}; preferences are applied per user
+    with recommender.with_preferences.
+    """
+    places = processor.process_places(items)
+
+    # 🟢 SMART RADIUS FILTERING (Progressive Expansion): 500m -> 1km -> 2km -> All
+    # Distances are computed and sorted once; each radius is a bisect.
+    radius = None
+    if coords:
+        radius, places = select_radius(coords[0], coords[1], places, ladder=ladder, min_count=min_count)
+
+    # Extract Menus (Only once per fetch)
+    recommender = MenuRecommender()
+    recommender.extract_top_menus(places)
+    return {"places": places, "radius": radius, "recommender": recommender}
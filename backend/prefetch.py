@@ -0,0 +1,97 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# In-flight / finished prefetches are kept this long for the rerun that consumes them
+PREFETCH_TTL = 300
+PREFETCH_WORKERS = 2
+# How long a consumer waits for a matching prefetch before fetching on its own
+RECONCILE_TIMEOUT = 30
+# Waiting on a prefetch of a *different* query only pays off if it's nearly done:
+# past this the rerun fetches on its own instead of blocking the UI
+NEARBY_WAIT_TIMEOUT = 3
+
+
+class PipelinePrefetcher:
+    """
+    Starts the search pipeline in the background as soon as GPS coordinates arrive,
+    while reverse geocoding is still running.
+
+    prefetch(query, mode, coords) runs pipeline_fn(query, mode, coords) on a worker
+    (deduplicated per key). Once the address is known, reconcile() either hands out
+    the prefetched result (same query) or waits for the prefetch at the same
+    coordinates to finish, so the real query reuses what it cached nearby instead of
+    starting a second API explosion.
+    """
+
+    def __init__(self, pipeline_fn, max_workers=PREFETCH_WORKERS, ttl=PREFETCH_TTL):
+        self.pipeline_fn = pipeline_fn
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._futures = {}  # (query, mode, coords) -> (future, started_at)
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        expired = [key for key, (future, started) in self._futures.items()
+                   if future.done() and now - started > self.ttl]
+        for key in expired:
+            del self._futures[key]
+
+    def prefetch(self, query, mode, coords):
+        """Start (or join) the background pipeline for this key. Returns the Future."""
+        key = (query, mode, coords)
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            entry = self._futures.get(key)
+            if entry is not None:
+                return entry[0]
+            future = self._executor.submit(self.pipeline_fn, query, mode, coords)
+            self._futures[key] = (future, now)
+            return future
+
+    def pending(self, coords=None):
+        """Keys of prefetches that haven't finished yet (optionally only for these coords)."""
+        with self._lock:
+            return [key for key, (future, _) in self._futures.items()
+                    if not future.done() and (coords is None or key[2] == coords)]
+
+    def reconcile(self, query, mode, coords, timeout=RECONCILE_TIMEOUT):
+        """
+        Result for (query, mode, coords) if it was prefetched, else None.
+        With no exact match, waits (at most NEARBY_WAIT_TIMEOUT seconds) for prefetches
+        at the same coords and mode so the caller's own fetch finds their places in the
+        cache; those prefetches are evicted once they finish.
+        Each exact match is handed out once; a failed prefetch yields None.
+        """
+        with self._lock:
+            entry = self._futures.pop((query, mode, coords), None)
+            # Only same-mode prefetches fill the cache this search can reuse
+            nearby = [(key, future) for key, (future, _) in self._futures.items()
+                      if key[2] == coords and coords and key[1] == mode]
+
+        if entry is not None:
+            try:
+                return entry[0].result(timeout=timeout)
+            except Exception as e:
+                print(f"Prefetch Error: {e}")
+                return None
+
+        deadline = time.time() + min(timeout, NEARBY_WAIT_TIMEOUT)
+        for key, future in nearby:
+            try:
+                future.result(timeout=max(0.0, deadline - time.time()))
+            except Exception:
+                pass  # The caller fetches on its own anyway
+            # Nobody will ask for this exact key any more: drop it as soon as it's done
+            future.add_done_callback(lambda f, key=key: self._evict(key, f))
+        return None
+
+    def _evict(self, key, future):
+        with self._lock:
+            entry = self._futures.get(key)
+            if entry is not None and entry[0] is future:
+                del self._futures[key]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,98 @@
+"""
+Canonical search queries.
+
+"강남역 한식 일식 맛집", "강남역  일식 한식맛집" and the app's multiselect in any
+order are the same search. parse_query() splits a query into location, categories
+(whole Category Explosion keywords) and intent; its canonical text (single spaces,
+categories in lexicon order, intent normalized to 맛집) is the key of the search
+cache and the single-flight layer. Sub-queries sent to Naver keep the user's own
+intent word (see ParsedQuery.search_text).
+"""
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+from backend.menu_lexicon import DETAILED_KEYWORDS
+
+# Words asking for restaurants in general; all are normalized to the first one in keys
+INTENT_WORDS = ('맛집', '음식점', '식당', '밥집')
+DEFAULT_INTENT = INTENT_WORDS[0]
+# Suffixes glued to a category token ("한식맛집", "한식당") -> the intent word they stand for
+INTENT_SUFFIXES = tuple((word, word) for word in INTENT_WORDS) + (('당', '식당'),)
+# Spellings of a category keyword (the app's "아시아" option is the "아시안" keyword)
+CATEGORY_ALIASES = {'아시아': '아시안', '일식집': '일식', '중국집': '중식'}
+
+_CATEGORY_ORDER = {keyword: i for i, keyword in enumerate(DETAILED_KEYWORDS)}
+
+
+class ParsedQuery(namedtuple("ParsedQuery", ["location", "categories", "intent", "intent_word"])):
+    """
+    A parsed query. categories is a tuple in DETAILED_KEYWORDS order; intent is
+    DEFAULT_INTENT or None (no restaurant word), intent_word what the user typed.
+    """
+    __slots__ = ()
+
+    @property
+    def key(self):
+        """Structured, hashable search key (the user's intent word doesn't matter)."""
+        return self.location, self.categories, self.intent
+
+    @property
+    def text(self):
+        """Canonical query string, e.g. "강남역 한식 일식 맛집"."""
+        return " ".join(part for part in (self.location, *self.categories, self.intent) if part)
+
+    def search_text(self, categories=None):
+        """Query to send to Naver for these categories, with the user's intent word."""
+        categories = self.categories if categories is None else _sorted_categories(categories)
+        return " ".join(part for part in (self.location, *categories, self.intent_word) if part)
+
+    def with_categories(self, categories):
+        return self._replace(categories=_sorted_categories(categories))
+
+
+def _sorted_categories(categories):
+    return tuple(sorted(set(categories), key=_CATEGORY_ORDER.__getitem__))
+
+
+def _category(token):
+    token = CATEGORY_ALIASES.get(token, token)
+    return token if token in _CATEGORY_ORDER else None
+
+
+@lru_cache(maxsize=4096)
+def parse_query(query):
+    """
+    ParsedQuery for a raw query. Only whole tokens count as categories, so a
+    location like "카페거리" or "김밥천국 앞" never narrows the search.
+    A glued intent suffix is split off only from a category ("한식맛집", "한식당");
+    other tokens stay in the location, in their original order.
+    """
+    query = unicodedata.normalize("NFC", query)
+    location, categories, intent_word = [], [], None
+    for token in query.split():
+        if token in INTENT_WORDS:
+            intent_word = intent_word or token
+            continue
+        category = _category(token)
+        if category is None:
+            for suffix, word in INTENT_SUFFIXES:
+                if token.endswith(suffix) and _category(token[:-len(suffix)]):
+                    category = _category(token[:-len(suffix)])
+                    intent_word = intent_word or word
+                    break
+        if category is not None:
+            categories.append(category)
+        else:
+            location.append(token)
+    intent = DEFAULT_INTENT if intent_word else None
+    return ParsedQuery(" ".join(location), _sorted_categories(categories), intent, intent_word)
+
+
+def canonical_query(query):
+    return parse_query(query).text
+
+
+def build_query(location, categories=None):
+    """Canonical query for a location and the categories picked in the app (any order)."""
+    return canonical_query(f"{location} {' '.join(categories or ())} {DEFAULT_INTENT}")
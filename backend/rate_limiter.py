@@ -0,0 +1,78 @@
+"""
+Token-bucket rate limiter for Naver API calls.
+
+One bucket is shared by every NaverPlaceAPI in the process (and by all of their
+worker threads), so parallel searches stay inside the API's request budget:
+
+    NAVER_API_RATE=10 NAVER_API_BURST=20 streamlit run app.py
+
+Without NAVER_API_RATE, get_shared_limiter() returns None and calls are not throttled.
+"""
+import os
+import threading
+import time
+
+DEFAULT_BURST = 20
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` saved up."""
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0  # Total seconds callers spent blocked (for reports)
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available right now. Returns True on success."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Block until `tokens` are available (first come, first served).
+        Returns False if that would take longer than timeout seconds.
+        """
+        if tokens > self.burst:
+            raise ValueError("cannot acquire more tokens than the burst size")
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Reserve now (tokens may go negative) so concurrent callers queue up in order
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                return False
+            self._tokens -= tokens
+            self.waited += wait
+        if wait:
+            time.sleep(wait)
+        return True
+
+
+_SHARED = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_limiter():
+    """Process-wide bucket configured by NAVER_API_RATE / NAVER_API_BURST, or None."""
+    global _SHARED
+    rate = os.getenv("NAVER_API_RATE")
+    if not rate:
+        return None
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = TokenBucket(float(rate), float(os.getenv("NAVER_API_BURST", DEFAULT_BURST)))
+        return _SHARED
@@ -0,0 +1,100 @@
+import random
+
+
+class AliasSampler:
+    """
+    Walker/Vose alias table for O(1) weighted draws.
+    Built once over (item, weight) pairs; sampling without replacement and
+    exclusion sets are handled by rejection, so the table is never rebuilt.
+    """
+
+    def __init__(self, items, weights, rng=None):
+        self.items = list(items)
+        self.weights = [float(w) for w in weights]
+        if len(self.items) != len(self.weights):
+            raise ValueError("items and weights must have the same length")
+        if any(w < 0 for w in self.weights):
+            raise ValueError("weights must be non-negative")
+
+        self.rng = rng or random.Random()
+        self.total = sum(self.weights)
+        self._index = {item: i for i, item in enumerate(self.items)}
+
+        n = len(self.items)
+        self._prob = [0.0] * n
+        self._alias = [0] * n
+        if n == 0 or self.total <= 0:
+            return
+
+        scaled = [w * n / self.total for w in self.weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to float error
+        for i in large + small:
+            self._prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.items)
+
+    def _draw_index(self):
+        i = self.rng.randrange(len(self.items))
+        return i if self.rng.random() < self._prob[i] else self._alias[i]
+
+    def draw(self, exclude=None):
+        """
+        One weighted draw. Items in `exclude` are skipped.
+        Returns None if nothing with positive weight is left.
+        """
+        result = self.sample(1, exclude=exclude)
+        return result[0] if result else None
+
+    def sample(self, k, exclude=None):
+        """
+        Draw up to k distinct items, proportional to weight (without replacement).
+        Items in `exclude` (e.g. recently shown menus) are never returned.
+        """
+        if not self.items or self.total <= 0 or k <= 0:
+            return []
+
+        blocked = {self._index[x] for x in (exclude or ()) if x in self._index}
+        available = [i for i, w in enumerate(self.weights) if w > 0 and i not in blocked]
+        k = min(k, len(available))
+        if k == 0:
+            return []
+
+        chosen = []
+        chosen_set = set()
+        remaining_weight = sum(self.weights[i] for i in available)
+        # Rejection is cheap while most of the mass is still available.
+        # Once blocked/chosen items dominate, finish with a direct weighted pick.
+        attempts = 0
+        max_attempts = 16 * k + 32
+        while len(chosen) < k and attempts < max_attempts:
+            if remaining_weight < 0.25 * self.total:
+                break
+            attempts += 1
+            i = self._draw_index()
+            if i in blocked or i in chosen_set:
+                continue
+            chosen.append(i)
+            chosen_set.add(i)
+            remaining_weight -= self.weights[i]
+
+        while len(chosen) < k:
+            pool = [i for i in available if i not in chosen_set]
+            r = self.rng.random() * sum(self.weights[i] for i in pool)
+            for i in pool:
+                r -= self.weights[i]
+                if r < 0:
+                    break
+            chosen.append(i)
+            chosen_set.add(i)
+
+        return [self.items[i] for i in chosen]
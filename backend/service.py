@@ -0,0 +1,374 @@
+"""
+Headless JSON service for the recommendation pipeline (ASGI / Starlette).
+
+    uvicorn backend.service:app --workers 4
+    python -m backend.service            # single worker, LUNCH_SERVICE_PORT (default 8000)
+
+Endpoints
+    GET  /health
+    GET  /search?query=&mode=&lat=&lng=&force_refresh=   raw Naver items
+    POST /search/many  {"locations", "mode", "force_refresh"}  raw items for many locations
+    POST /process   {"items"}                              normalized + scored places
+    POST /radius    {"lat", "lng", "places", "ladder", "min_count"}
+    POST /menus     {"places", "top_n", "dislikes", "favorites"}
+    GET  /recommend?query=&mode=&lat=&lng=&force_refresh=  full pipeline
+    GET  /metrics                                          Prometheus text (LUNCH_METRICS=1)
+
+Workers share the SQLite caches (search_cache / nlp_cache / geocode_cache in
+restaurant.db); each worker also keeps a small in-process TTL cache of
+/recommend results. Blocking work runs in the threadpool, responses are gzipped.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from backend import metrics
+from backend.data import DataProcessor
+from backend.geo_utils import DEFAULT_RADIUS_LADDER, place_key, select_radius
+from backend.menu_recommender import MenuRecommender
+from backend.naver_api import NaverPlaceAPI
+from backend.pipeline import fetch_place_items, recommend_from_items
+from backend.query import canonical_query
+
+load_dotenv()
+
+# Same values as the Streamlit app, so both share cache entries
+RESULT_TTL = int(os.getenv("LUNCH_SERVICE_CACHE_TTL", 3600))
+RESULT_CACHE_SIZE = 64
+COORDS_DECIMALS = 3
+GZIP_MIN_SIZE = 1024
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if time.time() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_API = None
+_PROCESSOR = None
+_INIT_LOCK = threading.Lock()
+RESULTS = TTLCache(RESULT_CACHE_SIZE, RESULT_TTL)
+
+
+def api_keys_configured():
+    client_id = os.getenv("NAVER_CLIENT_ID")
+    return bool(client_id and os.getenv("NAVER_CLIENT_SECRET") and "your_client_id" not in client_id)
+
+
+def get_api():
+    """One NaverPlaceAPI per worker (shares the spatial index and SQLite cache)."""
+    global _API
+    with _INIT_LOCK:
+        if _API is None:
+            _API = NaverPlaceAPI(os.getenv("NAVER_CLIENT_ID"), os.getenv("NAVER_CLIENT_SECRET"))
+        return _API
+
+
+def get_processor():
+    global _PROCESSOR
+    with _INIT_LOCK:
+        if _PROCESSOR is None:
+            _PROCESSOR = DataProcessor()
+        return _PROCESSOR
+
+
+def error(message, status_code=400):
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+def _parse_coords(params):
+    """Snapped (lat, lng) from lat/lng query params, None if absent. Raises ValueError if malformed."""
+    lat, lng = params.get("lat"), params.get("lng")
+    if lat in (None, "") or lng in (None, ""):
+        return None
+    return (round(float(lat), COORDS_DECIMALS), round(float(lng), COORDS_DECIMALS))
+
+
+def _parse_flag(value):
+    return str(value).lower() in ("1", "true", "yes")
+
+
+# Search modes of NaverPlaceAPI (each one has its own cache entries and spatial index)
+SEARCH_MODES = ("popular", "random")
+
+
+def _parse_mode(value):
+    """Search mode from a request, default popular. Raises ValueError for anything else."""
+    mode = "popular" if value is None else value
+    if mode not in SEARCH_MODES:
+        raise ValueError(mode)
+    return mode
+
+
+# Place / item fields the pipeline reads as text
+TEXT_FIELDS = ("title", "category", "description", "address", "roadAddress", "link")
+
+
+def _valid_places(value):
+    """True for a list of Naver items / processed places (dicts with text fields as strings)."""
+    if not isinstance(value, list):
+        return False
+    for place in value:
+        if not isinstance(place, dict):
+            return False
+        if any(not isinstance(place.get(field, ""), str) for field in TEXT_FIELDS):
+            return False
+        if any(not isinstance(place.get(field, ""), (str, int, float)) for field in ("mapx", "mapy")):
+            return False
+    return True
+
+
+def _int_field(body, name, default, minimum=1):
+    """Integer body field. Raises ValueError if malformed or below minimum."""
+    value = body.get(name, default)
+    if isinstance(value, bool):
+        raise ValueError(name)
+    value = int(value)
+    if value < minimum:
+        raise ValueError(name)
+    return value
+
+
+def _str_list(value):
+    """List of strings from a body field (None = absent). Raises ValueError if malformed."""
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError("expected a list of strings")
+    return value
+
+
+def _search_items(query, mode, coords, force_refresh):
+    return fetch_place_items(get_api(), query, mode, coords, force_refresh)
+
+
+def _recommend(query, mode, coords, force_refresh):
+    key = (canonical_query(query), mode, coords)
+    if not force_refresh:
+        cached = RESULTS.get(key)
+        metrics.incr("cache_requests", layer="service", result="hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+
+    items = _search_items(query, mode, coords, force_refresh)
+    result = recommend_from_items(items, get_processor(), coords)
+    payload = {
+        "query": query,
+        "mode": mode,
+        "radius": result["radius"],
+        "places": result["places"],
+        "recommender": result["recommender"].to_dict(),
+    }
+    RESULTS.set(key, payload)
+    return payload
+
+
+async def _json_body(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+async def health(request):
+    return JSONResponse({"status": "ok", "api_keys": api_keys_configured()})
+
+
+async def metrics_endpoint(request):
+    if not metrics.enabled():
+        return error("metrics are disabled (set LUNCH_METRICS=1)", 404)
+    return PlainTextResponse(metrics.export_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+async def search(request):
+    params = request.query_params
+    query = params.get("query")
+    if not query:
+        return error("query is required")
+    try:
+        mode = _parse_mode(params.get("mode"))
+    except ValueError:
+        return error("mode must be popular or random")
+    if not api_keys_configured():
+        return error("Naver API keys are not configured", 503)
+    try:
+        coords = _parse_coords(params)
+    except ValueError:
+        return error("lat/lng must be numbers")
+    items = await run_in_threadpool(
+        _search_items, query, mode, coords, _parse_flag(params.get("force_refresh"))
+    )
+    return JSONResponse({"items": items})
+
+
+def _search_many(locations, mode, force_refresh):
+    results = get_api().search_many(locations, search_mode=mode, force_refresh=force_refresh)
+    # Shared places are sent once; each location lists indices into them, in request order
+    # (the same query at two coordinates is two locations)
+    places, ids = [], {}
+    views = {}
+    for location_key, result in results.items():
+        view = []
+        for item in result["items"]:
+            key = place_key(item)
+            if key not in ids:
+                ids[key] = len(places)
+                places.append(item)
+            view.append(ids[key])
+        views[location_key] = view
+    keys = [NaverPlaceAPI.location_key(*((location, None) if isinstance(location, str) else location))
+            for location in locations]
+    return {"places": places, "locations": [views[key] for key in keys]}
+
+
+async def search_many(request):
+    body = await _json_body(request)
+    if body is None or not isinstance(body.get("locations"), list) or not body["locations"]:
+        return error("body must be {\"locations\": [\"강남역 맛집\" | {\"query\", \"lat\", \"lng\"}, ...]}")
+    try:
+        mode = _parse_mode(body.get("mode"))
+    except ValueError:
+        return error("mode must be popular or random")
+    if not api_keys_configured():
+        return error("Naver API keys are not configured", 503)
+    locations = []
+    for location in body["locations"]:
+        if isinstance(location, str) and location:
+            locations.append(location)
+        elif isinstance(location, dict) and isinstance(location.get("query"), str) and location["query"]:
+            try:
+                locations.append((location["query"], _parse_coords(location)))
+            except (TypeError, ValueError):
+                return error("lat/lng must be numbers")
+        else:
+            return error("each location must be a query string or {\"query\", \"lat\", \"lng\"}")
+    payload = await run_in_threadpool(
+        _search_many, locations, mode, _parse_flag(body.get("force_refresh"))
+    )
+    return JSONResponse(payload)
+
+
+async def process(request):
+    body = await _json_body(request)
+    if body is None or not _valid_places(body.get("items")):
+        return error("body must be {\"items\": [...]} with Naver item objects")
+    places = await run_in_threadpool(get_processor().process_places, body["items"])
+    return JSONResponse({"places": places})
+
+
+async def radius(request):
+    body = await _json_body(request)
+    if body is None or not _valid_places(body.get("places")):
+        return error("body must be {\"lat\", \"lng\", \"places\": [...]} with place objects")
+    try:
+        lat, lng = float(body["lat"]), float(body["lng"])
+    except (KeyError, TypeError, ValueError):
+        return error("lat/lng must be numbers")
+    try:
+        ladder = tuple(body.get("ladder") or DEFAULT_RADIUS_LADDER)
+        if not all(isinstance(r, (int, float)) and not isinstance(r, bool) for r in ladder):
+            raise ValueError("ladder")
+        min_count = _int_field(body, "min_count", 1)
+    except (TypeError, ValueError):
+        return error("ladder must be a list of meters and min_count a positive integer")
+    chosen, places = await run_in_threadpool(select_radius, lat, lng, body["places"], ladder, min_count)
+    return JSONResponse({"radius": chosen, "places": places})
+
+
+async def menus(request):
+    body = await _json_body(request)
+    if body is None or not _valid_places(body.get("places")):
+        return error("body must be {\"places\": [...]} with place objects")
+    try:
+        top_n = _int_field(body, "top_n", 15)
+        dislikes, favorites = _str_list(body.get("dislikes")), _str_list(body.get("favorites"))
+    except (TypeError, ValueError):
+        return error("top_n must be a positive integer and dislikes/favorites lists of strings")
+
+    def extract():
+        recommender = MenuRecommender()
+        top = recommender.extract_top_menus(
+            body["places"], top_n=top_n, dislikes=dislikes, favorites=favorites
+        )
+        return dict(recommender.to_dict(), menus=top)
+
+    return JSONResponse(await run_in_threadpool(extract))
+
+
+async def recommend(request):
+    params = request.query_params
+    query = params.get("query")
+    if not query:
+        return error("query is required")
+    try:
+        mode = _parse_mode(params.get("mode"))
+    except ValueError:
+        return error("mode must be popular or random")
+    if not api_keys_configured():
+        return error("Naver API keys are not configured", 503)
+    try:
+        coords = _parse_coords(params)
+    except ValueError:
+        return error("lat/lng must be numbers")
+    payload = await run_in_threadpool(
+        _recommend, query, mode, coords, _parse_flag(params.get("force_refresh"))
+    )
+    return JSONResponse(payload)
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health),
+        Route("/metrics", metrics_endpoint),
+        Route("/search", search),
+        Route("/search/many", search_many, methods=["POST"]),
+        Route("/process", process, methods=["POST"]),
+        Route("/radius", radius, methods=["POST"]),
+        Route("/menus", menus, methods=["POST"]),
+        Route("/recommend", recommend),
+    ],
+    middleware=[Middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)],
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=os.getenv("LUNCH_SERVICE_HOST", "0.0.0.0"), port=int(os.getenv("LUNCH_SERVICE_PORT", 8000)))
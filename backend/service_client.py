@@ -0,0 +1,95 @@
+import requests
+
+from backend.menu_recommender import MenuRecommender
+
+DEFAULT_TIMEOUT = 30  # a cold /recommend runs the full category explosion
+
+
+class ServiceClient:
+    """
+    Client for the JSON service in backend/service.py.
+    Keeps one pooled HTTP session; gzip responses are decoded by requests.
+    Errors are raised as requests exceptions so callers can fall back to the local pipeline.
+    """
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _get(self, path, params):
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, path, body):
+        response = self.session.post(f"{self.base_url}{path}", json=body, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _query_params(query, mode, coords, force_refresh):
+        params = {"query": query, "mode": mode}
+        if coords:
+            params["lat"], params["lng"] = coords
+        if force_refresh:
+            params["force_refresh"] = 1
+        return params
+
+    def health(self):
+        return self._get("/health", None)
+
+    def search(self, query, mode="popular", coords=None, force_refresh=False):
+        return self._get("/search", self._query_params(query, mode, coords, force_refresh))["items"]
+
+    def search_many(self, locations, mode="popular", force_refresh=False):
+        """
+        Raw items for many locations at once: {query or (query, (lat, lng)): [items]},
+        keyed like NaverPlaceAPI.search_many.
+        locations: queries or (query, (lat, lng)) pairs. Places shared between locations
+        are transferred once and are the same objects in every list.
+        """
+        body_locations = []
+        for location in locations:
+            if isinstance(location, str):
+                body_locations.append(location)
+            else:
+                query, coords = location
+                entry = {"query": query}
+                if coords:
+                    entry["lat"], entry["lng"] = coords
+                body_locations.append(entry)
+        data = self._post("/search/many", {"locations": body_locations, "mode": mode, "force_refresh": force_refresh})
+        places = data["places"]
+        results = {}
+        for location, ids in zip(locations, data["locations"]):
+            query, coords = (location, None) if isinstance(location, str) else location
+            key = query if not coords else (query, tuple(coords))
+            results.setdefault(key, [places[i] for i in ids])
+        return results
+
+    def process(self, items):
+        return self._post("/process", {"items": items})["places"]
+
+    def select_radius(self, lat, lng, places, ladder=None, min_count=1):
+        body = {"lat": lat, "lng": lng, "places": places, "min_count": min_count}
+        if ladder:
+            body["ladder"] = list(ladder)
+        data = self._post("/radius", body)
+        return data["radius"], data["places"]
+
+    def extract_top_menus(self, places, top_n=15, dislikes=None, favorites=None):
+        body = {"places": places, "top_n": top_n, "dislikes": list(dislikes or ()), "favorites": list(favorites or ())}
+        return self._post("/menus", body)["menus"]
+
+    def recommend(self, query, mode="popular", coords=None, force_refresh=False):
+        """
+        Full pipeline on the service. Same shape as backend.pipeline.recommend_from_items:
+        {"places", "radius", "recommender"} with a MenuRecommender rebuilt from the response.
+        """
+        data = self._get("/recommend", self._query_params(query, mode, coords, force_refresh))
+        return {
+            "places": data["places"],
+            "radius": data["radius"],
+            "recommender": MenuRecommender.from_dict(data["recommender"]),
+        }
@@ -0,0 +1,166 @@
+"""
+Precomputed recommendation snapshots (scripts/precompute.py -> app).
+
+One JSON line per (query, mode, coords): the processed places, the chosen radius
+and the recommender's counts / menu index. Lines are appended as locations finish,
+so an interrupted run resumes where it stopped. The app loads the file once
+(LUNCH_SNAPSHOT=path) and answers matching searches without fetching or processing.
+"""
+import gzip
+import json
+import math
+import os
+import time
+
+from backend import metrics
+from backend.geo_utils import haversine_distances
+from backend.menu_recommender import MenuRecommender
+from backend.query import canonical_query
+
+SNAPSHOT_VERSION = 1
+# Raw fields the app never shows; dropped to keep snapshots small
+DROPPED_FIELDS = ("link", "telephone")
+
+
+def snapshot_key(query, mode, coords):
+    coords_part = f"{coords[0]:.3f},{coords[1]:.3f}" if coords else "-"
+    return f"{mode}|{canonical_query(query)}|{coords_part}"
+
+
+def make_entry(query, mode, coords, radius, places, recommender, grid_step_m=None):
+    """
+    Snapshot line for one pipeline result (recommender: MenuRecommender or its to_dict()).
+    grid_step_m marks a --grid lattice point: it also answers GPS fixes in its cell.
+    """
+    if isinstance(recommender, MenuRecommender):
+        recommender = recommender.to_dict()
+    return {
+        "v": SNAPSHOT_VERSION,
+        "key": snapshot_key(query, mode, coords),
+        "query": query,
+        "mode": mode,
+        "coords": list(coords) if coords else None,
+        "radius": radius,
+        "places": [{k: v for k, v in p.items() if k not in DROPPED_FIELDS} for p in places],
+        "recommender": recommender,
+        "grid_step_m": grid_step_m,
+        "created_at": time.time(),
+    }
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_entries(path):
+    """
+    (entries, complete) from a snapshot file. A line cut off by an interrupted run
+    (or a truncated gzip member) ends the read with complete=False.
+    """
+    entries = []
+    if not os.path.exists(path):
+        return entries, True
+    try:
+        with _open(path, "r") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    return entries, False
+                entry = json.loads(line)
+                if entry.get("v") == SNAPSHOT_VERSION:
+                    entries.append(entry)
+    except (EOFError, OSError, ValueError):
+        return entries, False
+    return entries, True
+
+
+class SnapshotWriter:
+    """Appends entries to a snapshot file; existing complete entries are kept (resume)."""
+
+    def __init__(self, path, resume=True):
+        self.path = path
+        entries, complete = read_entries(path) if resume else ([], True)
+        self.done = {entry["key"] for entry in entries}
+        if not resume or not complete:
+            # Rewrite without the broken tail, appending after it would corrupt the file
+            with _open(path, "w") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file = _open(path, "a")
+
+    def write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.done.add(entry["key"])
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Snapshot:
+    """Read-only lookup over a snapshot file (later lines win for the same key)."""
+
+    def __init__(self, entries):
+        self._entries = {entry["key"]: entry for entry in entries}
+        self._results = {}
+        # (mode, canonical query) -> lattice points [(lat, lng, match distance m, key)]
+        self._grid = {}
+        for key, entry in self._entries.items():
+            if entry.get("grid_step_m") and entry["coords"]:
+                lat, lng = entry["coords"]
+                # Half the cell diagonal: every point of the covered box is this close to some lattice point
+                max_distance = entry["grid_step_m"] / math.sqrt(2)
+                group = self._grid.setdefault((entry["mode"], canonical_query(entry["query"])), [])
+                group.append((lat, lng, max_distance, key))
+
+    @classmethod
+    def load(cls, path):
+        entries, _ = read_entries(path)
+        return cls(entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _nearest_grid_key(self, query, mode, coords):
+        """Key of the closest lattice point for this search within its match distance, or None."""
+        group = self._grid.get((mode, canonical_query(query)))
+        if not group:
+            return None
+        lats, lngs, max_distances, keys = zip(*group)
+        distances = haversine_distances(coords[0], coords[1], lats, lngs)
+        best = int(distances.argmin())
+        return keys[best] if distances[best] <= max_distances[best] else None
+
+    def get(self, query, mode, coords, max_age=None):
+        """
+        Pipeline result {"places", "radius", "recommender"} like recommend_from_items, or None.
+        GPS coords that aren't a stored point fall back to the nearest --grid point of the
+        same search. Entries without places (e.g. written by an older run without API keys)
+        are ignored.
+        """
+        key = snapshot_key(query, mode, coords)
+        entry = self._entries.get(key)
+        if entry is None and coords:
+            key = self._nearest_grid_key(query, mode, coords)
+            entry = self._entries.get(key)
+        if (entry is None or not entry["places"]
+                or (max_age is not None and time.time() - entry["created_at"] > max_age)):
+            metrics.incr("cache_requests", layer="snapshot", result="miss")
+            return None
+        metrics.incr("cache_requests", layer="snapshot", result="hit")
+        result = self._results.get(key)
+        if result is None:
+            # Recommender (alias table) is built once per key; callers treat it as shared / read-only
+            result = self._results[key] = {
+                "places": entry["places"],
+                "radius": entry["radius"],
+                "recommender": MenuRecommender.from_dict(entry["recommender"]),
+            }
+        return result
@@ -0,0 +1,215 @@
+"""
+Local stand-in for the Naver Local Search API (GET /v1/search/local.json).
+
+Serves deterministic fake places (same query + start -> same items) so
+search_places can be benchmarked and load-tested without quota or network.
+With a dataset (e.g. from backend/synthetic.py) it answers from those items
+instead: places near the station named in the query, filtered by the dish.
+
+    with StubNaverServer(latency=0.05) as stub:
+        api = NaverPlaceAPI("id", "secret", base_url=stub.base_url)
+
+    python -m backend.stub_server --port 8081 --latency 0.05
+    python -m backend.stub_server --dataset places.jsonl
+    NAVER_API_BASE_URL=http://127.0.0.1:8081/v1/search/local.json streamlit run app.py
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from backend.gazetteer import STATIONS
+from backend.geo_utils import GridIndex
+from backend.menu_lexicon import DETAILED_KEYWORDS
+
+SEARCH_PATH = "/v1/search/local.json"
+MAX_DISPLAY = 5           # Same limit as the real API
+RESULTS_PER_QUERY = 25    # Pages beyond this are empty
+DEFAULT_CENTER = (37.4979, 127.0276)  # Gangnam station
+SPREAD_DEG = 0.01         # ~1km
+DATASET_RADIUS_M = 1000   # Dataset mode: places this close to the queried station
+
+
+def _rng_for(*parts):
+    seed = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:16]
+    return random.Random(int(seed, 16))
+
+
+def fake_items(query, start=1, display=MAX_DISPLAY, center=DEFAULT_CENTER, results_per_query=RESULTS_PER_QUERY):
+    """Naver-shaped items for one result page of a query."""
+    display = max(1, min(MAX_DISPLAY, display))
+    dish = next((kw for kw in DETAILED_KEYWORDS if kw in query), None)
+    items = []
+    for rank in range(start, min(start + display, results_per_query + 1)):
+        rng = _rng_for(query, rank)
+        name_dish = dish or rng.choice(DETAILED_KEYWORDS)
+        lat = center[0] + rng.uniform(-SPREAD_DEG, SPREAD_DEG)
+        lng = center[1] + rng.uniform(-SPREAD_DEG, SPREAD_DEG)
+        items.append({
+            "title": f"<b>{name_dish}</b>집 {rng.randint(1, 999)}호점",
+            "link": "",
+            "category": f"음식점>{name_dish}",
+            "description": rng.choice(["점심 혼밥 가능, 음식 빨리 나와요", "웨이팅이 길어요", "회전율 좋은 집", ""]),
+            "telephone": "",
+            "address": "서울특별시 강남구 역삼동",
+            "roadAddress": "서울특별시 강남구 강남대로",
+            "mapx": str(int(lng * 1e7)),
+            "mapy": str(int(lat * 1e7)),
+        })
+    return items
+
+
+class DatasetIndex:
+    """Answers queries from a fixed list of items (station in the query -> nearby places)."""
+
+    def __init__(self, items, radius_m=DATASET_RADIUS_M):
+        self.radius_m = radius_m
+        self.grid = GridIndex()
+        self.grid.add_many(items, created_at=0)
+        # Longest names first so "신논현역" is not read as "논현역"
+        self._stations = sorted(STATIONS, key=lambda s: -len(s[0]))
+        self._results = {}  # query -> matching items, nearest first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.grid)
+
+    def _match(self, query):
+        station = next(((lat, lng) for name, lat, lng in self._stations
+                        if name in query or name[:-1] in query.split()), DEFAULT_CENTER)
+        dishes = [kw for kw in DETAILED_KEYWORDS if kw in query]
+        hits = self.grid.query_radius(station[0], station[1], self.radius_m)
+        return [
+            place for _, place in hits
+            if not dishes or any(d in place.get("category", "") or d in place.get("title", "") for d in dishes)
+        ]
+
+    def items(self, query, start=1, display=MAX_DISPLAY):
+        with self._lock:
+            matches = self._results.get(query)
+        if matches is None:
+            matches = self._match(query)
+            with self._lock:
+                self._results[query] = matches
+        display = max(1, min(MAX_DISPLAY, display))
+        return matches[start - 1:start - 1 + display], len(matches)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # search_places opens 20 connections at once; the default backlog of 5 drops SYNs (1s retry)
+    request_queue_size = 256
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        if url.path != SEARCH_PATH:
+            return self._send(404, {"errorMessage": "Not Found"})
+        if not self.headers.get("X-Naver-Client-Id") or not self.headers.get("X-Naver-Client-Secret"):
+            return self._send(401, {"errorMessage": "Authentication failed"})
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        query = params.get("query", "")
+        try:
+            start = int(params.get("start", 1))
+            display = int(params.get("display", MAX_DISPLAY))
+        except ValueError:
+            return self._send(400, {"errorMessage": "Invalid parameter"})
+
+        with server.lock:
+            server.calls += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.dataset is not None:
+            items, total = server.dataset.items(query, max(start, 1), display)
+        else:
+            items, total = fake_items(query, start, display, server.center, server.results_per_query), server.results_per_query
+        self._send(200, {
+            "lastBuildDate": datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0900"),
+            "total": total,
+            "start": start,
+            "display": len(items),
+            "items": items,
+        })
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark / test output clean
+
+
+class StubNaverServer:
+    """
+    Threaded stub server on 127.0.0.1 (port 0 = pick a free one). Counts API calls in `calls`.
+    dataset: optional list of Naver-shaped items to serve instead of generated pages.
+    """
+
+    def __init__(self, port=0, latency=0.0, center=DEFAULT_CENTER, results_per_query=RESULTS_PER_QUERY,
+                 dataset=None):
+        self.httpd = _Server(("127.0.0.1", port), _Handler)
+        self.httpd.dataset = DatasetIndex(dataset) if dataset is not None else None
+        self.httpd.latency = latency
+        self.httpd.center = center
+        self.httpd.results_per_query = results_per_query
+        self.httpd.calls = 0
+        self.httpd.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{SEARCH_PATH}"
+
+    @property
+    def calls(self):
+        return self.httpd.calls
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Naver Local Search stub server")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--dataset", help="JSONL items to serve (scripts/generate_places.py)")
+    args = parser.parse_args()
+
+    dataset = None
+    if args.dataset:
+        from backend.synthetic import read_jsonl
+        dataset = list(read_jsonl(args.dataset))
+    stub = StubNaverServer(port=args.port, latency=args.latency, dataset=dataset)
+    source = f"{len(stub.httpd.dataset)} places from {args.dataset}" if dataset is not None else "generated pages"
+    print(f"Stub Naver API on {stub.base_url} (latency {args.latency}s, {source})")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
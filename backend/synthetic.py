@@ -0,0 +1,191 @@
+"""
+Synthetic Naver Local Search items for scale testing.
+
+Places cluster around the subway stations of the offline gazetteer (busy office
+hubs get more of them), carry Naver-style category hierarchies ("한식>찌개,전골"),
+include chain branches ("김밥천국 강남역점") and a share of exact repeats (the same
+place returned by several sub-queries), and are deterministic per seed.
+Items are generated lazily, so millions can be streamed to disk:
+
+    gen = SyntheticPlaceGenerator(seed=7)
+    write_jsonl("places.jsonl", gen.iter_items(1_000_000))
+
+    python scripts/generate_places.py -n 1000000 -o places.jsonl
+"""
+import gzip
+import json
+import math
+import random
+from collections import deque
+
+from backend.gazetteer import STATIONS
+
+METERS_PER_DEG_LAT = 111320.0
+
+# (top level, Naver leaf, dish names used in titles) - leaves follow Naver's own category strings
+CATEGORY_TREE = [
+    ("한식", "찌개,전골", ["김치찌개", "된장찌개", "부대찌개", "순두부찌개"]),
+    ("한식", "국밥", ["국밥", "돼지국밥", "순대국밥", "콩나물국밥"]),
+    ("한식", "해장국", ["해장국", "뼈해장국", "선지해장국"]),
+    ("한식", "육류,고기요리", ["삼겹살", "갈비", "목살", "차돌박이"]),
+    ("한식", "곱창,막창,양", ["곱창", "막창", "대창"]),
+    ("한식", "족발,보쌈", ["족발", "보쌈"]),
+    ("한식", "백반,가정식", ["백반", "제육볶음", "생선구이"]),
+    ("한식", "냉면", ["냉면", "물냉면", "막국수"]),
+    ("한식", "칼국수,만두", ["칼국수", "만두", "수제비"]),
+    ("중식", "중식당", ["짜장면", "짬뽕", "탕수육"]),
+    ("중식", "마라탕", ["마라탕", "마라샹궈"]),
+    ("중식", "양꼬치", ["양꼬치"]),
+    ("일식", "초밥,롤", ["초밥", "스시", "연어덮밥"]),
+    ("일식", "돈가스", ["돈까스", "규카츠"]),
+    ("일식", "일본식라면", ["라멘"]),
+    ("일식", "우동,소바", ["우동", "소바"]),
+    ("일식", "덮밥", ["덮밥", "규동", "가츠동"]),
+    ("일식", "이자카야", ["이자카야"]),
+    ("양식", "이탈리아음식", ["파스타", "피자", "리조또"]),
+    ("양식", "스테이크,립", ["스테이크", "함박스테이크"]),
+    ("양식", "브런치", ["브런치", "샌드위치"]),
+    ("양식", "햄버거", ["버거", "수제버거"]),
+    ("양식", "샐러드", ["샐러드", "포케"]),
+    ("아시아음식", "베트남음식", ["쌀국수", "분짜"]),
+    ("아시아음식", "태국음식", ["팟타이", "똠얌꿍"]),
+    ("아시아음식", "인도음식", ["카레", "커리"]),
+    ("아시아음식", "멕시코,남미음식", ["타코", "부리또"]),
+    ("분식", "떡볶이", ["떡볶이", "라볶이"]),
+    ("분식", "김밥", ["김밥", "참치김밥"]),
+    ("치킨", "치킨,닭강정", ["치킨", "닭강정"]),
+    ("카페,디저트", "카페", ["카페"]),
+    ("카페,디저트", "베이커리", ["베이커리", "소금빵"]),
+    ("카페,디저트", "디저트", ["디저트", "케이크"]),
+]
+# Relative share of each top level around office districts
+TOP_LEVEL_WEIGHTS = {"한식": 40, "중식": 9, "일식": 14, "양식": 12, "아시아음식": 6, "분식": 8, "치킨": 4, "카페,디저트": 7}
+
+# (brand, index into CATEGORY_TREE); a second branch near the same station is "강남역2호점"
+CHAINS = [
+    ("김밥천국", 28), ("본죽", 6), ("한솥도시락", 6), ("역전우동", 15), ("홍콩반점0410", 9), ("맘스터치", 21),
+    ("롯데리아", 21), ("써브웨이", 20), ("교촌치킨", 29), ("이삭토스트", 20), ("신전떡볶이", 27), ("포케올데이", 22),
+    ("미분당", 23), ("하남돼지집", 3), ("명륜진사갈비", 3), ("새마을식당", 6), ("백채김치찌개", 0), ("청년다방", 27),
+    ("스타벅스", 30), ("파리바게뜨", 31), ("아비꼬", 25), ("탄탄면공방", 9), ("라화쿵부", 10), ("멘쇼", 14),
+]
+CHAIN_RATIO = 0.15
+MAX_BRANCHES_PER_STATION = 3
+# Share of items that repeat an earlier one exactly (same place from another sub-query)
+DUPLICATE_RATIO = 0.05
+DUPLICATE_WINDOW = 2000
+
+# Office hubs: more places per station
+HUB_STATIONS = {"강남역", "역삼역", "선릉역", "삼성역", "여의도역", "광화문역", "시청역", "종각역", "을지로입구역",
+                "판교역", "가산디지털단지역", "구로디지털단지역", "홍대입구역", "성수역", "공덕역"}
+HUB_WEIGHT = 4
+# Mixture of a dense core around the exit and a wider street-level spread
+CORE_SIGMA_M = 250
+WIDE_SIGMA_M = 700
+CORE_SHARE = 0.7
+
+NAME_PREFIXES = ["", "", "", "원조", "할매", "진", "옛날", "우리집", "장수", "소문난", "명가", "정", "큰손", "오늘", "행복한"]
+NAME_SUFFIXES = ["", "집", "당", "식당", "하우스", "본점", "상회", "관", "공방", "연구소"]
+DESCRIPTION_PHRASES = [
+    "점심 혼밥 가능", "음식이 빨리 나와요", "회전율이 좋아요", "직장인 점심 맛집", "가성비 좋은 점심",
+    "웨이팅이 길어요", "점심시간 대기 있음", "기다림이 오래 걸려요", "주차 가능", "단체석 완비",
+    "깔끔한 인테리어", "재료가 신선해요", "양이 많아요", "포장 가능", "저녁엔 술집",
+]
+
+
+class SyntheticPlaceGenerator:
+    """Deterministic stream of Naver-shaped items (title, category, description, address, mapx/mapy...)."""
+
+    def __init__(self, seed=0, stations=STATIONS, chain_ratio=CHAIN_RATIO, duplicate_ratio=DUPLICATE_RATIO):
+        self.rng = random.Random(seed)
+        self.stations = list(stations)
+        self.chain_ratio = chain_ratio
+        self.duplicate_ratio = duplicate_ratio
+        self._station_weights = [HUB_WEIGHT if name in HUB_STATIONS else 1 for name, lat, lng in self.stations]
+        self._category_weights = [
+            TOP_LEVEL_WEIGHTS[top] / sum(1 for t, _, _ in CATEGORY_TREE if t == top) for top, _, _ in CATEGORY_TREE
+        ]
+        self._recent = deque(maxlen=DUPLICATE_WINDOW)
+        self._branches = {}  # (brand, station) -> branches so far
+        self._serial = 0
+
+    def _position(self, lat, lng):
+        sigma = CORE_SIGMA_M if self.rng.random() < CORE_SHARE else WIDE_SIGMA_M
+        dlat = self.rng.gauss(0, sigma) / METERS_PER_DEG_LAT
+        dlng = self.rng.gauss(0, sigma) / (METERS_PER_DEG_LAT * math.cos(math.radians(lat)))
+        return lat + dlat, lng + dlng
+
+    def _title(self, station, category_index):
+        rng = self.rng
+        if self.chain_ratio and rng.random() < self.chain_ratio:
+            brand, chain_category = rng.choice(CHAINS)
+            count = self._branches.get((brand, station), 0)
+            if count < MAX_BRANCHES_PER_STATION:
+                self._branches[(brand, station)] = count + 1
+                branch = station if count == 0 else f"{station}{count + 1}호"
+                return f"{brand} {branch}점", chain_category, None
+        dish = rng.choice(CATEGORY_TREE[category_index][2])
+        name = f"{rng.choice(NAME_PREFIXES)}{dish}{rng.choice(NAME_SUFFIXES)}"
+        return name, category_index, dish
+
+    def make_item(self):
+        """One new (never repeated) item."""
+        rng = self.rng
+        self._serial += 1
+        station, lat, lng = rng.choices(self.stations, weights=self._station_weights)[0]
+        lat, lng = self._position(lat, lng)
+        category_index = rng.choices(range(len(CATEGORY_TREE)), weights=self._category_weights)[0]
+        title, category_index, dish = self._title(station, category_index)
+        top, leaf, _ = CATEGORY_TREE[category_index]
+        if dish and rng.random() < 0.5:
+            # Naver highlights the matched query term
+            title = title.replace(dish, f"<b>{dish}</b>", 1)
+
+        lot = f"{rng.randint(1, 999)}-{rng.randint(1, 60)}"
+        return {
+            "title": title,
+            "link": "" if rng.random() < 0.6 else f"https://example.com/place/{self._serial}",
+            "category": f"{top}>{leaf}",
+            "description": ", ".join(rng.sample(DESCRIPTION_PHRASES, rng.randint(0, 3))),
+            "telephone": "" if rng.random() < 0.5 else f"02-{rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+            "address": f"서울특별시 {station[:-1]}동 {lot}",
+            "roadAddress": f"서울특별시 {station[:-1]}로 {rng.randint(1, 200)}",
+            "mapx": str(int(round(lng * 1e7))),
+            "mapy": str(int(round(lat * 1e7))),
+        }
+
+    def iter_items(self, n):
+        """Yield n items; about duplicate_ratio of them repeat a recent item verbatim."""
+        rng = self.rng
+        for _ in range(n):
+            if self._recent and rng.random() < self.duplicate_ratio:
+                yield dict(rng.choice(self._recent))
+                continue
+            item = self.make_item()
+            self._recent.append(item)
+            yield item
+
+
+def _open(path, mode):
+    # *.gz files are gzip-compressed text
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_jsonl(path, items):
+    """Stream items to a JSON Lines file (gzip if path ends with .gz). Returns the count."""
+    count = 0
+    with _open(path, "w") as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def read_jsonl(path):
+    """Lazily yield items from a file written by write_jsonl."""
+    with _open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,161 @@
+from collections import deque
+from functools import lru_cache
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of keywords.
+    Finds every keyword occurring in a text in one linear pass,
+    independent of how many keywords there are.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(sorted({kw for kw in keywords if kw}))
+
+        # State 0 is the root. goto[state] = {char: next_state}
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]  # keywords ending at this state (incl. via fail links)
+
+        for kw in self.keywords:
+            state = 0
+            for ch in kw:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = nxt
+            self._output[state] = (kw,)
+
+        # BFS to compute failure links (depth-1 states fail back to the root)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                if state:
+                    self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def _step(self, state, ch):
+        goto, fail = self._goto, self._fail
+        while state and ch not in goto[state]:
+            state = fail[state]
+        return goto[state].get(ch, 0)
+
+    def find_all(self, text):
+        """Return the set of keywords that occur in text."""
+        found = set()
+        if not self.keywords or not text:
+            return found
+        output = self._output
+        state = 0
+        for ch in text:
+            state = self._step(state, ch)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def contains_any(self, text):
+        """True if at least one keyword occurs in text (stops at the first hit)."""
+        if not self.keywords or not text:
+            return False
+        output = self._output
+        state = 0
+        for ch in text:
+            state = self._step(state, ch)
+            if output[state]:
+                return True
+        return False
+
+
+@lru_cache(maxsize=64)
+def _compile(keywords):
+    return KeywordMatcher(keywords)
+
+
+def compile_matcher(keywords):
+    """
+    Return a (cached) KeywordMatcher for a keyword collection.
+    The same preference set always maps to the same compiled automaton.
+    """
+    return _compile(frozenset(kw for kw in (keywords or ()) if kw))
+
+
+class LongestMatchTrie:
+    """
+    Dictionary trie for leftmost-longest extraction.
+    "시골김치찌개" -> ["김치찌개"] when both "김치" and "김치찌개" are in the dictionary.
+    Each scan step walks at most the longest word length, so a string is
+    processed in one pass (O(len(text) * max word length)).
+    """
+
+    _END = ""
+
+    def __init__(self, words=()):
+        self._root = {}
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if not word:
+            return
+        node = self._root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        if self._END not in node:
+            node[self._END] = word
+            self.size += 1
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, word):
+        node = self._root
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                return False
+        return self._END in node
+
+    def extract(self, text):
+        """Return non-overlapping dictionary words in text, preferring the longest match at each position."""
+        found = []
+        if not text:
+            return found
+        root, end_key = self._root, self._END
+        i, n = 0, len(text)
+        while i < n:
+            node = root.get(text[i])
+            if node is None:
+                i += 1
+                continue
+            best, best_end = None, i
+            j = i
+            while node is not None:
+                word = node.get(end_key)
+                if word is not None:
+                    best, best_end = word, j + 1
+                j += 1
+                if j >= n:
+                    break
+                node = node.get(text[j])
+            if best is None:
+                i += 1
+            else:
+                found.append(best)
+                i = best_end
+        return found
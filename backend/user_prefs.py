@@ -1,45 +1,130 @@
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
+
+from backend.db_manager import DatabaseManager
+
+# Visitors without an id share this one (and inherit the old user_preferences.json)
+DEFAULT_USER_ID = "default"
+LEGACY_PREFS_FILE = "user_preferences.json"
+# In-process read cache: {(db_path, user_id): (dislikes, favorites, version, checked_at)}, LRU-bounded
+MAX_CACHED_USERS = 10000
+# Cached entries older than this re-check `version` in SQLite, so saves made by other
+# processes (uvicorn workers, Streamlit replicas) show up within a second
+REVALIDATE_SECONDS = 1.0
+
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key):
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None:
+            _CACHE.move_to_end(key)
+        return entry
+
+
+def _cache_set(key, entry):
+    with _CACHE_LOCK:
+        current = _CACHE.get(key)
+        # A slower reader must not overwrite a newer save
+        if current is None or entry[2] >= current[2]:
+            _CACHE[key] = (*entry[:3], time.monotonic())
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > MAX_CACHED_USERS:
+            _CACHE.popitem(last=False)
+
+
+def clear_cache():
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
 
 class UserPreferences:
-    def __init__(self, filepath="user_preferences.json"):
-        self.filepath = filepath
-        self.preferences = self._load_preferences()
+    """
+    Taste settings (dislikes / favorites) of one user, stored in the user_preferences
+    table of restaurant.db. Reads are served from an in-process cache that re-checks
+    the stored version every REVALIDATE_SECONDS; every save is an atomic upsert that
+    bumps `version`, so caches derived from the preferences can be keyed on (user_id, version).
+    """
+
+    def __init__(self, user_id=DEFAULT_USER_ID, db=None, legacy_path=LEGACY_PREFS_FILE):
+        self.user_id = user_id or DEFAULT_USER_ID
+        self.db = db if db is not None else DatabaseManager()
+        self.legacy_path = legacy_path
+        self._key = (self.db.db_path, self.user_id)
+        self._load_preferences()
 
     def _load_preferences(self):
-        """Load preferences from JSON file."""
-        if os.path.exists(self.filepath):
+        """Load preferences (cache -> DB -> legacy JSON for the default user)."""
+        entry = _cache_get(self._key)
+        if entry is not None:
+            if time.monotonic() - entry[3] < REVALIDATE_SECONDS:
+                return entry[:3]
+            # Another process may have saved since: compare versions before a full read
             try:
-                with open(self.filepath, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                return self._default_preferences()
-        else:
-            return self._default_preferences()
-
-    def _default_preferences(self):
-        """Return default empty preferences."""
-        return {
-            "dislikes": [],
-            "favorites": []
-        }
+                if self.db.get_user_preferences_version(self.user_id) == entry[2]:
+                    _cache_set(self._key, entry)
+                    return entry[:3]
+            except Exception as e:
+                print(f"Preferences Load Error: {e}")
+                return entry[:3]
+
+        try:
+            entry = self.db.get_user_preferences(self.user_id)
+        except Exception as e:
+            print(f"Preferences Load Error: {e}")
+            return ([], [], 0)  # Don't cache: the DB may just be busy
+
+        if entry is None:
+            legacy = self._load_legacy() if self.user_id == DEFAULT_USER_ID else None
+            if legacy and (legacy["dislikes"] or legacy["favorites"]):
+                self.save_preferences(legacy["dislikes"], legacy["favorites"])
+                entry = _cache_get(self._key)
+                return entry[:3] if entry is not None else ([], [], 0)
+            entry = ([], [], 0)
+
+        _cache_set(self._key, entry)
+        return entry
+
+    def _load_legacy(self):
+        """Preferences from the old shared JSON file, if present."""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return None
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {"dislikes": list(data.get("dislikes", [])), "favorites": list(data.get("favorites", []))}
+        except Exception:
+            return None
 
     def save_preferences(self, dislikes, favorites):
-        """Save new preferences to file."""
-        self.preferences = {
-            "dislikes": list(set(dislikes)), # Ensure unique
-            "favorites": list(set(favorites))
-        }
+        """Save new preferences (atomic upsert). Returns True on success."""
+        dislikes = sorted(set(dislikes))  # Ensure unique
+        favorites = sorted(set(favorites))
         try:
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump(self.preferences, f, ensure_ascii=False, indent=2)
-            return True
+            version = self.db.save_user_preferences(self.user_id, dislikes, favorites)
         except Exception as e:
             print(f"Error saving preferences: {e}")
             return False
+        _cache_set(self._key, (dislikes, favorites, version))
+        return True
+
+    @property
+    def preferences(self):
+        dislikes, favorites, _ = self._load_preferences()
+        return {"dislikes": list(dislikes), "favorites": list(favorites)}
+
+    @property
+    def version(self):
+        """Change counter: 0 = never saved, +1 on every save."""
+        return self._load_preferences()[2]
 
     def get_dislikes(self):
-        return self.preferences.get("dislikes", [])
+        return list(self._load_preferences()[0])
 
     def get_favorites(self):
-        return self.preferences.get("favorites", [])
+        return list(self._load_preferences()[1])
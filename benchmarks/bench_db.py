@@ -0,0 +1,27 @@
+import pytest
+
+from conftest import SCALES, places_for, run
+
+from backend.nlp import ReviewAnalyzer
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_save_cache(benchmark, db, n):
+    run(benchmark, db.save_cache, n, args=("강남역 맛집_popular_v3", {"items": places_for(n)}))
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_get_cache(benchmark, db, n):
+    db.save_cache("강남역 맛집_popular_v3", {"items": places_for(n)})
+    result = run(benchmark, db.get_cache, n, args=("강남역 맛집_popular_v3",))
+    assert len(result["items"]) == n
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_get_nlp_results(benchmark, db, n):
+    # Batched memo lookup as done by DataProcessor.analyze_descriptions
+    analyzer = ReviewAnalyzer()
+    hashes = [analyzer.text_hash(p["description"]) for p in places_for(n)]
+    db.save_nlp_results({h: {"score": 50, "sentiment": "Neutral", "keywords": []} for h in hashes}, "bench")
+    result = run(benchmark, db.get_nlp_results, n, args=(hashes, "bench"))
+    assert len(result) == len(set(hashes))
@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import CENTER, SCALES, copy_places, places_for, run
+
+from backend.data import DataProcessor
+from backend.geo_utils import select_radius
+from backend.menu_recommender import MenuRecommender
+from backend.nlp import ReviewAnalyzer
+
+_PROCESSED = {}
+
+
+def processed_for(n, db):
+    if n not in _PROCESSED:
+        _PROCESSED[n] = DataProcessor(db=db).process_places(copy_places(places_for(n)))
+    return _PROCESSED[n]
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_process_places(benchmark, db, n):
+    # Steady state: NLP results already memoized in nlp_cache
+    processor = DataProcessor(db=db)
+    processor.process_places(copy_places(places_for(n)))
+    result = run(benchmark, processor.process_places, n, setup=lambda: ((copy_places(places_for(n)),), {}))
+    assert len(result) == n
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_analyze_reviews(benchmark, n):
+    analyzer = ReviewAnalyzer()
+    descriptions = [p["description"] for p in places_for(n)]
+
+    def analyze_all():
+        return [analyzer.analyze_reviews([text]) for text in descriptions]
+
+    result = run(benchmark, analyze_all, n)
+    assert len(result) == n
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_extract_top_menus(benchmark, db, n):
+    places = processed_for(n, db)
+    result = run(benchmark, MenuRecommender().extract_top_menus, n, args=(places,))
+    assert result
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_select_radius(benchmark, db, n):
+    places = processed_for(n, db)
+    radius, nearby = run(benchmark, select_radius, n, args=(CENTER[0], CENTER[1], places))
+    assert nearby
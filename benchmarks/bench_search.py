@@ -0,0 +1,44 @@
+import pytest
+
+from conftest import CENTER, SCALES, places_for, run
+
+from backend.naver_api import NaverPlaceAPI, SPATIAL_INDEXES
+from backend.stub_server import StubNaverServer
+
+
+@pytest.fixture
+def stub():
+    with StubNaverServer() as server:
+        yield server
+
+
+@pytest.fixture
+def api(db, stub):
+    api = NaverPlaceAPI("bench-id", "bench-secret", base_url=stub.base_url, db=db, usage_log=None)
+    yield api
+    SPATIAL_INDEXES.pop(db.db_path, None)
+
+
+def test_search_places_category_explosion(benchmark, api, stub):
+    # Cold path: one request per DETAILED_KEYWORDS entry against the local stub
+    result = benchmark.pedantic(api.search_places, args=("강남역 맛집",), kwargs={"force_refresh": True},
+                                rounds=10, warmup_rounds=1)
+    assert result["items"]
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_search_places_cache_hit(benchmark, api, stub, n):
+    api.db.save_cache("강남역 맛집_popular_v3", {"items": places_for(n)})
+    result = run(benchmark, api.search_places, n, args=("강남역 맛집",))
+    assert len(result["items"]) == n
+    assert stub.calls == 0
+
+
+@pytest.mark.parametrize("n", SCALES)
+def test_search_places_spatial_reuse(benchmark, api, stub, n):
+    # Cached under another query text; served from the grid index around the user
+    api.db.save_cache("역삼역 맛집_popular_v3", {"items": places_for(n)})
+    api.get_spatial_index()
+    result = run(benchmark, api.search_places, n, args=("강남역 맛집",), kwargs={"coords": CENTER, "min_places": 1})
+    assert result["items"]
+    assert stub.calls == 0
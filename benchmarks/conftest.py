@@ -0,0 +1,93 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pytest_benchmark")
+
+from backend.menu_lexicon import DETAILED_KEYWORDS
+
+# Realistic (one search), busy area (many cached searches), extreme (whole city cache)
+SCALES = [50, 5000, 500000]
+SMALL_SCALES = [50, 5000]
+
+CENTER = (37.4979, 127.0276)
+FILLER = ["점심", "혼밥", "가성비", "웨이팅", "친절한", "음식이 빨리 나와요", "회전율", "대기", "깔끔한", "직장인"]
+
+
+def make_places(n, seed=0):
+    """Naver-shaped raw items around Gangnam (~2km spread), deterministic per seed."""
+    rng = random.Random(seed)
+    places = []
+    for i in range(n):
+        dish = rng.choice(DETAILED_KEYWORDS)
+        lat = CENTER[0] + rng.gauss(0, 0.01)
+        lng = CENTER[1] + rng.gauss(0, 0.012)
+        places.append({
+            "title": f"<b>{dish}</b>집 {i}",
+            "category": f"음식점>{dish}",
+            "description": " ".join(rng.choice(FILLER) for _ in range(6)) + f" {dish}",
+            "address": "서울특별시 강남구 역삼동",
+            "mapx": str(int(lng * 1e7)),
+            "mapy": str(int(lat * 1e7)),
+        })
+    return places
+
+
+_PLACES = {}
+
+
+def places_for(n):
+    """Raw items shared by every benchmark at this scale (built once per session)."""
+    if n not in _PLACES:
+        _PLACES[n] = make_places(n)
+    return _PLACES[n]
+
+
+def copy_places(places):
+    # process_places mutates its input: each round gets fresh dicts
+    return [dict(p) for p in places]
+
+
+def run(benchmark, fn, n, args=(), kwargs=None, setup=None):
+    """
+    benchmark.pedantic with per-scale rounds: many batched iterations for sub-millisecond
+    cases (timer/scheduler noise), a single round at extreme scale to keep a full run in minutes.
+    """
+    if n <= 50:
+        rounds, iterations, warmup = 30, 10, 1
+    elif n <= 5000:
+        rounds, iterations, warmup = 10, 1, 1
+    else:
+        rounds, iterations, warmup = 1, 1, 0
+    if setup is not None:
+        # pytest-benchmark only allows one iteration per round with a setup function
+        return benchmark.pedantic(fn, setup=setup, rounds=rounds * iterations, warmup_rounds=warmup)
+    return benchmark.pedantic(fn, args=args, kwargs=kwargs or {}, rounds=rounds, iterations=iterations,
+                              warmup_rounds=warmup)
+
+
+@pytest.fixture
+def db(tmp_path):
+    from backend.db_manager import DatabaseManager
+    return DatabaseManager(str(tmp_path / "bench.db"))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--max-places", type=int, default=max(SCALES),
+                     help="skip benchmark scales above this many places (e.g. 5000 for a quick run)")
+
+
+def pytest_collection_modifyitems(config, items):
+    max_places = config.getoption("--max-places")
+    selected, deselected = [], []
+    for item in items:
+        n = getattr(item, "callspec", None) and item.callspec.params.get("n")
+        (deselected if n and n > max_places else selected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import random
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.menu_lexicon import build_menu_lexicon, get_menu_trie
+from backend.menu_recommender import MenuRecommender
+
+# Benchmark: dish extraction from title + description with the menu dictionary trie.
+# Must stay cheap enough to run over every place on each fetch.
+
+NUM_PLACES = [50, 1000, 10000]
+
+PREFIXES = ["시골", "마포", "원조", "할매", "역삼", "강남", "옛날", "명동", "본가", "신촌"]
+FILLER = ["맛있는", "점심", "혼밥", "가성비", "웨이팅", "친절한", "분위기", "깔끔한", "푸짐한", "직장인"]
+BROAD = ["한식", "중식", "일식", "양식", "분식"]
+
+
+def make_places(rng, n, dishes):
+    places = []
+    for _ in range(n):
+        dish = rng.choice(dishes)
+        places.append({
+            "title": f"<b>{rng.choice(PREFIXES)}{dish}</b>",
+            "category": f"{rng.choice(BROAD)}>{rng.choice(dishes)}",
+            "description": " ".join(rng.choice(FILLER + dishes) for _ in range(12)),
+        })
+    return places
+
+
+def main():
+    rng = random.Random(7)
+    dishes = sorted(build_menu_lexicon())
+
+    t0 = time.perf_counter()
+    get_menu_trie.cache_clear()
+    trie = get_menu_trie()
+    print(f"--- Menu dictionary: {len(trie)} dishes, trie compiled in {(time.perf_counter() - t0) * 1000:.1f} ms ---")
+
+    rec = MenuRecommender()
+    for n in NUM_PLACES:
+        places = make_places(rng, n, dishes)
+
+        t0 = time.perf_counter()
+        for place in places:
+            trie.extract(place["title"])
+            trie.extract(place["description"])
+        trie_only = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        rec.extract_top_menus(places)
+        total = time.perf_counter() - t0
+
+        print(f"  {n:>6} places: trie extraction {trie_only * 1000:8.1f} ms | "
+              f"extract_top_menus total {total * 1000:8.1f} ms ({total / n * 1e6:.0f} us/place)")
+
+
+if __name__ == "__main__":
+    main()
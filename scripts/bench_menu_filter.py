@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import random
+import re
+from collections import Counter
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.menu_recommender import MenuRecommender
+
+# Benchmark: dislike filtering + favorite boosting at scale
+# Old approach: any(bad in part for bad in dislikes) per fragment, any(fav in key ...) per key
+# New approach: preference sets compiled into a cached Aho-Corasick automaton
+
+NUM_PLACES = 5000
+NUM_PREFS = 300
+
+SYLLABLES = list("김치찌개된장국밥갈비곱창족발보쌈냉면칼국수짜장짬뽕탕수육마라양꼬치초밥라멘우동돈까스파스타피자버거샐러드쌀국수카레떡볶이")
+BROAD = ["한식", "중식", "일식", "양식", "분식", "아시아음식"]
+
+
+def random_word(rng, lo=2, hi=4):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(lo, hi)))
+
+
+def make_places(rng, n):
+    dishes = [random_word(rng) for _ in range(800)]
+    places = []
+    for _ in range(n):
+        places.append({
+            "title": random_word(rng, 3, 6),
+            "category": f"{rng.choice(BROAD)}>{rng.choice(dishes)},{rng.choice(dishes)}",
+            "description": " ".join(random_word(rng) for _ in range(5)),
+        })
+    return places
+
+
+def naive_filter_and_boost(places, dislikes, favorites):
+    """Baseline: the original nested any() scans."""
+    stop_words = MenuRecommender().stop_words
+    keywords = []
+    for place in places:
+        for part in re.split(r'[>,]', place.get('category', '')):
+            clean_part = part.strip()
+            if any(bad in clean_part for bad in dislikes):
+                continue
+            if len(clean_part) > 1 and clean_part not in stop_words:
+                keywords.append(clean_part)
+    counter = Counter(keywords)
+    for key in counter:
+        if any(fav in key for fav in favorites):
+            counter[key] *= 3
+    return counter
+
+
+def timed(label, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    print(f"  {label:<40} {best * 1000:8.1f} ms")
+    return best
+
+
+def main():
+    rng = random.Random(42)
+    places = make_places(rng, NUM_PLACES)
+    dislikes = [random_word(rng, 2, 3) for _ in range(NUM_PREFS)]
+    favorites = [random_word(rng, 2, 3) for _ in range(NUM_PREFS)]
+
+    print(f"--- Menu filter benchmark: {NUM_PLACES} places, {NUM_PREFS} dislikes + {NUM_PREFS} favorites ---")
+    naive = timed("naive any() scans", lambda: naive_filter_and_boost(places, dislikes, favorites))
+
+    rec = MenuRecommender()
+    # First call compiles the automata, later calls hit the per-preference-set cache
+    timed("automaton (cold compile)", lambda: rec.extract_top_menus(places, dislikes=dislikes, favorites=favorites), repeat=1)
+    fast = timed("automaton (warm)", lambda: rec.extract_top_menus(places, dislikes=dislikes, favorites=favorites))
+
+    print(f"  Speedup (note: warm run also builds the inverted menu index): {naive / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import random
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.geo_utils import GridIndex, calculate_distances
+
+# Benchmark: grid spatial index vs. linear scan over 100k cached places around Seoul
+
+NUM_PLACES = 100000
+NUM_QUERIES = 200
+
+# Lunch hotspots: most places cluster around stations, the rest is spread over the city
+HOTSPOTS = [(37.4979, 127.0276), (37.5216, 126.9242), (37.5446, 127.0557), (37.5660, 126.9826), (37.3948, 127.1112)]
+
+
+def make_places(rng, n):
+    places = []
+    for i in range(n):
+        if rng.random() < 0.7:
+            lat, lon = rng.choice(HOTSPOTS)
+            lat += rng.gauss(0, 0.006)
+            lon += rng.gauss(0, 0.008)
+        else:
+            lat = 37.40 + rng.random() * 0.30
+            lon = 126.80 + rng.random() * 0.40
+        places.append({"title": f"식당{i}", "mapx": str(int(lon * 1e7)), "mapy": str(int(lat * 1e7))})
+    return places
+
+
+def main():
+    rng = random.Random(3)
+    places = make_places(rng, NUM_PLACES)
+    queries = [(lat + rng.gauss(0, 0.003), lon + rng.gauss(0, 0.003)) for lat, lon in
+               (rng.choice(HOTSPOTS) for _ in range(NUM_QUERIES))]
+
+    print(f"--- Spatial index benchmark: {NUM_PLACES} places, {NUM_QUERIES} queries ---")
+
+    t0 = time.perf_counter()
+    index = GridIndex()
+    index.add_many(places)
+    print(f"  build (incremental inserts)       {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+    t0 = time.perf_counter()
+    for lat, lon in queries[:20]:
+        dists = calculate_distances(lat, lon, places)
+        [p for p, d in zip(places, dists) if d <= 1000]
+    linear = (time.perf_counter() - t0) / 20
+    print(f"  linear scan, radius 1km (numpy)   {linear * 1000:9.2f} ms/query")
+
+    for radius in (500, 1000, 2000):
+        t0 = time.perf_counter()
+        total = 0
+        for lat, lon in queries:
+            total += len(index.query_radius(lat, lon, radius))
+        per_query = (time.perf_counter() - t0) / NUM_QUERIES
+        print(f"  grid radius {radius:>4}m                 {per_query * 1000:9.2f} ms/query (avg {total // NUM_QUERIES} hits)")
+
+    for k in (10, 50):
+        t0 = time.perf_counter()
+        for lat, lon in queries:
+            index.nearest(lat, lon, k)
+        per_query = (time.perf_counter() - t0) / NUM_QUERIES
+        print(f"  grid {k:>2}-nearest                    {per_query * 1000:9.2f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import subprocess
+
+# Add project root to path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+# Startup benchmark: what `import app` costs on top of Streamlit itself, measured with `python -X importtime`.
+# Streamlit is already loaded by the server before the script runs, so it is imported first and excluded.
+# Usage: python scripts/bench_startup.py [--runs N] [--top N]
+# Exits with 1 when the budget in docs/PERFORMANCE.md is exceeded or a lazy dependency leaks into startup.
+
+APP_IMPORT_BUDGET_MS = 400
+# Heavy dependencies that must only be imported at first use
+LAZY_MODULES = ["folium", "branca", "streamlit_folium", "streamlit_js_eval", "geopy", "pandas", "pyproj"]
+
+
+def measure_once():
+    """Run one cold interpreter and return [(self_us, cumulative_us, depth, module)] for modules app pulled in."""
+    env = dict(os.environ, NAVER_CLIENT_ID="", NAVER_CLIENT_SECRET="")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import streamlit; import app"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cum_us), depth, name.strip()))
+
+    # importtime prints in post-order: everything after top-level streamlit belongs to app
+    start = max(i for i, r in enumerate(rows) if r[2] == 0 and r[3] == "streamlit") + 1
+    return rows[start:]
+
+
+def main():
+    runs = int(sys.argv[sys.argv.index("--runs") + 1]) if "--runs" in sys.argv else 5
+    top = int(sys.argv[sys.argv.index("--top") + 1]) if "--top" in sys.argv else 12
+
+    samples = []
+    for _ in range(runs):
+        rows = measure_once()
+        total_ms = next(r[1] for r in rows if r[2] == 0 and r[3] == "app") / 1000
+        samples.append((total_ms, rows))
+    samples.sort(key=lambda s: s[0])
+    totals = [total for total, _ in samples]
+    median, rows = samples[len(samples) // 2]
+
+    print(f"--- Startup: import app (after streamlit), {runs} cold runs ---")
+    print(f"  median {median:7.1f} ms | min {totals[0]:7.1f} ms | max {totals[-1]:7.1f} ms | budget {APP_IMPORT_BUDGET_MS} ms")
+
+    # Heaviest top-level packages from the median run
+    packages = {}
+    for self_us, cum_us, depth, name in rows:
+        pkg = name.split(".")[0]
+        packages[pkg] = packages.get(pkg, 0) + self_us
+    print("  heaviest packages (self time):")
+    for pkg, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {pkg:<28} {us / 1000:7.1f} ms")
+
+    loaded = {name.split(".")[0] for _, _, _, name in rows}
+    leaked = [m for m in LAZY_MODULES if m in loaded]
+
+    ok = True
+    if leaked:
+        print(f"  FAIL: lazy dependencies imported at startup: {', '.join(leaked)}")
+        ok = False
+    if median > APP_IMPORT_BUDGET_MS:
+        print(f"  FAIL: app import {median:.1f} ms exceeds the {APP_IMPORT_BUDGET_MS} ms budget")
+        ok = False
+    if ok:
+        print("  OK")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
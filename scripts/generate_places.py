@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import argparse
+
+# Add project root to path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from backend.synthetic import CHAIN_RATIO, DUPLICATE_RATIO, SyntheticPlaceGenerator, write_jsonl
+
+# Streams synthetic Naver-shaped places to a JSON Lines file (constant memory, any size).
+# Usage:
+#   python scripts/generate_places.py -n 100000 -o data/places.jsonl
+#   python scripts/generate_places.py -n 5000000 -o data/places.jsonl.gz --seed 7
+#   python scripts/generate_places.py -n 20 -o -          # print to stdout
+# Serve the file with the local API stand-in:
+#   python -m backend.stub_server --dataset data/places.jsonl
+
+PROGRESS_EVERY = 100000
+
+
+def with_progress(items, total):
+    start = time.time()
+    for i, item in enumerate(items, 1):
+        if i % PROGRESS_EVERY == 0 or i == total:
+            rate = i / max(time.time() - start, 1e-9)
+            print(f"  {i:,}/{total:,} items ({rate:,.0f}/s)", file=sys.stderr)
+        yield item
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Naver Local Search items")
+    parser.add_argument("-n", "--count", type=int, default=10000, help="number of items")
+    parser.add_argument("-o", "--output", default="places.jsonl", help="output path (.gz = gzip, - = stdout)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chain-ratio", type=float, default=CHAIN_RATIO, help="share of chain branches")
+    parser.add_argument("--duplicate-ratio", type=float, default=DUPLICATE_RATIO,
+                        help="share of exact repeats (same place from several sub-queries)")
+    args = parser.parse_args()
+
+    gen = SyntheticPlaceGenerator(seed=args.seed, chain_ratio=args.chain_ratio, duplicate_ratio=args.duplicate_ratio)
+    items = gen.iter_items(args.count)
+
+    if args.output == "-":
+        import json
+        for item in items:
+            print(json.dumps(item, ensure_ascii=False))
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    start = time.time()
+    count = write_jsonl(args.output, with_progress(items, args.count))
+    size_mb = os.path.getsize(args.output) / 1e6
+    print(f"✅ Wrote {count:,} items to {args.output} ({size_mb:.1f}MB, {time.time() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
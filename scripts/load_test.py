@@ -0,0 +1,332 @@
+import os
+import sys
+import io
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import contextlib
+from collections import OrderedDict
+
+# Add project root to path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from backend import metrics
+from backend.data import DataProcessor
+from backend.db_manager import DatabaseManager
+from backend.gazetteer import STATIONS
+from backend.geo_utils import place_key
+from backend.map_view import render_map_html
+from backend.menu_recommender import MenuRecommender
+from backend.naver_api import NaverPlaceAPI
+from backend.pipeline import fetch_place_items, recommend_from_items
+from backend.stub_server import StubNaverServer
+from backend.synthetic import HUB_STATIONS, SyntheticPlaceGenerator
+from backend.user_prefs import UserPreferences
+
+# Lunch-rush load test: N concurrent simulated users run the app's backend flow
+# (location pick -> fetch -> process/radius/menus -> preferences -> chip click -> map)
+# against the local Naver stand-in, sharing one API/processor/DB like one Streamlit worker.
+# Usage:
+#   python scripts/load_test.py --users 50 --duration 60 --ramp-up 20
+#   python scripts/load_test.py --stages 10:30,50:30,100:30,200:30   # step profile (users:seconds)
+#   python scripts/load_test.py --users 20 --duration 30 --json report.json
+# Reports p50/p95/p99 per step and per stage, throughput, Naver API calls per user and RSS growth.
+
+# Same settings as app.py
+RADIUS_LADDER = (500, 1000, 2000)
+MIN_PLACES_IN_RADIUS = 1
+COORDS_DECIMALS = 3
+MAP_CACHE_ENTRIES = 32
+TOP_MENUS = 15
+
+STEPS = ["fetch", "pipeline", "prefs", "chip", "map", "flow"]
+RSS_SAMPLE_INTERVAL = 0.5
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list (None if empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(p / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def parse_stages(spec):
+    """'10:30,50:60' -> [(10, 30.0), (50, 60.0)] (concurrent users, seconds)."""
+    stages = []
+    for part in spec.split(","):
+        users, seconds = part.split(":")
+        stages.append((int(users), float(seconds)))
+    return stages
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux /proc, else peak RSS from getrusage)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+class SharedCache:
+    """
+    Stand-in for st.cache_resource / st.cache_data: shared across users, LRU-bounded,
+    one computation per key at a time (Streamlit also locks per key).
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get_or_compute(self, key, fn):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._data:
+                    return self._data[key]
+            value = fn()
+            with self._lock:
+                self._data[key] = value
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                self._key_locks.pop(key, None)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class LunchRush:
+    """Runs user threads through the app flow and records step latencies per stage."""
+
+    def __init__(self, api, processor, db, locations, think_time=1.0, refresh_ratio=0.05, seed=0):
+        self.api = api
+        self.processor = processor
+        self.db = db
+        self.locations = locations
+        self.think_time = think_time
+        self.refresh_ratio = refresh_ratio
+        self.seed = seed
+        self.pipelines = SharedCache(64)
+        self.maps = SharedCache(MAP_CACHE_ENTRIES)
+        self.samples = []  # (stage, step, seconds)
+        self.errors = []   # (stage, message)
+        self.stage = 0
+        self._lock = threading.Lock()
+        self._users = []   # (thread, stop event)
+
+    def _record(self, step, seconds):
+        with self._lock:
+            self.samples.append((self.stage, step, seconds))
+
+    def _timed(self, step, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self._record(step, time.perf_counter() - start)
+        return result
+
+    def flow(self, user_id, rng):
+        """One lunch decision: what a user triggers from picking a location to seeing the map."""
+        start = time.perf_counter()
+        name, lat, lng = rng.choice(self.locations)
+        coords = (round(lat + rng.gauss(0, 0.002), COORDS_DECIMALS), round(lng + rng.gauss(0, 0.002), COORDS_DECIMALS))
+        query = f"{name} 맛집"
+        mode = "random" if rng.random() < 0.2 else "popular"
+        force_refresh = rng.random() < self.refresh_ratio
+
+        def pipeline():
+            items = self._timed("fetch", fetch_place_items, self.api, query, mode, coords, force_refresh)
+            return self._timed("pipeline", recommend_from_items, items, self.processor, coords,
+                               ladder=RADIUS_LADDER, min_count=MIN_PLACES_IN_RADIUS)
+
+        if force_refresh:
+            self.pipelines.clear()
+        result = self.pipelines.get_or_compute((query, mode, coords), pipeline)
+
+        def personalize():
+            prefs = UserPreferences(user_id, db=self.db, legacy_path=None)
+            if rng.random() < 0.1:
+                prefs.save_preferences(rng.sample(["오이", "고수", "마라", "회"], 1), rng.sample(["고기", "초밥"], 1))
+            recommender = result["recommender"].with_preferences(prefs.get_dislikes(), prefs.get_favorites())
+            return recommender, recommender.sample_menus(TOP_MENUS)
+
+        recommender, top_menus = self._timed("prefs", personalize)
+        if top_menus:
+            menu = rng.choice(top_menus)
+            matched = self._timed("chip", MenuRecommender.lookup_places, menu, result["places"], recommender.menu_index)
+            if matched:
+                place_ids = tuple(place_key(p) for p in matched)
+                self._timed("map", self.maps.get_or_compute, (menu, place_ids), lambda: render_map_html(matched))
+        self._record("flow", time.perf_counter() - start)
+
+    def _user_loop(self, index, stop):
+        rng = random.Random(self.seed * 100003 + index)
+        user_id = f"load{index:05d}"
+        while not stop.is_set():
+            try:
+                self.flow(user_id, rng)
+            except Exception as e:
+                with self._lock:
+                    self.errors.append((self.stage, f"{type(e).__name__}: {e}"))
+            stop.wait(rng.expovariate(1.0 / self.think_time) if self.think_time > 0 else 0)
+
+    def scale_to(self, users, ramp_up, deadline):
+        """Start (spread over ramp_up seconds) or stop user threads until `users` are running."""
+        while len(self._users) > users:
+            thread, stop = self._users.pop()
+            stop.set()
+        new = users - len(self._users)
+        for i in range(new):
+            stop = threading.Event()
+            thread = threading.Thread(target=self._user_loop, args=(len(self._users), stop), daemon=True)
+            self._users.append((thread, stop))
+            thread.start()
+            if ramp_up and i < new - 1:
+                time.sleep(min(ramp_up / new, max(0.0, deadline - time.time())))
+
+    def stop_all(self):
+        for _, stop in self._users:
+            stop.set()
+        for thread, _ in self._users:
+            thread.join(timeout=30)
+        self._users = []
+
+
+def summarize(samples, steps=STEPS):
+    rows = {}
+    for step in steps:
+        values = sorted(s for _, st, s in samples if st == step)
+        if values:
+            rows[step] = {
+                "count": len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent lunch-rush load test against the local Naver stub")
+    parser.add_argument("--users", type=int, default=20, help="concurrent users (single stage)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds (single stage)")
+    parser.add_argument("--stages", help="ramp profile 'users:seconds,...' (overrides --users/--duration)")
+    parser.add_argument("--ramp-up", type=float, default=5, help="seconds to start each stage's new users")
+    parser.add_argument("--think", type=float, default=1.0, help="mean think time between flows (s)")
+    parser.add_argument("--locations", type=int, default=20, help="distinct stations users search around")
+    parser.add_argument("--refresh-ratio", type=float, default=0.02, help="share of flows pressing 'refresh'")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub API latency per request (s)")
+    parser.add_argument("--places", type=int, default=50000, help="synthetic places served by the stub")
+    parser.add_argument("--db", help="SQLite file (default: a fresh temporary DB)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the full report to this file")
+    parser.add_argument("--verbose", action="store_true", help="keep the pipeline's print output")
+    args = parser.parse_args()
+
+    stages = parse_stages(args.stages) if args.stages else [(args.users, args.duration)]
+    # Hubs first: that's where the lunch rush is
+    stations = sorted(STATIONS, key=lambda s: s[0] not in HUB_STATIONS)[:max(1, args.locations)]
+
+    print(f"Generating {args.places:,} synthetic places...")
+    dataset = list(SyntheticPlaceGenerator(seed=args.seed).iter_items(args.places))
+    tmpdir = tempfile.TemporaryDirectory()
+    db = DatabaseManager(args.db or os.path.join(tmpdir.name, "load_test.db"))
+
+    metrics.reset()
+    metrics.enable()
+    rss = {"start": rss_mb(), "peak": 0.0}
+    stage_rows = []
+
+    with StubNaverServer(latency=args.latency, dataset=dataset) as stub:
+        api = NaverPlaceAPI("load", "test", base_url=stub.base_url, db=db, usage_log=None)
+        rush = LunchRush(api, DataProcessor(db=db), db, stations, think_time=args.think,
+                         refresh_ratio=args.refresh_ratio, seed=args.seed)
+        rss["start"] = rss_mb()
+        out = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        print(f"Running {' -> '.join(f'{u} users x {s:g}s' for u, s in stages)} "
+              f"(stub latency {args.latency * 1000:.0f}ms, {len(stations)} locations)")
+
+        for index, (users, seconds) in enumerate(stages):
+            rush.stage = index
+            calls_before = stub.calls
+            started = time.time()
+            deadline = started + seconds
+            with out:
+                rush.scale_to(users, args.ramp_up, deadline)
+                while time.time() < deadline:
+                    rss["peak"] = max(rss["peak"], rss_mb())
+                    time.sleep(min(RSS_SAMPLE_INTERVAL, max(0.0, deadline - time.time())))
+            flows = sorted(s for st, step, s in rush.samples if st == index and step == "flow")
+            elapsed = time.time() - started
+            stage_rows.append({
+                "users": users, "seconds": round(elapsed, 1), "flows": len(flows),
+                "flows_per_s": len(flows) / elapsed if elapsed else 0.0,
+                "p50_ms": (percentile(flows, 50) or 0) * 1000, "p95_ms": (percentile(flows, 95) or 0) * 1000,
+                "p99_ms": (percentile(flows, 99) or 0) * 1000,
+                "api_calls": stub.calls - calls_before,
+                "errors": sum(1 for st, _ in rush.errors if st == index),
+                "rss_mb": rss_mb(),
+            })
+            row = stage_rows[-1]
+            print(f"  stage {index + 1}: {users:>4} users  {row['flows']:>6} flows  {row['flows_per_s']:7.1f}/s  "
+                  f"p50 {row['p50_ms']:7.0f}ms  p95 {row['p95_ms']:7.0f}ms  p99 {row['p99_ms']:7.0f}ms  "
+                  f"api {row['api_calls']:>6}  err {row['errors']}  rss {row['rss_mb']:.0f}MB")
+        with out:
+            rush.stop_all()
+        total_calls = stub.calls
+
+    rss["end"] = rss_mb()
+    total_users = max(users for users, _ in stages)
+    total_flows = sum(row["flows"] for row in stage_rows)
+    steps = summarize(rush.samples)
+    report = {
+        "stages": stage_rows,
+        "steps": steps,
+        "api_calls": total_calls,
+        "api_calls_per_user": total_calls / total_users,
+        "api_calls_per_flow": total_calls / total_flows if total_flows else None,
+        "cache_hit_ratios": metrics.hit_ratios(),
+        "errors": len(rush.errors),
+        "rss_mb": {"start": rss["start"], "peak": max(rss["peak"], rss["end"]), "end": rss["end"],
+                   "growth": rss["end"] - rss["start"]},
+    }
+    metrics.enable(False)
+
+    print("\nStep latency (all stages)")
+    print(f"  {'step':<10}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for step, row in steps.items():
+        print(f"  {step:<10}{row['count']:>8}{row['p50_ms']:>8.1f}ms{row['p95_ms']:>8.1f}ms"
+              f"{row['p99_ms']:>8.1f}ms{row['max_ms']:>8.1f}ms")
+    print(f"\nNaver API calls: {total_calls} ({report['api_calls_per_user']:.1f}/user, "
+          f"{report['api_calls_per_flow'] or 0:.2f}/flow)")
+    print("Cache hit ratio: " + ", ".join(f"{k} {v:.0%}" for k, v in sorted(report["cache_hit_ratios"].items())))
+    r = report["rss_mb"]
+    print(f"RSS: {r['start']:.0f}MB -> peak {r['peak']:.0f}MB -> {r['end']:.0f}MB (+{r['growth']:.0f}MB)")
+    if rush.errors:
+        print(f"❌ {len(rush.errors)} errors, first: {rush.errors[0][1]}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Report written to {args.json}")
+    tmpdir.cleanup()
+    return 1 if rush.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
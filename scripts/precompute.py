@@ -0,0 +1,201 @@
+import math
+import os
+import sys
+import time
+import argparse
+import concurrent.futures
+
+# Add project root to path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from dotenv import load_dotenv
+
+from backend.data import DataProcessor
+from backend.db_manager import DatabaseManager
+from backend.gazetteer import STATIONS
+from backend.geo_utils import get_address_from_coords
+from backend.naver_api import NaverPlaceAPI
+from backend.pipeline import fetch_place_items, recommend_from_items
+from backend.rate_limiter import TokenBucket
+from backend.snapshot import SnapshotWriter, make_entry, snapshot_key
+
+# Precomputes recommendations for many locations into a snapshot the app loads at startup
+# (LUNCH_SNAPSHOT=snapshot.jsonl.gz). Naver fetches run on threads behind one token bucket;
+# process -> radius -> menu extraction runs in a process pool. Re-running resumes.
+# Usage:
+#   python scripts/precompute.py --locations 강남역,역삼역,선릉역 -o snapshot.jsonl.gz
+#   python scripts/precompute.py --stations -o snapshot.jsonl.gz --rate 10
+#   python scripts/precompute.py --grid 37.49,127.02,37.51,127.05 --step-m 500 -o snapshot.jsonl.gz
+#   python scripts/precompute.py --file locations.txt --modes popular,random -o snapshot.jsonl.gz
+# locations.txt: one "name" or "name,lat,lng" per line.
+
+# Same values as app.py, so snapshot keys match the app's searches
+RADIUS_LADDER = (500, 1000, 2000)
+MIN_PLACES_IN_RADIUS = 1
+COORDS_DECIMALS = 3
+
+_PROCESSOR = None
+
+
+def _init_worker(db_path):
+    global _PROCESSOR
+    # Each process opens its own connection; the NLP memo is shared through the DB file
+    _PROCESSOR = DataProcessor(db=DatabaseManager(db_path))
+
+
+def _process(job, items):
+    query, mode, coords, grid_step_m = job
+    result = recommend_from_items(items, _PROCESSOR, coords, ladder=RADIUS_LADDER, min_count=MIN_PLACES_IN_RADIUS)
+    return make_entry(query, mode, coords, result["radius"], result["places"], result["recommender"],
+                      grid_step_m=grid_step_m)
+
+
+def grid_points(lat1, lng1, lat2, lng2, step_m):
+    """Coordinates every step_m meters over the bounding box."""
+    lat_step = step_m / 111320.0
+    lng_step = step_m / (111320.0 * math.cos(math.radians((lat1 + lat2) / 2)))
+    lat = min(lat1, lat2)
+    while lat <= max(lat1, lat2) + 1e-9:
+        lng = min(lng1, lng2)
+        while lng <= max(lng1, lng2) + 1e-9:
+            yield lat, lng
+            lng += lng_step
+        lat += lat_step
+
+
+def build_jobs(args):
+    """[(query, mode, coords, grid_step_m)] from --locations / --file / --stations / --grid."""
+    locations = []  # (name, coords or None, grid step or None)
+    if args.locations:
+        locations += [(name.strip(), None, None) for name in args.locations.split(",") if name.strip()]
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            for line in f:
+                parts = [p.strip() for p in line.split(",")]
+                if not parts[0] or parts[0].startswith("#"):
+                    continue
+                coords = (float(parts[1]), float(parts[2])) if len(parts) >= 3 else None
+                locations.append((parts[0], coords, None))
+    if args.stations:
+        # Typed locations: the app searches them without coordinates
+        locations += [(name, None, None) for name, lat, lng in STATIONS]
+    if args.grid:
+        lat1, lng1, lat2, lng2 = (float(v) for v in args.grid.split(","))
+        geocode_db = DatabaseManager(args.db)
+        for lat, lng in grid_points(lat1, lng1, lat2, lng2, args.step_m):
+            # Named exactly like the app names a GPS fix, so the queries match
+            name = get_address_from_coords(lat, lng, db=geocode_db)
+            if name:
+                locations.append((name, (lat, lng), args.step_m))
+            else:
+                print(f"  skip ({lat:.4f}, {lng:.4f}): no location name")
+
+    jobs, seen = [], set()
+    for name, coords, grid_step_m in locations:
+        if coords:
+            coords = (round(coords[0], COORDS_DECIMALS), round(coords[1], COORDS_DECIMALS))
+        for mode in args.modes.split(","):
+            job = (f"{name} 맛집", mode, coords, grid_step_m)
+            if job[:3] not in seen:
+                seen.add(job[:3])
+                jobs.append(job)
+    return jobs
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Precompute recommendations for many locations")
+    parser.add_argument("-o", "--output", default="snapshot.jsonl.gz", help="snapshot file (.gz = gzip)")
+    parser.add_argument("--locations", help="comma-separated location names (e.g. 강남역,역삼역)")
+    parser.add_argument("--file", help="file with one 'name' or 'name,lat,lng' per line")
+    parser.add_argument("--stations", action="store_true", help="every station of the offline gazetteer")
+    parser.add_argument("--grid", help="bounding box 'lat1,lng1,lat2,lng2' for GPS users (named like the app names a GPS fix)")
+    parser.add_argument("--step-m", type=float, default=500, help="grid spacing in meters")
+    parser.add_argument("--modes", default="popular", help="comma-separated search modes (popular,random)")
+    parser.add_argument("--rate", type=float, default=10, help="Naver API calls per second (shared bucket)")
+    parser.add_argument("--burst", type=float, default=20, help="token bucket size")
+    parser.add_argument("--io-workers", type=int, default=4, help="locations fetched at once")
+    parser.add_argument("--cpu-workers", type=int, default=os.cpu_count() or 1, help="processes for CPU stages")
+    parser.add_argument("--db", default="restaurant.db", help="SQLite cache shared with the app")
+    parser.add_argument("--force-refresh", action="store_true", help="ignore the search cache")
+    parser.add_argument("--no-resume", action="store_true", help="start a new snapshot instead of resuming")
+    args = parser.parse_args()
+
+    jobs = build_jobs(args)
+    if not jobs:
+        parser.error("no locations: use --locations, --file, --stations or --grid")
+
+    client_id, client_secret = os.getenv("NAVER_CLIENT_ID"), os.getenv("NAVER_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        print("⚠️ NAVER_CLIENT_ID / NAVER_CLIENT_SECRET not set: only cached searches will return places")
+
+    limiter = TokenBucket(args.rate, args.burst)
+    api = NaverPlaceAPI(client_id, client_secret, db=DatabaseManager(args.db), rate_limiter=limiter)
+
+    with SnapshotWriter(args.output, resume=not args.no_resume) as writer:
+        todo = [job for job in jobs if snapshot_key(*job[:3]) not in writer.done]
+        print(f"🗂️ {len(jobs)} searches, {len(jobs) - len(todo)} already in {args.output}, {len(todo)} to go")
+        start = time.time()
+        done = failed = 0
+
+        def report(job, error=None):
+            elapsed = time.time() - start
+            eta = elapsed / (done + failed) * (len(todo) - done - failed) if done + failed else 0
+            status = f"❌ {error}" if error else "✅"
+            print(f"  [{done + failed}/{len(todo)}] {status} {job[0]} ({job[1]}) "
+                  f"{elapsed:.0f}s elapsed, ETA {eta:.0f}s, throttled {limiter.waited:.0f} thread-s")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.io_workers) as io_pool, \
+                concurrent.futures.ProcessPoolExecutor(max_workers=args.cpu_workers, initializer=_init_worker,
+                                                       initargs=(args.db,)) as cpu_pool:
+            # Stage 1 (threads, rate-limited I/O) feeds stage 2 (processes, CPU) as fetches finish
+            fetches = {
+                io_pool.submit(fetch_place_items, api, job[0], job[1], job[2], args.force_refresh): job
+                for job in todo
+            }
+            processing = {}
+            pending = set(fetches)
+            while pending:
+                finished, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    if future in fetches:
+                        job = fetches.pop(future)
+                        try:
+                            items = future.result()
+                        except Exception as e:
+                            failed += 1
+                            report(job, f"fetch: {e}")
+                            continue
+                        if not items:
+                            # No keys, API errors or an exhausted quota: leave it for the next run
+                            failed += 1
+                            report(job, "fetch: no places")
+                            continue
+                        next_future = cpu_pool.submit(_process, job, items)
+                        processing[next_future] = job
+                        pending.add(next_future)
+                    else:
+                        job = processing.pop(future)
+                        try:
+                            entry = future.result()
+                        except Exception as e:
+                            failed += 1
+                            report(job, f"process: {e}")
+                            continue
+                        if not entry["places"]:
+                            failed += 1
+                            report(job, "process: no places")
+                            continue
+                        # Written as soon as it's done: an interrupted run keeps everything finished so far
+                        writer.write(entry)
+                        done += 1
+                        report(job)
+
+    size_mb = os.path.getsize(args.output) / 1e6
+    print(f"✅ {done} written, {failed} failed, {len(writer.done)} searches in {args.output} ({size_mb:.1f}MB)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
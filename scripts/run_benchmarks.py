@@ -0,0 +1,57 @@
+import os
+import sys
+import glob
+import argparse
+import platform
+import subprocess
+
+# Add project root to path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+# Runs the pytest-benchmark suite in benchmarks/ and compares it with the stored baseline.
+# Usage:
+#   python scripts/run_benchmarks.py                    # compare with the latest baseline (saves one if none exists)
+#   python scripts/run_benchmarks.py --save-baseline    # record a new baseline for this machine
+#   python scripts/run_benchmarks.py --max-places 5000  # quick run without the 500k scale
+# Exits non-zero when a benchmark's min time regresses past the threshold.
+
+# Generous default: sub-millisecond cases jitter by up to ~40% on shared CI containers
+REGRESSION_THRESHOLD = "min:50%"
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+
+
+def machine_dir():
+    # Same layout pytest-benchmark uses: <system>-<implementation>-<major.minor>-<bits>
+    impl = platform.python_implementation()
+    version = ".".join(platform.python_version_tuple()[:2])
+    bits = platform.architecture()[0]
+    return os.path.join(BASELINE_DIR, f"{platform.system()}-{impl}-{version}-{bits}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline benchmark suite with regression check")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--max-places", type=int, default=None, help="skip scales above this many places")
+    parser.add_argument("--threshold", default=REGRESSION_THRESHOLD, help="pytest-benchmark compare-fail expression")
+    parser.add_argument("pytest_args", nargs="*", help="extra arguments for pytest (after --)")
+    args = parser.parse_args()
+
+    cmd = [sys.executable, "-m", "pytest", "benchmarks", "-q", "-p", "no:cacheprovider"]
+    if args.max_places:
+        cmd += ["--max-places", str(args.max_places)]
+
+    baselines = sorted(glob.glob(os.path.join(machine_dir(), "*_baseline.json")))
+    if args.save_baseline or not baselines:
+        print("Recording baseline" + ("" if baselines else " (none found for this machine)"))
+        cmd += ["--benchmark-save=baseline"]
+    else:
+        run_id = os.path.basename(baselines[-1]).split("_")[0]
+        print(f"Comparing with baseline {os.path.basename(baselines[-1])} (fail on {args.threshold})")
+        cmd += [f"--benchmark-compare={run_id}", f"--benchmark-compare-fail={args.threshold}"]
+
+    sys.exit(subprocess.call(cmd + args.pytest_args, cwd=ROOT))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from backend.geo_utils import calculate_distance, katech_to_wgs84
 # Real Gangnam Station: 37.498, 127.027
 # Let's check what 314000, 544000 maps to.
 
-# Test multiple projections
+# Test multiple projections (pyproj is not an app dependency: pip install pyproj)
 from pyproj import Transformer
 
 projections = {
@@ -1,31 +1,34 @@
 
 import os
 import sys
-import shutil
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from backend.user_prefs import UserPreferences
+from backend.user_prefs import UserPreferences, clear_cache
+from backend.db_manager import DatabaseManager
 from backend.menu_recommender import MenuRecommender
 
 def test_user_prefs():
     print("Testing UserPreferences...")
-    test_file = "test_prefs.json"
-    prefs = UserPreferences(test_file)
+    test_db = "test_prefs.db"
+    prefs = UserPreferences("tester", db=DatabaseManager(test_db))
     
     # Test Save
     prefs.save_preferences(["cucumber"], ["meat"])
     
-    # Reload
-    prefs2 = UserPreferences(test_file)
+    # Reload (bypass the in-process cache to read from SQLite)
+    clear_cache()
+    prefs2 = UserPreferences("tester", db=DatabaseManager(test_db))
     assert "cucumber" in prefs2.get_dislikes()
     assert "meat" in prefs2.get_favorites()
+    assert prefs2.version == 1
     print("✅ Persistence works.")
     
     # Cleanup
-    if os.path.exists(test_file):
-        os.remove(test_file)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(test_db + suffix):
+            os.remove(test_db + suffix)
 
 def test_recommender():
     print("Testing MenuRecommender...")
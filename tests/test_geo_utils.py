@@ -54,3 +54,125 @@ def test_calculate_distance_invalid_target():
     
     dist = calculate_distance(lat1, lon1, None, None)
     assert dist == 999999
+
+def test_calculate_distances_matches_scalar_version():
+    from backend.geo_utils import calculate_distances, INVALID_DISTANCE
+
+    places = [
+        {"mapx": "1270292507", "mapy": "374997698"},
+        {"mapx": None, "mapy": None},
+        {"mapx": "300000", "mapy": "500000"},
+        {},
+    ]
+    dists = calculate_distances(37.4979, 127.0276, places)
+
+    assert len(dists) == 4
+    assert abs(dists[0] - calculate_distance(37.4979, 127.0276, "1270292507", "374997698")) < 2
+    assert list(dists[1:]) == [INVALID_DISTANCE] * 3
+
+def test_haversine_accuracy_against_geodesic_at_city_scale():
+    import random
+    import numpy as np
+    from geopy.distance import geodesic
+    from backend.geo_utils import haversine_distances
+
+    rng = random.Random(0)
+    lat1, lon1 = 37.5665, 126.9780  # Seoul City Hall
+    lats = [lat1 + rng.uniform(-0.2, 0.2) for _ in range(200)]
+    lons = [lon1 + rng.uniform(-0.25, 0.25) for _ in range(200)]
+
+    fast = haversine_distances(lat1, lon1, np.array(lats), np.array(lons))
+    for d, lat, lon in zip(fast, lats, lons):
+        exact = geodesic((lat1, lon1), (lat, lon)).meters
+        assert abs(d - exact) <= max(0.005 * exact, 1.0)
+        if exact < 2000:
+            assert abs(d - exact) < 10
+
+def test_select_radius_picks_smallest_rung_nearest_first():
+    from backend.geo_utils import select_radius
+
+    lat, lon = 37.4979, 127.0276
+    # Points roughly 0m, ~330m, ~890m and ~1.8km north of the user, plus one invalid
+    places = [
+        {"title": "far", "mapx": "1270276000", "mapy": "375140000"},
+        {"title": "mid", "mapx": "1270276000", "mapy": "375059000"},
+        {"title": "bad", "mapx": None, "mapy": None},
+        {"title": "near", "mapx": "1270276000", "mapy": "375009000"},
+        {"title": "here", "mapx": "1270276000", "mapy": "374979000"},
+    ]
+
+    radius, nearby = select_radius(lat, lon, places)
+    assert radius == 500
+    assert [p["title"] for p in nearby] == ["here", "near"]
+    assert nearby[0]["distance_m"] == 0
+
+    radius, nearby = select_radius(lat, lon, places, min_count=3)
+    assert radius == 1000
+    assert [p["title"] for p in nearby] == ["here", "near", "mid"]
+
+    radius, nearby = select_radius(lat, lon, places, ladder=(100, 3000), min_count=4)
+    assert radius == 3000
+    assert [p["title"] for p in nearby] == ["here", "near", "mid", "far"]
+
+    # No rung qualifies: everything comes back, still nearest first
+    radius, nearby = select_radius(lat, lon, places, min_count=10)
+    assert radius is None
+    assert [p["title"] for p in nearby] == ["here", "near", "mid", "far", "bad"]
+    assert "distance_m" not in nearby[-1]
+
+    assert select_radius(lat, lon, []) == (None, [])
+
+def test_gazetteer_nearest_station():
+    from backend.gazetteer import Gazetteer, KDTree
+    import random
+
+    gaz = Gazetteer()
+    name, dist = gaz.nearest(37.4981, 127.0280)
+    assert name == "강남역"
+    assert dist < 100
+    assert gaz.lookup(37.5215, 126.9240, 800) == "여의도역"
+    # Busan is nowhere near a covered station
+    assert gaz.lookup(35.1796, 129.0756, 800) is None
+
+    from backend.geo_utils import nearest_landmark
+    # ~1.4km from 고속터미널역: too far for the address lookup, close enough for a prefetch guess
+    assert gaz.lookup(37.5100, 126.9900, 800) is None
+    assert nearest_landmark(37.5100, 126.9900, 2000) == "고속터미널역"
+    assert nearest_landmark(35.1796, 129.0756, 2000) is None
+
+    rng = random.Random(0)
+    points = [(rng.random(), rng.random()) for _ in range(300)]
+    tree = KDTree(points)
+    for _ in range(50):
+        x, y = rng.random(), rng.random()
+        dist, pid = tree.nearest(x, y)
+        assert pid == min(range(len(points)), key=lambda i: (points[i][0] - x) ** 2 + (points[i][1] - y) ** 2)
+
+def test_get_address_from_coords_offline_and_cached(tmp_path, monkeypatch):
+    from backend import geo_utils
+    from backend.db_manager import DatabaseManager
+
+    calls = []
+
+    def fake_nominatim(lat, lng):
+        calls.append((lat, lng))
+        return "해운대동"
+
+    monkeypatch.setattr(geo_utils, "reverse_geocode_nominatim", fake_nominatim)
+    monkeypatch.setattr(geo_utils, "_GEOCODE_MEMO", {})
+    db = DatabaseManager(str(tmp_path / "test.db"))
+
+    # Inside the gazetteer: no network
+    assert geo_utils.get_address_from_coords(37.5007, 127.0366, db=db) == "역삼역"
+    assert calls == []
+
+    # Outside: one network call, then memo / DB hits for nearby fixes in the same cell
+    assert geo_utils.get_address_from_coords(35.16312, 129.16361, db=db) == "해운대동"
+    assert geo_utils.get_address_from_coords(35.16308, 129.16358, db=db) == "해운대동"
+    monkeypatch.setattr(geo_utils, "_GEOCODE_MEMO", {})
+    assert geo_utils.get_address_from_coords(35.16312, 129.16361, db=db) == "해운대동"
+    assert len(calls) == 1
+
+    # Failures are not cached
+    monkeypatch.setattr(geo_utils, "reverse_geocode_nominatim", lambda lat, lng: None)
+    assert geo_utils.get_address_from_coords(33.45, 126.57, db=db) is None
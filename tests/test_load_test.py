@@ -0,0 +1,27 @@
+import sys
+import os
+import json
+import subprocess
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_load_test_harness_reports_latency_and_api_calls(tmp_path):
+    report_path = tmp_path / "report.json"
+    cmd = [
+        sys.executable, os.path.join(ROOT, "scripts", "load_test.py"),
+        "--stages", "2:1,4:1", "--ramp-up", "0", "--think", "0.05", "--latency", "0",
+        "--places", "2000", "--locations", "3", "--json", str(report_path),
+    ]
+    subprocess.run(cmd, cwd=tmp_path, capture_output=True, text=True, check=True, timeout=120)
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert [stage["users"] for stage in report["stages"]] == [2, 4]
+    assert report["errors"] == 0
+    assert report["steps"]["flow"]["count"] > 0
+    assert report["steps"]["flow"]["p50_ms"] <= report["steps"]["flow"]["p99_ms"]
+    assert report["api_calls"] > 0
+    assert "search" in report["cache_hit_ratios"]
@@ -0,0 +1,39 @@
+import sys
+import os
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import folium
+from folium.plugins import FastMarkerCluster
+
+from backend.map_view import build_map, render_map_html
+
+
+def make_places(n):
+    return [{"title": f"<b>식당{i}</b>", "category": "한식>국밥", "lat": 37.49 + i * 1e-4, "lng": 127.02 + i * 1e-4}
+            for i in range(n)]
+
+
+def children_of_type(m, cls):
+    return [c for c in m._children.values() if isinstance(c, cls)]
+
+
+def test_small_result_set_uses_individual_markers():
+    m = build_map(make_places(5) + [{"title": "좌표없음"}], cluster_threshold=30)
+    assert len(children_of_type(m, folium.Marker)) == 5
+    assert not children_of_type(m, FastMarkerCluster)
+
+
+def test_large_result_set_is_clustered():
+    m = build_map(make_places(500), cluster_threshold=30)
+    assert not children_of_type(m, folium.Marker)
+    clusters = children_of_type(m, FastMarkerCluster)
+    assert len(clusters) == 1
+    assert len(clusters[0].data) == 500
+
+
+def test_render_map_html_is_standalone_document():
+    html = render_map_html(make_places(3))
+    assert "leaflet" in html.lower()
+    assert "식당0" in html and "<b>" not in html
@@ -0,0 +1,186 @@
+import sys
+import os
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.menu_recommender import MenuRecommender
+
+PLACES = [
+    {"title": "시골밥상", "category": "한식>김치찌개", "description": "맛난 김치찌개"},
+    {"title": "은행골", "category": "일식>초밥", "description": "입에서 녹는 초밥"},
+    {"title": "초밥왕", "category": "일식>생선회", "description": ""},
+    {"title": "마포만두", "category": "분식>만두", "description": "갈비만두"},
+]
+
+
+def scan(menu, places):
+    return [
+        p for p in places
+        if menu in p.get('category', '') or menu in p.get('title', '') or menu in p.get('description', '')
+    ]
+
+
+def test_menu_index_matches_substring_scan():
+    rec = MenuRecommender()
+    rec.extract_top_menus(PLACES, top_n=10)
+
+    assert set(rec.menu_index) == {"김치찌개", "초밥", "생선회", "만두", "갈비만두"}
+    for menu in rec.menu_index:
+        assert MenuRecommender.lookup_places(menu, PLACES, rec.menu_index) == scan(menu, PLACES)
+
+    # "초밥" also matches the title of "초밥왕"
+    assert rec.menu_index["초밥"] == [1, 2]
+
+
+def test_lookup_places_falls_back_without_index():
+    assert MenuRecommender.lookup_places("갈비", PLACES, {}) == [PLACES[3]]
+    assert MenuRecommender.lookup_places("갈비", PLACES) == [PLACES[3]]
+
+
+def test_keyword_matcher_matches_naive_scan():
+    from backend.text_match import KeywordMatcher, compile_matcher
+
+    keywords = ["오이", "오이소박이", "이소", "박", "고수", "마라"]
+    matcher = KeywordMatcher(keywords)
+    for text in ["한식>오이소박이", "마라탕", "고등어", "", "박박오이"]:
+        assert matcher.find_all(text) == {kw for kw in keywords if kw in text}
+        assert matcher.contains_any(text) == any(kw in text for kw in keywords)
+
+    assert compile_matcher(["오이", "고수"]) is compile_matcher(("고수", "오이"))
+    assert not compile_matcher(None).contains_any("오이")
+
+
+def test_dislikes_and_favorites():
+    rec = MenuRecommender()
+    places = [
+        {"category": "한식>김치찌개"},
+        {"category": "한식>오이소박이"},
+        {"category": "일식>초밥"},
+        {"category": "중식>짜장면"},
+    ]
+    results = rec.extract_top_menus(places, top_n=10, dislikes=["오이"], favorites=["초밥"])
+    assert "오이소박이" not in results
+    assert set(results) == {"김치찌개", "초밥", "짜장면"}
+
+
+def test_alias_sampler_follows_weights():
+    import random
+    from backend.sampling import AliasSampler
+
+    sampler = AliasSampler(["a", "b", "c", "d"], [1, 2, 3, 0], rng=random.Random(0))
+    counts = {"a": 0, "b": 0, "c": 0, "d": 0}
+    for _ in range(60000):
+        counts[sampler.draw()] += 1
+
+    assert counts["d"] == 0
+    assert abs(counts["a"] / 60000 - 1 / 6) < 0.01
+    assert abs(counts["c"] / 60000 - 3 / 6) < 0.01
+
+
+def test_alias_sampler_without_replacement_and_exclusion():
+    import random
+    from backend.sampling import AliasSampler
+
+    items = [f"m{i}" for i in range(50)]
+    sampler = AliasSampler(items, list(range(1, 51)), rng=random.Random(1))
+
+    picked = sampler.sample(15, exclude={"m49", "m48"})
+    assert len(picked) == 15 == len(set(picked))
+    assert "m49" not in picked and "m48" not in picked
+
+    # Asking for more than is available returns everything that is allowed
+    assert sorted(sampler.sample(100, exclude=items[:45])) == sorted(items[45:])
+    assert sampler.draw(exclude=items) is None
+
+
+def test_pick_random_uses_boosted_pool():
+    rec = MenuRecommender()
+    places = [{"category": "한식>김치찌개"}] * 5 + [{"category": "일식>초밥"}]
+    rec.extract_top_menus(places, top_n=2, favorites=["초밥"])
+
+    assert rec.sampler.weights == [5, 3]
+    assert rec.pick_random(exclude=["김치찌개"]) == "초밥"
+    # Nothing left after exclusion -> fall back to the full pool
+    assert rec.pick_random(exclude=["김치찌개", "초밥"]) in {"김치찌개", "초밥"}
+
+
+def test_pick_random_among_shown_chips():
+    rec = MenuRecommender()
+    places = [{"category": "한식>김치찌개"}] * 5 + [{"category": "일식>초밥"}] * 3 + [{"category": "중식>짜장면"}]
+    rec.extract_top_menus(places)
+
+    shown = ["초밥", "짜장면"]
+    assert all(rec.pick_random(among=shown) in shown for _ in range(50))
+    assert rec.pick_random(exclude=["초밥"], among=shown) == "짜장면"
+    # Everything on screen was picked recently -> still one of the chips
+    assert rec.pick_random(exclude=shown, among=shown) in shown
+    assert rec.pick_random(among=[]) is None
+
+
+def test_update_preferences_matches_full_extraction():
+    places = [
+        {"category": "한식>김치찌개"},
+        {"category": "한식>오이소박이"},
+        {"category": "일식>초밥,회덮밥"},
+        {"category": "일식>초밥"},
+        {"category": "중식>짜장면,마라탕"},
+    ]
+    incremental = MenuRecommender()
+    incremental.extract_top_menus(places, dislikes=["오이"], favorites=["초밥"])
+
+    # Re-extracting from places must not be needed for a preference change
+    incremental.build_menu_index = None
+    menus = incremental.update_preferences(dislikes=["마라"], favorites=["짜장", "초밥"], top_n=10)
+
+    fresh = MenuRecommender()
+    fresh.extract_top_menus(places, dislikes=["마라"], favorites=["짜장", "초밥"])
+
+    assert incremental.counter == fresh.counter
+    assert incremental.counter["짜장면"] == 3 and incremental.counter["오이소박이"] == 1
+    assert "마라탕" not in menus and "오이소박이" in menus
+
+
+def test_longest_match_trie():
+    from backend.text_match import LongestMatchTrie
+
+    trie = LongestMatchTrie(["김치", "김치찌개", "찌개", "만두", "갈비"])
+    assert trie.extract("시골김치찌개") == ["김치찌개"]
+    assert trie.extract("갈비만두 김치") == ["갈비", "만두", "김치"]
+    assert trie.extract("김치찌") == ["김치"]
+    assert trie.extract("") == []
+    assert "김치찌개" in trie and "김치찌" not in trie
+    assert len(trie) == 5
+
+
+def test_dishes_from_title_and_description():
+    from backend.menu_lexicon import build_menu_lexicon
+
+    assert len(build_menu_lexicon()) > 2000
+
+    rec = MenuRecommender()
+    places = [
+        {"title": "<b>시골김치찌개</b>", "category": "한식", "description": ""},
+        {"title": "역삼식당", "category": "한식>김치찌개", "description": "김치찌개 맛집"},
+    ]
+    rec.extract_top_menus(places, top_n=5)
+
+    # Second place already has it in its category, so it is counted once there
+    assert rec.raw_counter["김치찌개"] == 2
+    assert rec.menu_index["김치찌개"] == [0, 1]
+
+
+def test_with_preferences_leaves_shared_recommender_untouched():
+    places = [{"category": "한식>김치찌개"}, {"category": "일식>초밥"}, {"category": "중식>마라탕"}]
+    shared = MenuRecommender()
+    shared.extract_top_menus(places)
+
+    view = shared.with_preferences(dislikes=["마라"], favorites=["초밥"])
+
+    assert view.counter == {"김치찌개": 1, "초밥": 3}
+    assert shared.counter == {"김치찌개": 1, "초밥": 1, "마라탕": 1}
+    assert shared.dislikes == frozenset() and shared.favorites == frozenset()
+    # The heavy structures are shared, not copied
+    assert view.menu_index is shared.menu_index
+    assert view.raw_counter is shared.raw_counter
+    assert set(view.sample_menus(10)) == {"김치찌개", "초밥"}
@@ -0,0 +1,76 @@
+import sys
+import os
+
+import pytest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import metrics
+from backend.db_manager import DatabaseManager
+from backend.menu_lexicon import DETAILED_KEYWORDS
+from backend.naver_api import NaverPlaceAPI, SPATIAL_INDEXES
+from backend.stub_server import StubNaverServer
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.enable(False)
+    metrics.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    metrics.reset()
+    metrics.enable(False)
+    with metrics.span("search.dedupe"):
+        metrics.incr("api_calls")
+    assert metrics.span("a") is metrics.span("b")  # Shared no-op, no allocation
+    assert metrics.counters() == {}
+    assert metrics.recent_spans() == []
+
+
+def test_spans_counters_and_prometheus_text(enabled_metrics):
+    with metrics.span("nlp"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.span("nlp"):
+            raise ValueError("boom")
+    # Control-flow exceptions passed as ignore= are timed but not counted as errors
+    with pytest.raises(KeyboardInterrupt):
+        with metrics.span("nlp", ignore=(KeyboardInterrupt,)):
+            raise KeyboardInterrupt
+    metrics.incr("cache_requests", 3, layer="search", result="hit")
+    metrics.incr("cache_requests", layer="search", result="miss")
+
+    assert metrics.stage_summary()[0]["stage"] == "nlp"
+    assert metrics.stage_summary()[0]["count"] == 3
+    assert metrics.hit_ratios() == {"search": 0.75}
+    assert metrics.recent_spans(1)[0]["stage"] == "nlp"
+
+    text = metrics.export_prometheus()
+    assert "# TYPE lunch_cache_requests_total counter" in text
+    assert 'lunch_cache_requests_total{layer="search",result="hit"} 3' in text
+    assert 'lunch_errors_total{stage="nlp"} 1' in text
+    assert 'lunch_stage_seconds_bucket{stage="nlp",le="+Inf"} 3' in text
+    assert 'lunch_stage_seconds_count{stage="nlp"} 3' in text
+
+
+def test_search_places_is_instrumented(tmp_path, enabled_metrics):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    with StubNaverServer() as stub:
+        api = NaverPlaceAPI("id", "secret", base_url=stub.base_url, db=db, usage_log=None)
+        try:
+            api.search_places("강남역 맛집")
+            api.search_places("강남역 맛집")
+        finally:
+            SPATIAL_INDEXES.pop(db.db_path, None)
+
+    counters = metrics.counters()
+    assert counters[("api_calls", ())] == len(DETAILED_KEYWORDS)
+    assert counters[("api_bytes", ())] > 0
+    assert metrics.hit_ratios()["search"] == 0.5
+    stages = {row["stage"] for row in metrics.stage_summary()}
+    assert {"search.cache_lookup", "search.fetch_keyword", "search.dedupe", "search.save"} <= stages
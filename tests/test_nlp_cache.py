@@ -0,0 +1,68 @@
+import sys
+import os
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.data import DataProcessor
+from backend.db_manager import DatabaseManager
+
+
+def make_processor(tmp_path):
+    return DataProcessor(db=DatabaseManager(str(tmp_path / "test.db")))
+
+
+def count_analyzer_calls(processor):
+    calls = []
+    original = processor.review_analyzer.analyze_reviews
+
+    def counting(reviews):
+        calls.append(reviews)
+        return original(reviews)
+
+    processor.review_analyzer.analyze_reviews = counting
+    return calls
+
+
+def test_warm_path_skips_analysis(tmp_path):
+    processor = make_processor(tmp_path)
+    descriptions = ["음식이 빨리 나와요", "웨이팅이 길어요", "음식이 빨리 나와요", ""]
+
+    first = processor.analyze_descriptions(descriptions)
+
+    # New processor sharing the same DB: everything should come from the cache
+    warm = DataProcessor(db=processor.db)
+    calls = count_analyzer_calls(warm)
+    second = warm.analyze_descriptions(descriptions)
+
+    assert [c for c in calls if c] == []
+    assert [r['score'] for r in second] == [r['score'] for r in first]
+    assert second[0]['score'] > 50
+    assert second[1]['score'] < 50
+    assert second[3]['sentiment'] == "Unknown"
+
+
+def test_lexicon_change_invalidates_cache(tmp_path):
+    processor = make_processor(tmp_path)
+    processor.analyze_descriptions(["가성비 좋은 집"])
+
+    changed = DataProcessor(db=processor.db)
+    old_version = changed.review_analyzer.lexicon_version
+    changed.review_analyzer.positive_keywords.append(r"가성비")
+    assert changed.review_analyzer.lexicon_version != old_version
+
+    result = changed.analyze_descriptions(["가성비 좋은 집"])
+    assert result[0]['score'] == 60
+
+
+def test_process_places_uses_cache(tmp_path):
+    processor = make_processor(tmp_path)
+    places = [{"title": "A", "description": "점심 혼밥 가능", "userRating": "4.5"}]
+    processor.process_places([dict(p) for p in places])
+
+    calls = count_analyzer_calls(processor)
+    result = processor.process_places([dict(p) for p in places])
+
+    assert [c for c in calls if c] == []
+    assert result[0]['lunch_score'] == 70
+    assert result[0]['sentiment'] == "Good"
@@ -0,0 +1,103 @@
+import sys
+import os
+import threading
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.prefetch import PipelinePrefetcher
+
+
+def test_prefetch_is_deduplicated_and_handed_out_once():
+    calls = []
+
+    def pipeline(query, mode, coords):
+        calls.append((query, mode, coords))
+        return {"query": query}
+
+    prefetcher = PipelinePrefetcher(pipeline)
+    key = ("강남역 맛집", "popular", (37.498, 127.028))
+    assert prefetcher.prefetch(*key) is prefetcher.prefetch(*key)
+    assert prefetcher.reconcile(*key) == {"query": "강남역 맛집"}
+    assert calls == [key]
+    # Consumed: the caller's own cache (run_pipeline) owns it from here
+    assert prefetcher.reconcile(*key) is None
+
+
+def test_reconcile_waits_for_prefetch_at_same_coords():
+    release = threading.Event()
+    finished = []
+
+    def pipeline(query, mode, coords):
+        release.wait(5)
+        finished.append(query)
+        return {"query": query}
+
+    prefetcher = PipelinePrefetcher(pipeline)
+    coords = (37.501, 127.036)
+    prefetcher.prefetch("역삼역 맛집", "popular", coords)
+    assert prefetcher.pending(coords) == [("역삼역 맛집", "popular", coords)]
+
+    # Address resolved to a different name: no exact result, but the caller
+    # must not start fetching before the guess has filled the cache
+    threading.Timer(0.05, release.set).start()
+    assert prefetcher.reconcile("역삼동 맛집", "popular", coords) is None
+    assert finished == ["역삼역 맛집"]
+    assert prefetcher.pending() == []
+    # Waited on but never consumed: evicted, a new prefetch starts fresh
+    assert prefetcher._futures == {}
+
+
+def test_reconcile_wait_for_other_query_is_capped(monkeypatch):
+    from backend import prefetch
+
+    release = threading.Event()
+
+    def pipeline(query, mode, coords):
+        release.wait(5)
+        return {"query": query}
+
+    monkeypatch.setattr(prefetch, "NEARBY_WAIT_TIMEOUT", 0.1)
+    prefetcher = PipelinePrefetcher(pipeline)
+    coords = (37.501, 127.036)
+    prefetcher.prefetch("역삼역 맛집", "popular", coords)
+    try:
+        start = time.monotonic()
+        assert prefetcher.reconcile("역삼동 맛집", "popular", coords) is None
+        assert time.monotonic() - start < 2
+        assert prefetcher.pending(coords)
+    finally:
+        release.set()
+    # Evicted once the slow prefetch finishes
+    deadline = time.monotonic() + 5
+    while prefetcher._futures and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert prefetcher._futures == {}
+
+
+def test_reconcile_ignores_prefetch_in_other_mode():
+    release = threading.Event()
+
+    def pipeline(query, mode, coords):
+        release.wait(5)
+        return {"query": query}
+
+    prefetcher = PipelinePrefetcher(pipeline)
+    coords = (37.501, 127.036)
+    prefetcher.prefetch("역삼역 맛집", "popular", coords)
+    try:
+        # A hidden-gem search can't reuse popular results: no point waiting
+        assert prefetcher.reconcile("역삼동 맛집", "random", coords, timeout=2) is None
+        assert prefetcher.pending(coords)
+    finally:
+        release.set()
+
+
+def test_failed_prefetch_yields_none():
+    def pipeline(query, mode, coords):
+        raise ConnectionError("offline")
+
+    prefetcher = PipelinePrefetcher(pipeline)
+    prefetcher.prefetch("강남역 맛집", "popular", (37.498, 127.028))
+    assert prefetcher.reconcile("강남역 맛집", "popular", (37.498, 127.028)) is None
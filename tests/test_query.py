@@ -0,0 +1,77 @@
+import sys
+import os
+import threading
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import metrics
+from backend.db_manager import DatabaseManager
+from backend.menu_lexicon import DETAILED_KEYWORDS
+from backend.naver_api import NaverPlaceAPI, SPATIAL_INDEXES
+from backend.query import build_query, canonical_query, parse_query
+from backend.stub_server import StubNaverServer
+
+
+def test_variants_share_one_canonical_query():
+    variants = ["강남역 한식 일식 맛집", "강남역 일식 한식 맛집", "  강남역   일식  한식맛집 ", "강남역 일식 한식 식당"]
+    assert {canonical_query(q) for q in variants} == {"강남역 한식 일식 맛집"}
+    assert build_query("강남역", ["일식", "한식"]) == build_query("강남역 ", ["한식", "일식"]) == "강남역 한식 일식 맛집"
+    assert build_query("강남역") == "강남역 맛집"
+
+    parsed = parse_query("강남역 아시아 맛집")
+    assert (parsed.location, parsed.categories, parsed.intent) == ("강남역", ("아시안",), "맛집")
+    assert parse_query("강남역").intent is None and canonical_query("강남역") == "강남역"
+
+
+def test_glued_suffix_is_split_only_from_categories():
+    parsed = parse_query("강남역 한식당")
+    assert parsed.key == ("강남역", ("한식",), "맛집") and parsed.intent_word == "식당"
+    assert NaverPlaceAPI._target_keywords("강남역 한식당") == ["한식"]
+    assert NaverPlaceAPI._sub_query("강남역  한식당", "한식") == "강남역 한식당"
+
+    # A location with a glued intent word stays a location
+    assert parse_query("강남역맛집").key == ("강남역맛집", (), None)
+
+    # The user's intent word is sent to Naver; only the cache key is normalized
+    parsed = parse_query("을지로 밥집")
+    assert parsed.key == ("을지로", (), "맛집") and canonical_query("을지로 밥집") == "을지로 맛집"
+    assert NaverPlaceAPI._target_keywords("을지로 밥집") == DETAILED_KEYWORDS
+    assert NaverPlaceAPI._sub_query("을지로 밥집", "국밥") == "을지로 국밥 밥집"
+
+
+def test_keyword_planner_uses_whole_category_tokens():
+    # "카페" inside a location name doesn't narrow the search
+    assert NaverPlaceAPI._target_keywords("카페거리 맛집") == DETAILED_KEYWORDS
+    assert NaverPlaceAPI._target_keywords("강남역 일식 한식 맛집") == ["한식", "일식"]
+    assert NaverPlaceAPI._sub_query("강남역 한식 일식 맛집", "일식") == "강남역 일식 맛집"
+    assert NaverPlaceAPI._sub_query("강남역 맛집", "국밥") == "강남역 국밥 맛집"
+
+
+def test_variants_hit_cache_and_concurrent_searches_fetch_once(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    metrics.reset()
+    metrics.enable()
+    try:
+        with StubNaverServer(latency=0.2) as stub:
+            api = NaverPlaceAPI("id", "secret", base_url=stub.base_url, db=db, usage_log=None)
+            results = []
+            threads = [threading.Thread(target=lambda q=q: results.append(api.search_places(q)["items"]))
+                       for q in ("강남역 맛집", "강남역  맛집", "강남역 식당")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert stub.calls == len(DETAILED_KEYWORDS)
+            assert results[0] == results[1] == results[2]
+
+            api.search_places("강남역 한식 일식 맛집")
+            calls = stub.calls
+            assert api.search_places("강남역 일식  한식 맛집")["items"]
+            assert stub.calls == calls
+        assert metrics.hit_ratios()["search"] == 0.6  # 2 joined + 1 variant hit of 5
+        assert metrics.counters()[("search_flights_joined", ())] >= 1
+    finally:
+        SPATIAL_INDEXES.pop(db.db_path, None)
+        metrics.enable(False)
+        metrics.reset()
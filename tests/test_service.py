@@ -0,0 +1,107 @@
+import sys
+import os
+
+import pytest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("httpx")  # required by starlette's TestClient
+
+from starlette.testclient import TestClient
+
+from backend import service
+from backend.data import DataProcessor
+from backend.db_manager import DatabaseManager
+from backend.menu_recommender import MenuRecommender
+from backend.naver_api import NaverPlaceAPI, SPATIAL_INDEXES
+
+
+def make_items(n):
+    dishes = ["김치찌개", "초밥", "쌀국수", "돈까스"]
+    return [
+        {"title": f"<b>식당{i}</b>", "category": f"한식>{dishes[i % 4]}", "description": f"맛있는 {dishes[i % 4]} 점심",
+         "address": "강남구 역삼동", "mapx": str(1270276000 + i * 200), "mapy": str(374979000 + i * 100)}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    api = NaverPlaceAPI.__new__(NaverPlaceAPI)
+    api.db = db
+    db.save_cache("강남역 맛집_popular_v3", {"items": make_items(40)})
+
+    monkeypatch.setenv("NAVER_CLIENT_ID", "test-id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "test-secret")
+    monkeypatch.setattr(service, "_API", api)
+    monkeypatch.setattr(service, "_PROCESSOR", DataProcessor(db=db))
+    service.RESULTS.clear()
+    try:
+        yield TestClient(service.app)
+    finally:
+        service.RESULTS.clear()
+        SPATIAL_INDEXES.pop(db.db_path, None)
+
+
+def test_recommend_runs_full_pipeline_and_compresses(client):
+    response = client.get("/recommend", params={"query": "강남역 맛집", "lat": 37.4979, "lng": 127.0276},
+                          headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+
+    data = response.json()
+    assert data["radius"] == 500
+    assert data["places"] and all("distance_m" in p for p in data["places"])
+
+    recommender = MenuRecommender.from_dict(data["recommender"])
+    assert set(recommender.sample_menus(4)) == {"김치찌개", "초밥", "쌀국수", "돈까스"}
+    matched = MenuRecommender.lookup_places("초밥", data["places"], recommender.menu_index)
+    assert matched and all("초밥" in p["category"] for p in matched)
+
+    # Second call is served from the worker's result cache
+    assert service.RESULTS.get(("강남역 맛집", "popular", (37.498, 127.028))) is not None
+
+
+def test_stage_endpoints(client):
+    places = client.post("/process", json={"items": make_items(8)}).json()["places"]
+    assert len(places) == 8 and "lunch_score" in places[0]
+
+    data = client.post("/radius", json={"lat": 37.4979, "lng": 127.0276, "places": places, "ladder": [100, 300]}).json()
+    assert data["radius"] == 100
+    assert [p["distance_m"] for p in data["places"]] == sorted(p["distance_m"] for p in data["places"])
+
+    data = client.post("/menus", json={"places": places, "top_n": 10, "dislikes": ["초밥"]}).json()
+    assert "초밥" not in data["menus"]
+    assert "김치찌개" in data["menus"]
+
+
+def test_bad_requests(client):
+    assert client.get("/recommend").status_code == 400
+    assert client.get("/recommend", params={"query": "강남역 맛집", "lat": "x", "lng": "1"}).status_code == 400
+    assert client.post("/process", content=b"not json").status_code == 400
+    assert client.post("/process", json={"items": [1]}).status_code == 400
+    # Unknown modes would each get their own cache entries / spatial index
+    assert client.get("/recommend", params={"query": "강남역 맛집", "mode": "%"}).status_code == 400
+    assert client.get("/search", params={"query": "강남역 맛집", "mode": "best"}).status_code == 400
+    assert client.post("/search/many", json={"locations": ["강남역 맛집"], "mode": "%"}).status_code == 400
+    assert client.post("/search/many", json={"locations": [{"query": 5}]}).status_code == 400
+    # Malformed numbers / places are client errors, not 500s
+    place = {"title": "진국밥", "category": "한식>국밥", "mapx": "1270276000", "mapy": "374979000"}
+    assert client.post("/radius", json={"lat": 37.5, "lng": 127.0, "places": [place], "min_count": "x"}).status_code == 400
+    assert client.post("/radius", json={"lat": 37.5, "lng": 127.0, "places": [place], "ladder": ["a"]}).status_code == 400
+    assert client.post("/radius", json={"lat": 37.5, "lng": 127.0, "places": [3]}).status_code == 400
+    assert client.post("/menus", json={"places": [place], "top_n": "many"}).status_code == 400
+    assert client.post("/menus", json={"places": [{"title": 1}]}).status_code == 400
+    assert client.post("/menus", json={"places": [place], "dislikes": [1]}).status_code == 400
+    assert client.post("/menus", json={"places": [place], "top_n": 3}).status_code == 200
+
+
+def test_search_many_sends_shared_places_once(client):
+    data = client.post("/search/many", json={"locations": ["강남역 맛집", {"query": "강남역 맛집", "lat": 37.4979, "lng": 127.0276}]}).json()
+    assert len(data["places"]) == 40
+    # One index list per requested location, in request order
+    assert data["locations"] == [list(range(40)), list(range(40))]
+
+    assert client.post("/search/many", json={"locations": [3]}).status_code == 400
@@ -0,0 +1,118 @@
+import sys
+import os
+import subprocess
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.menu_recommender import MenuRecommender
+from backend.rate_limiter import TokenBucket
+from backend.snapshot import Snapshot, SnapshotWriter, make_entry, read_entries
+from backend.stub_server import StubNaverServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PLACES = [
+    {"title": "<b>진국밥</b>", "category": "한식>국밥", "description": "점심 국밥", "link": "http://x", "mapx": "1270276000", "mapy": "374979000"},
+    {"title": "스시한판", "category": "일식>초밥,롤", "description": "초밥 점심", "mapx": "1270277000", "mapy": "374980000"},
+]
+
+
+def make_test_entry(query, coords=None):
+    recommender = MenuRecommender()
+    recommender.extract_top_menus(PLACES)
+    return make_entry(query, "popular", coords, 500 if coords else None, PLACES, recommender)
+
+
+def test_snapshot_round_trip_and_resume_after_truncation(tmp_path):
+    path = str(tmp_path / "snapshot.jsonl.gz")
+    with SnapshotWriter(path) as writer:
+        writer.write(make_test_entry("강남역 맛집"))
+        writer.write(make_test_entry("역삼역 맛집", (37.5006, 127.0364)))
+
+    snapshot = Snapshot.load(path)
+    result = snapshot.get("역삼역 맛집", "popular", (37.5006, 127.0364))
+    assert result["radius"] == 500
+    assert "link" not in result["places"][0]  # Dropped to keep the snapshot small
+    assert "국밥" in result["recommender"].menu_index
+    assert snapshot.get("강남역 맛집", "random", None) is None
+    assert snapshot.get("강남역 맛집", "popular", None, max_age=-1) is None  # Too old
+
+    # Interrupted run: cut the file mid-way, the writer keeps only complete entries
+    plain = str(tmp_path / "snapshot.jsonl")
+    with SnapshotWriter(plain) as writer:
+        writer.write(make_test_entry("강남역 맛집"))
+        writer.write(make_test_entry("선릉역 맛집"))
+    with open(plain, "rb+") as f:
+        f.truncate(os.path.getsize(plain) - 10)
+    assert read_entries(plain)[1] is False
+    writer = SnapshotWriter(plain)
+    assert writer.done == {"popular|강남역 맛집|-"}
+    writer.close()
+    assert read_entries(plain)[1] is True
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    # 5 from the burst, 10 more at 50/s
+    assert time.monotonic() - start >= 0.18
+    assert not bucket.try_acquire()
+    assert bucket.acquire(timeout=0) is False
+
+
+def test_precompute_cli_writes_and_resumes(tmp_path):
+    out = str(tmp_path / "snapshot.jsonl.gz")
+    with StubNaverServer() as stub:
+        env = dict(os.environ, NAVER_CLIENT_ID="id", NAVER_CLIENT_SECRET="secret", NAVER_API_BASE_URL=stub.base_url,
+                   NAVER_USAGE_LOG="")
+        cmd = [sys.executable, os.path.join(ROOT, "scripts", "precompute.py"), "-o", out,
+               "--locations", "강남역,역삼역", "--db", str(tmp_path / "test.db"), "--cpu-workers", "2", "--rate", "200"]
+        subprocess.run(cmd, cwd=tmp_path, env=env, capture_output=True, text=True, check=True, timeout=120)
+        first_calls = stub.calls
+        rerun = subprocess.run(cmd, cwd=tmp_path, env=env, capture_output=True, text=True, check=True, timeout=120)
+
+    assert first_calls > 0
+    assert stub.calls == first_calls  # Resume: nothing left to fetch
+    assert "0 to go" in rerun.stdout
+    snapshot = Snapshot.load(out)
+    assert len(snapshot) == 2
+    assert snapshot.get("강남역 맛집", "popular", None)["places"]
+
+
+def test_empty_results_are_not_written_or_served(tmp_path):
+    out = str(tmp_path / "snapshot.jsonl")
+    with StubNaverServer() as stub:
+        # Missing credentials: every sub-query fails and the search comes back empty
+        env = dict(os.environ, NAVER_CLIENT_ID="", NAVER_CLIENT_SECRET="", NAVER_API_BASE_URL=stub.base_url,
+                   NAVER_USAGE_LOG="")
+        cmd = [sys.executable, os.path.join(ROOT, "scripts", "precompute.py"), "-o", out,
+               "--locations", "강남역", "--db", str(tmp_path / "test.db"), "--cpu-workers", "1", "--rate", "200"]
+        result = subprocess.run(cmd, cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 1
+    assert "no places" in result.stdout
+    assert read_entries(out) == ([], True)
+
+    recommender = MenuRecommender()
+    empty = make_entry("강남역 맛집", "popular", None, None, [], recommender)
+    assert Snapshot([empty]).get("강남역 맛집", "popular", None) is None
+
+
+def test_gps_fix_uses_nearest_grid_point():
+    recommender = MenuRecommender()
+    recommender.extract_top_menus(PLACES)
+    grid = [make_entry("강남역 맛집", "popular", (37.498, 127.028), 500, PLACES, recommender, grid_step_m=500),
+            make_entry("강남역 맛집", "popular", (37.502, 127.028), 500, PLACES[:1], recommender, grid_step_m=500)]
+    exact = make_test_entry("역삼역 맛집", (37.500, 127.036))
+    snapshot = Snapshot(grid + [exact])
+
+    # Snapped app coords between lattice points: the closer point answers
+    assert len(snapshot.get("강남역 맛집", "popular", (37.499, 127.029))["places"]) == 2
+    assert len(snapshot.get("강남역 맛집", "popular", (37.501, 127.027))["places"]) == 1
+    # Farther than half a cell diagonal, another search, or a non-grid entry: no match
+    assert snapshot.get("강남역 맛집", "popular", (37.510, 127.028)) is None
+    assert snapshot.get("강남역 맛집", "random", (37.499, 127.029)) is None
+    assert snapshot.get("역삼역 맛집", "popular", (37.501, 127.036)) is None
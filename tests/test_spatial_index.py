@@ -0,0 +1,129 @@
+import sys
+import os
+import random
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.geo_utils import GridIndex, calculate_distances
+
+
+def make_places(n, seed=0):
+    rng = random.Random(seed)
+    places = []
+    for i in range(n):
+        lat = 37.45 + rng.random() * 0.15
+        lon = 126.90 + rng.random() * 0.20
+        places.append({"title": f"place{i}", "mapx": str(int(lon * 1e7)), "mapy": str(int(lat * 1e7))})
+    return places
+
+
+def test_radius_and_nearest_match_linear_scan():
+    places = make_places(3000)
+    index = GridIndex(cell_size_m=300)
+    assert index.add_many(places) == 3000
+
+    lat, lon = 37.5, 127.0
+    dists = calculate_distances(lat, lon, places)
+    by_dist = sorted(range(len(places)), key=lambda i: dists[i])
+
+    hits = index.query_radius(lat, lon, 800)
+    expected = [places[i]["title"] for i in by_dist if dists[i] <= 800]
+    assert [p["title"] for d, p in hits] == expected
+
+    nearest = index.nearest(lat, lon, 25)
+    assert [p["title"] for d, p in nearest] == [places[i]["title"] for i in by_dist[:25]]
+
+    # Query point far outside the data still finds the closest places
+    nearest = index.nearest(37.30, 126.70, 3)
+    far_dists = calculate_distances(37.30, 126.70, places)
+    assert [round(d) for d, p in nearest] == sorted(round(d) for d in far_dists)[:3]
+
+
+def test_queries_away_from_reference_latitude_match_linear_scan():
+    # Cells are sized for Seoul; near 60°N they are much narrower east-west
+    rng = random.Random(1)
+    places = [{"title": f"place{i}", "mapx": str(int((24.90 + rng.random() * 0.10) * 1e7)),
+               "mapy": str(int((60.15 + rng.random() * 0.05) * 1e7))} for i in range(2000)]
+    index = GridIndex()
+    index.add_many(places)
+
+    lat, lon = 60.17, 24.95
+    dists = calculate_distances(lat, lon, places)
+    by_dist = sorted(range(len(places)), key=lambda i: dists[i])
+    hits = index.query_radius(lat, lon, 800)
+    assert [p["title"] for d, p in hits] == [places[i]["title"] for i in by_dist if dists[i] <= 800]
+    nearest = index.nearest(lat, lon, 40, max_radius_m=1500)
+    assert [p["title"] for d, p in nearest] == [places[i]["title"] for i in by_dist[:40] if dists[i] <= 1500]
+
+
+def test_incremental_updates_and_max_age():
+    index = GridIndex()
+    place = {"title": "<b>시골밥상</b>", "mapx": "1270276000", "mapy": "374979000"}
+    assert index.add(dict(place), created_at=100.0)
+    assert index.add(dict(place, category="한식"), created_at=200.0)
+    assert not index.add({"title": "no coords"})
+    assert len(index) == 1
+
+    (dist, hit), = index.query_radius(37.4979, 127.0276, 100)
+    assert hit["category"] == "한식"
+    assert index.query_radius(37.4979, 127.0276, 100, max_age=60) == []
+
+
+def test_api_spatial_index_built_from_cache(tmp_path):
+    from backend.naver_api import NaverPlaceAPI, SPATIAL_INDEXES
+    from backend.db_manager import DatabaseManager
+
+    api = NaverPlaceAPI.__new__(NaverPlaceAPI)
+    api.db = DatabaseManager(str(tmp_path / "test.db"))
+    api.db.save_cache("강남역 맛집_popular_v3", {"items": make_places(50)})
+
+    try:
+        assert len(api.get_spatial_index()) == 50
+        api._index_items(make_places(10, seed=1), created_at=None)
+        assert len(api.get_spatial_index()) == 50 + 10
+
+        nearby = api.search_nearby_cached(37.5, 127.0, radius_m=100000, k=5)
+        assert len(nearby["items"]) == 5
+    finally:
+        SPATIAL_INDEXES.pop(api.db.db_path, None)
+
+
+def test_search_places_reuses_nearby_cache(tmp_path, monkeypatch):
+    from backend import naver_api
+    from backend.naver_api import NaverPlaceAPI, SPATIAL_INDEXES
+    from backend.db_manager import DatabaseManager
+
+    api = NaverPlaceAPI.__new__(NaverPlaceAPI)
+    api.db = DatabaseManager(str(tmp_path / "test.db"))
+    api.client_id = api.client_secret = "id"
+    api.base_url, api.rate_limiter = naver_api.NAVER_LOCAL_SEARCH_URL, None
+
+    # 40 places cached for "역삼역", all within ~300m of the user
+    places = [
+        {"title": f"식당{i}", "category": "일식>초밥" if i % 4 == 0 else "한식>백반",
+         "mapx": str(1270364000 + i * 100), "mapy": str(375006000 + i * 50)}
+        for i in range(40)
+    ]
+    api.db.save_cache("역삼역 맛집_popular_v3", {"items": places})
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("API should not be called")
+
+    monkeypatch.setattr(naver_api.requests, "get", no_network)
+    try:
+        result = api.search_places("역삼동 맛집", coords=(37.5006, 127.0364), min_places=30)
+        assert len(result["items"]) == 40
+
+        # Category-narrowed query only counts matching places (10 < 30) -> falls through to the API
+        monkeypatch.setattr(naver_api.requests, "get", lambda *a, **k: (_ for _ in ()).throw(ConnectionError()))
+        result = api.search_places("역삼동 일식 맛집", coords=(37.5006, 127.0364), min_places=30)
+        assert result["items"] == []
+
+        # Hidden-gem search: popular results are not reused
+        result = api.search_places("역삼동 맛집", search_mode='random', coords=(37.5006, 127.0364), min_places=30)
+        assert result["items"] == []
+        assert len(api.search_nearby_cached(37.5006, 127.0364, search_mode='popular')["items"]) == 40
+        assert api.search_nearby_cached(37.5006, 127.0364, search_mode='random')["items"] == []
+    finally:
+        SPATIAL_INDEXES.pop(api.db.db_path, None)
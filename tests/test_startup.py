@@ -0,0 +1,19 @@
+import sys
+import os
+import subprocess
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_backend_imports_keep_heavy_dependencies_lazy():
+    # Fresh interpreter: the test process itself may already have these modules loaded
+    code = (
+        "import sys\n"
+        "import backend.geo_utils, backend.data, backend.map_view, backend.naver_api\n"
+        "print(','.join(m for m in ('folium', 'geopy', 'pandas', 'pyproj') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
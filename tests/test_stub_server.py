@@ -0,0 +1,118 @@
+import sys
+import os
+import threading
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.db_manager import DatabaseManager
+from backend.menu_lexicon import DETAILED_KEYWORDS
+from backend.naver_api import NaverPlaceAPI, SPATIAL_INDEXES
+from backend.rate_limiter import TokenBucket
+from backend.stub_server import StubNaverServer, fake_items
+
+
+def test_fake_items_are_deterministic_pages():
+    assert fake_items("강남역 국밥 맛집", start=1) == fake_items("강남역 국밥 맛집", start=1)
+    assert len(fake_items("강남역 국밥 맛집", start=1, display=50)) == 5
+    assert all("국밥" in item["category"] for item in fake_items("강남역 국밥 맛집"))
+    assert fake_items("강남역 맛집", start=26) == []
+
+
+def test_search_places_against_stub(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    with StubNaverServer() as stub:
+        api = NaverPlaceAPI("id", "secret", base_url=stub.base_url, db=db, usage_log=None)
+        try:
+            result = api.search_places("강남역 맛집")
+            assert stub.calls == len(DETAILED_KEYWORDS)
+            assert len(result["items"]) > 0
+
+            # Second search is a DB cache hit
+            assert api.search_places("강남역 맛집")["items"] == result["items"]
+            assert stub.calls == len(DETAILED_KEYWORDS)
+        finally:
+            SPATIAL_INDEXES.pop(db.db_path, None)
+
+    # Missing credentials are rejected like the real API
+    with StubNaverServer() as stub:
+        api = NaverPlaceAPI("", "", base_url=stub.base_url, db=db, usage_log=None)
+        assert api.search_places("역삼역 맛집", force_refresh=True)["items"] == []
+
+
+def test_search_many_shares_sub_queries_and_places(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    with StubNaverServer() as stub:
+        api = NaverPlaceAPI("id", "secret", base_url=stub.base_url, db=db, usage_log=None)
+        try:
+            # "강남역 한식 맛집" is also one of the sub-queries of "강남역 맛집"
+            results = api.search_many(["강남역 맛집", "강남역 한식 맛집", ("강남역 맛집", None)])
+            assert list(results) == ["강남역 맛집", "강남역 한식 맛집"]
+            assert stub.calls == len(DETAILED_KEYWORDS)
+
+            generic, korean = results["강남역 맛집"]["items"], results["강남역 한식 맛집"]["items"]
+            assert korean and all(any(item is other for other in generic) for item in korean)
+
+            # Each location was cached like a single search_places call
+            assert api.search_places("강남역 한식 맛집")["items"] == korean
+            assert stub.calls == len(DETAILED_KEYWORDS)
+        finally:
+            SPATIAL_INDEXES.pop(db.db_path, None)
+
+
+def test_search_many_keeps_locations_apart_and_joins_concurrent_searches(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    gangnam, yeoksam = (37.4979, 127.0276), (37.5006, 127.0364)
+    with StubNaverServer(latency=0.3) as stub:
+        api = NaverPlaceAPI("id", "secret", base_url=stub.base_url, db=db, usage_log=None)
+        try:
+            # Same query text at two points: two locations, one set of sub-queries
+            results = api.search_many([("강남역 맛집", gangnam), ("강남역 맛집", yeoksam), "강남역 맛집"])
+            assert list(results) == [("강남역 맛집", gangnam), ("강남역 맛집", yeoksam), "강남역 맛집"]
+            assert stub.calls == len(DETAILED_KEYWORDS)
+
+            # A search_places running alongside a bulk search shares its sub-query
+            calls = stub.calls
+            narrowed = []
+            thread = threading.Thread(
+                target=lambda: narrowed.append(api.search_places("역삼역 한식 맛집", force_refresh=True)))
+            thread.start()
+            api.search_many(["역삼역 맛집"], force_refresh=True)
+            thread.join()
+            assert narrowed[0]["items"]
+            assert stub.calls == calls + len(DETAILED_KEYWORDS)
+        finally:
+            SPATIAL_INDEXES.pop(db.db_path, None)
+
+
+def test_pagination_stops_at_short_page_and_resumes_from_page_cache(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    with StubNaverServer(results_per_query=12) as stub:
+        api = NaverPlaceAPI("id", "secret", base_url=stub.base_url, db=db, usage_log=None,
+                            rate_limiter=TokenBucket(1000, 100))
+        # Pages 1, 6 are full, 11 is short: nothing past it is kept
+        items = api._fetch_items_with_pagination("강남역 맛집", max_items=50, max_concurrency=4)
+        assert len(items) == 12
+        assert len({item["title"] for item in items}) == 12
+        assert stub.calls <= 3 + 4
+
+    # Pages sent past the short one finish in the background: count the next search on its own server
+    with StubNaverServer(results_per_query=12) as stub:
+        # Without a rate limiter pages go out one at a time: nothing is sent past the short page
+        calls = stub.calls
+        unthrottled = NaverPlaceAPI("id", "secret", base_url=stub.base_url, db=db, usage_log=None)
+        assert unthrottled.rate_limiter is None
+        assert len(unthrottled._fetch_items_with_pagination("선릉역 맛집", max_items=50)) == 12
+        assert stub.calls == calls + 3
+
+    usage_log = tmp_path / "usage.csv"
+    with StubNaverServer() as stub:
+        api = NaverPlaceAPI("id", "secret", base_url=stub.base_url, db=db, usage_log=str(usage_log))
+        first = api._fetch_items_with_pagination("역삼역 맛집", max_items=10)
+        assert len(first) == 10 and stub.calls == 2
+
+        # Deeper pagination reuses the two cached pages and only fetches the new ones
+        deeper = api._fetch_items_with_pagination("역삼역 맛집", max_items=20)
+        assert deeper[:10] == first and len(deeper) == 20
+        assert stub.calls == 4
+    assert len(usage_log.read_text(encoding="utf-8").splitlines()) == 4
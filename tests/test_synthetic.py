@@ -0,0 +1,44 @@
+import sys
+import os
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from backend.geo_utils import katech_to_wgs84, place_key
+from backend.stub_server import StubNaverServer
+from backend.synthetic import CATEGORY_TREE, SyntheticPlaceGenerator, read_jsonl, write_jsonl
+
+
+def test_generator_is_deterministic_and_naver_shaped():
+    items = list(SyntheticPlaceGenerator(seed=3).iter_items(2000))
+    assert items == list(SyntheticPlaceGenerator(seed=3).iter_items(2000))
+
+    categories = {f"{top}>{leaf}" for top, leaf, _ in CATEGORY_TREE}
+    for item in items:
+        assert item["category"] in categories
+        lat, lng = katech_to_wgs84(item["mapx"], item["mapy"])
+        assert 37.3 < lat < 37.7 and 126.8 < lng < 127.2
+
+    unique = {place_key(item) for item in items}
+    assert len(unique) < len(items)  # Exact repeats for the dedupe path
+    assert any("역점" in item["title"] for item in items)  # Chain branches
+
+
+def test_jsonl_round_trip(tmp_path):
+    items = list(SyntheticPlaceGenerator(seed=1).iter_items(100))
+    path = str(tmp_path / "places.jsonl.gz")
+    assert write_jsonl(path, items) == 100
+    assert list(read_jsonl(path)) == items
+
+
+def test_stub_server_serves_dataset():
+    items = list(SyntheticPlaceGenerator(seed=2).iter_items(5000))
+    with StubNaverServer(dataset=items) as stub:
+        headers = {"X-Naver-Client-Id": "id", "X-Naver-Client-Secret": "secret"}
+        data = requests.get(stub.base_url, headers=headers, params={"query": "강남역 초밥 맛집", "start": 1}).json()
+
+    assert 0 < len(data["items"]) <= 5
+    assert data["total"] >= len(data["items"])
+    assert all("초밥" in item["category"] or "초밥" in item["title"] for item in data["items"])
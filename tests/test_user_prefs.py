@@ -0,0 +1,92 @@
+import sys
+import os
+import json
+import threading
+
+import pytest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.db_manager import DatabaseManager
+from backend.user_prefs import UserPreferences, DEFAULT_USER_ID, clear_cache
+
+
+@pytest.fixture
+def db(tmp_path):
+    clear_cache()
+    yield DatabaseManager(str(tmp_path / "test.db"))
+    clear_cache()
+
+
+def test_preferences_are_per_user_and_versioned(db):
+    alice = UserPreferences("alice", db=db, legacy_path=None)
+    bob = UserPreferences("bob", db=db, legacy_path=None)
+    assert alice.version == 0 and alice.get_dislikes() == []
+
+    assert alice.save_preferences(["오이", "오이", "고수"], ["초밥"])
+    assert alice.version == 1
+    assert alice.save_preferences(["오이"], ["초밥", "고기"])
+    assert alice.version == 2
+    assert bob.get_dislikes() == [] and bob.version == 0
+
+    # Fresh process view: everything comes back from SQLite
+    clear_cache()
+    again = UserPreferences("alice", db=db, legacy_path=None)
+    assert again.get_dislikes() == ["오이"]
+    assert sorted(again.get_favorites()) == ["고기", "초밥"]
+    assert again.version == 2
+
+
+def test_reads_are_served_from_memory(db, monkeypatch):
+    prefs = UserPreferences("alice", db=db, legacy_path=None)
+    prefs.save_preferences(["마라"], [])
+
+    def no_db(*args, **kwargs):
+        raise AssertionError("read should hit the in-process cache (only the version is re-checked)")
+
+    monkeypatch.setattr(db, "get_user_preferences", no_db)
+    other_session = UserPreferences("alice", db=db, legacy_path=None)
+    assert other_session.get_dislikes() == ["마라"]
+    assert other_session.version == 1
+
+
+def test_saves_from_other_processes_are_picked_up(db, monkeypatch):
+    from backend import user_prefs
+
+    prefs = UserPreferences("alice", db=db, legacy_path=None)
+    prefs.save_preferences(["마라"], [])
+
+    # Another worker saves straight to SQLite; this process only has its cache
+    db.save_user_preferences("alice", ["마라", "고수"], [])
+    assert prefs.get_dislikes() == ["마라"]  # Within REVALIDATE_SECONDS
+
+    monkeypatch.setattr(user_prefs, "REVALIDATE_SECONDS", 0)
+    assert prefs.get_dislikes() == ["마라", "고수"]
+    assert prefs.version == 2
+
+
+def test_concurrent_saves_are_atomic(db):
+    def save(i):
+        UserPreferences(f"user{i % 10}", db=db, legacy_path=None).save_preferences([f"싫음{i}"], [])
+
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(100)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    clear_cache()
+    versions = [UserPreferences(f"user{u}", db=db, legacy_path=None).version for u in range(10)]
+    assert versions == [10] * 10
+
+
+def test_legacy_json_is_imported_for_default_user(db, tmp_path):
+    legacy = tmp_path / "user_preferences.json"
+    legacy.write_text(json.dumps({"dislikes": ["가지"], "favorites": ["떡볶이"]}, ensure_ascii=False), encoding="utf-8")
+
+    prefs = UserPreferences(DEFAULT_USER_ID, db=db, legacy_path=str(legacy))
+    assert prefs.get_dislikes() == ["가지"] and prefs.get_favorites() == ["떡볶이"]
+    assert prefs.version == 1
+    # Other users start empty
+    assert UserPreferences("new-user", db=db, legacy_path=str(legacy)).get_dislikes() == []